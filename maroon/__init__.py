@@ -1,17 +1,34 @@
 from .config import Config
-from .engine import GameEngine
-from .modes import IGameMode, WordMode, QuoteMode, TimeMode, SuddenDeathMode
+from .core import GameCore, GameObserver
+from .modes import (IGameMode, WordMode, AdaptiveMode, RaceMode, QuoteMode, TimeMode, SuddenDeathMode,
+                    BookMode)
 from .services import WordService
-from .widgets import MainWindow
+
+
+def __getattr__(name):
+    # The Qt front end is imported on first use, so the core runs without PyQt6.
+    if name == "GameEngine":
+        from .engine import GameEngine
+        return GameEngine
+    if name == "MainWindow":
+        from .widgets import MainWindow
+        return MainWindow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "Config",
     "WordService",
     "IGameMode",
     "WordMode",
+    "AdaptiveMode",
+    "RaceMode",
     "QuoteMode",
     "TimeMode",
     "SuddenDeathMode",
+    "BookMode",
+    "GameCore",
+    "GameObserver",
     "GameEngine",
     "MainWindow",
 ]
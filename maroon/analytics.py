@@ -0,0 +1,229 @@
+import threading
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .config import Config
+from .keylog import CHAR, SKIP, KeystrokeLog
+
+# Keys are tracked per code point below ALPHABET; anything else shares slot 0.
+ALPHABET = 128
+# Inter-key latency histogram: log-spaced bins from 10 ms to 5 s, plus under/overflow.
+EDGES_NS = np.geomspace(10e6, 5000e6, 49)
+BINS = len(EDGES_NS) + 1
+_MIDS_MS = np.concatenate(([EDGES_NS[0]], np.sqrt(EDGES_NS[:-1] * EDGES_NS[1:]), [EDGES_NS[-1]])) / 1e6
+
+
+class KeyStat(NamedTuple):
+    key: str
+    attempts: int
+    errors: int
+    error_rate: float
+    median_ms: float
+
+
+class BigramStat(NamedTuple):
+    bigram: str
+    count: int
+    median_ms: float
+    p90_ms: float
+
+
+def _columns(blob: bytes):
+    """Zero-copy NumPy views over a serialised ``KeystrokeLog``."""
+    magic, n, _ = KeystrokeLog.HEADER.unpack_from(blob, 0)
+    if magic != KeystrokeLog.MAGIC:
+        raise ValueError("not a keystroke log")
+    pos = KeystrokeLog.HEADER.size
+    cols = []
+    for dtype, size in (("<u4", 4), ("<u4", 4), ("u1", 1), ("<i8", 8)):
+        cols.append(np.frombuffer(blob, dtype=dtype, count=n, offset=pos))
+        pos += size * n
+    return cols
+
+
+def _quantile(hist: np.ndarray, q: float) -> np.ndarray:
+    """Per-row quantile (ms) of log-binned histograms; rows are histograms."""
+    cum = np.cumsum(hist, axis=-1)
+    total = cum[..., -1:]
+    idx = np.argmax(cum >= np.maximum(total * q, 1), axis=-1)
+    return np.where(total[..., 0] > 0, _MIDS_MS[idx], np.nan)
+
+
+class KeyAnalytics:
+    """Per-key error rates and per-bigram latency histograms over all logged sessions.
+
+    Sessions are processed in batches: every keylog of a batch is concatenated
+    into flat columns and classified with vectorised NumPy passes, then added
+    to count arrays. The arrays are additive, so new sessions are folded in
+    without touching old ones, and they are cached on disk together with the
+    last processed session id.
+    """
+
+    def __init__(self, cache_path: Optional[Path] = None):
+        self.cache_path = cache_path or Config.DATA_DIR / "analytics.npz"
+        self.lock = threading.Lock()
+        self._update_lock = threading.Lock()
+        self.last_id = 0
+        self.sessions = 0
+        self.key_attempts = np.zeros(ALPHABET, dtype=np.int64)
+        self.key_errors = np.zeros(ALPHABET, dtype=np.int64)
+        self.bigram_hist = np.zeros((ALPHABET * ALPHABET, BINS), dtype=np.int32)
+        self._load()
+
+    def _load(self):
+        try:
+            with np.load(self.cache_path) as data:
+                if data["bigram_hist"].shape != self.bigram_hist.shape:
+                    return
+                self.key_attempts = data["key_attempts"].copy()
+                self.key_errors = data["key_errors"].copy()
+                self.bigram_hist = data["bigram_hist"].copy()
+                self.last_id = int(data["last_id"])
+                self.sessions = int(data["sessions"])
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Analytics cache load failed: {e}")
+
+    def save(self):
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_suffix(".tmp.npz")
+            with self.lock:
+                np.savez_compressed(tmp, key_attempts=self.key_attempts, key_errors=self.key_errors,
+                                    bigram_hist=self.bigram_hist, last_id=self.last_id,
+                                    sessions=self.sessions)
+            tmp.replace(self.cache_path)
+        except Exception as e:
+            print(f"Analytics cache save failed: {e}")
+
+    def update(self, store, batch: int = 2000) -> int:
+        """Fold in every session ``store`` logged after ``last_id``; returns how many."""
+        added = 0
+        with self._update_lock:
+            while True:
+                rows = store.keylogs_since(self.last_id, batch)
+                if not rows:
+                    break
+                self.add_sessions([(target, blob) for _, target, blob in rows])
+                self.last_id = rows[-1][0]
+                added += len(rows)
+            if added:
+                self.save()
+        return added
+
+    def add_sessions(self, sessions: Sequence[Tuple[str, bytes]]):
+        """Classify a batch of ``(target, keylog bytes)`` and add it to the counts."""
+        offsets, codes, kinds, times, session = [], [], [], [], []
+        targets, target_base = [], []
+        base = 0
+        for i, (target, blob) in enumerate(sessions):
+            o, c, k, t = _columns(blob)
+            offsets.append(o)
+            codes.append(c)
+            kinds.append(k)
+            times.append(t)
+            session.append(np.full(len(o), i, dtype=np.int32))
+            encoded = np.frombuffer(target.encode("utf-32-le"), dtype="<u4")
+            targets.append(encoded)
+            target_base.append(base)
+            base += len(encoded) + 1
+            targets.append(np.zeros(1, dtype="<u4"))  # separator: never a real char
+        if not offsets:
+            return
+        offset = np.concatenate(offsets).astype(np.int64)
+        code = np.concatenate(codes).astype(np.int64)
+        kind = np.concatenate(kinds)
+        t = np.concatenate(times)
+        sess = np.concatenate(session)
+        flat_target = np.concatenate(targets).astype(np.int64)
+        target_len = np.diff(np.append(target_base, base)) - 1
+        target_base = np.asarray(target_base, dtype=np.int64)
+
+        # A single Space (a one-character skip) is a typed ' '.
+        space = (kind == SKIP) & (code == 1)
+        code = np.where(space, 32, code)
+        typed = (kind == CHAR) | space
+        inside = typed & (offset < target_len[sess])
+        at = target_base[sess] + np.minimum(offset, target_len[sess] - 1)
+        expected = np.where(inside, flat_target[at], -1)
+        correct = inside & (code == expected)
+
+        key = np.where((expected > 0) & (expected < ALPHABET), expected, 0)
+        attempts = np.bincount(key[inside], minlength=ALPHABET)
+        errors = np.bincount(key[inside & ~correct], minlength=ALPHABET)
+
+        # Bigram latency: two correct keys in a row, in the same session, at adjacent offsets.
+        prev = np.arange(1, len(offset))
+        pair = (correct[1:] & correct[:-1] & (sess[1:] == sess[:-1])
+                & (offset[1:] == offset[:-1] + 1))
+        cur_i = prev[pair]
+        dt = t[cur_i] - t[cur_i - 1]
+        bigram = key[cur_i - 1] * ALPHABET + key[cur_i]
+        cells = bigram * BINS + np.searchsorted(EDGES_NS, dt)
+        hist = np.bincount(cells, minlength=self.bigram_hist.size).reshape(self.bigram_hist.shape)
+
+        with self.lock:
+            self.key_attempts += attempts
+            self.key_errors += errors
+            self.bigram_hist += hist.astype(np.int32)
+            self.sessions += len(sessions)
+
+    def key_stats(self, min_attempts: int = 20) -> List[KeyStat]:
+        """Typed keys, worst error rate first."""
+        with self.lock:
+            attempts = self.key_attempts.copy()
+            errors = self.key_errors.copy()
+            # Latency to type a key, over every bigram that ends in it.
+            by_key = self.bigram_hist.reshape(ALPHABET, ALPHABET, BINS).sum(axis=0)
+        medians = _quantile(by_key, 0.5)
+        idx = np.flatnonzero(attempts >= min_attempts)
+        idx = idx[idx != 0]
+        rates = errors[idx] / attempts[idx]
+        order = np.lexsort((-np.nan_to_num(medians[idx]), -rates))
+        return [KeyStat(chr(idx[j]), int(attempts[idx[j]]), int(errors[idx[j]]), float(rates[j]),
+                        float(medians[idx[j]])) for j in order]
+
+    def bigram_stats(self, min_count: int = 10) -> List[BigramStat]:
+        """Bigrams seen at least ``min_count`` times, slowest median first."""
+        with self.lock:
+            counts = self.bigram_hist.sum(axis=1)
+            idx = np.flatnonzero(counts >= min_count)
+            hist = self.bigram_hist[idx]
+        a, b = np.divmod(idx, ALPHABET)
+        keep = (a != 0) & (b != 0)
+        idx, hist, a, b = idx[keep], hist[keep], a[keep], b[keep]
+        medians = _quantile(hist, 0.5)
+        p90 = _quantile(hist, 0.9)
+        order = np.lexsort((-p90, -medians))
+        return [BigramStat(chr(a[j]) + chr(b[j]), int(counts[idx[j]]), float(medians[j]), float(p90[j]))
+                for j in order]
+
+    def weakest_keys(self, n: int = 5, min_attempts: int = 20) -> List[str]:
+        return [s.key for s in self.key_stats(min_attempts)[:n] if s.key.strip()]
+
+    def weakest_bigrams(self, n: int = 5, min_count: int = 10) -> List[str]:
+        return [s.bigram for s in self.bigram_stats(min_count) if " " not in s.bigram][:n]
+
+    def focus_weights(self, n: int = 5) -> Dict[str, float]:
+        """Weakest keys and bigrams for adaptive practice, weighted by how far below par they are.
+
+        A key weighs its error rate over the mean rate, a bigram its median
+        latency over the median of all bigrams; only above-average ones count.
+        """
+        weights: Dict[str, float] = {}
+        keys = [k for k in self.key_stats() if k.key.strip()]
+        if keys:
+            mean_rate = sum(k.error_rate for k in keys) / len(keys)
+            for k in keys[:n]:
+                if mean_rate and k.error_rate > mean_rate:
+                    weights[k.key] = k.error_rate / mean_rate
+        bigrams = [b for b in self.bigram_stats() if " " not in b.bigram]
+        if bigrams:
+            par = float(np.median([b.median_ms for b in bigrams]))
+            for b in bigrams[:n]:
+                if b.median_ms > par:
+                    weights[b.bigram] = b.median_ms / par
+        return weights
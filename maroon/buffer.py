@@ -0,0 +1,91 @@
+from typing import List, NamedTuple, Optional
+
+
+class Edit(NamedTuple):
+    """One change to the typed text: ``removed`` at ``start`` was replaced by ``inserted``."""
+    start: int
+    removed: str
+    inserted: str
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.inserted)
+
+
+class InputBuffer:
+    """Mutable, list-backed typed text.
+
+    Edits only touch the characters they change; the joined string is built
+    lazily for callers that still need a plain ``str``.
+    """
+
+    def __init__(self, text: str = ""):
+        self._chars: List[str] = list(text)
+        self._text: Optional[str] = text
+
+    def __len__(self) -> int:
+        return len(self._chars)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return "".join(self._chars[index])
+        return self._chars[index]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, InputBuffer):
+            return self._chars == other._chars
+        if isinstance(other, str):
+            return self.text == other
+        return NotImplemented
+
+    def __str__(self) -> str:
+        return self.text
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = "".join(self._chars)
+        return self._text
+
+    def endswith(self, suffix: str) -> bool:
+        n = len(suffix)
+        return n <= len(self._chars) and (n == 0 or "".join(self._chars[-n:]) == suffix)
+
+    def word_start(self) -> int:
+        """Index the current word starts at, ignoring trailing spaces (Ctrl+Backspace)."""
+        i = len(self._chars)
+        while i > 0 and self._chars[i - 1] == " ":
+            i -= 1
+        while i > 0 and self._chars[i - 1] != " ":
+            i -= 1
+        return i
+
+    def append(self, text: str) -> Edit:
+        edit = Edit(len(self._chars), "", text)
+        self._chars.extend(text)
+        self._text = None
+        return edit
+
+    def truncate(self, length: int) -> Edit:
+        length = max(0, length)
+        removed = "".join(self._chars[length:])
+        del self._chars[length:]
+        self._text = None
+        return Edit(length, removed, "")
+
+    def replace(self, start: int, text: str) -> Edit:
+        """Replace everything from ``start`` with ``text``."""
+        removed = "".join(self._chars[start:])
+        del self._chars[start:]
+        self._chars.extend(text)
+        self._text = None
+        return Edit(start, removed, text)
+
+    def drop_prefix(self, count: int):
+        """Forget the first ``count`` characters (text that scrolled out of a streamed window)."""
+        del self._chars[:count]
+        self._text = None
+
+    def clear(self):
+        self._chars.clear()
+        self._text = ""
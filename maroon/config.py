@@ -1,9 +1,48 @@
+import os
 import sys
+from pathlib import Path
 
 
 class Config:
     WORD_LIST_URL = "https://raw.githubusercontent.com/first20hours/google-10000-english/master/20k.txt"
+    WORD_LIST_NAME = "20k"
     QUOTE_API_URL = "https://api.quotable.io/random?minLength=50&maxLength=140"
+    QUOTE_PREFETCH = 5
+    QUOTE_CACHE_SIZE = 200
+    TARGET_POOL_SIZE = 3
+    # UI flushes per second; 0 follows the screen's refresh rate.
+    TARGET_FPS = 0
+    # difficulty -> (min length, max length, most frequent N words or None for all)
+    DIFFICULTY_TIERS = {
+        "Easy": (3, 6, 2000),
+        "Medium": (3, 8, 8000),
+        "Hard": (3, 10, None),
+    }
+    DEFAULT_DIFFICULTY = "Hard"
+    DATA_DIR = Path(os.environ.get("MAROON_DATA_DIR", Path.home() / ".maroon-type"))
+    # Session history: whether rounds are recorded (benchmarks and bots turn this off),
+    # sessions in the rolling average, and whether keystroke logs are kept.
+    HISTORY_RECORD = os.environ.get("MAROON_HISTORY", "1") not in ("", "0")
+    HISTORY_ROLLING = 10
+    HISTORY_KEYLOGS = os.environ.get("MAROON_HISTORY_KEYLOGS", "1") not in ("", "0")
+    # Adaptive mode: share of words that contain a weak key/bigram, and how many of each to target.
+    ADAPTIVE_SHARE = 0.6
+    ADAPTIVE_FOCUS = 5
+    # Streamed targets: characters kept ahead of the cursor, read per chunk, and kept behind it.
+    STREAM_AHEAD = 360
+    STREAM_CHUNK = 240
+    STREAM_BEHIND = 120
+    # Book mode: text file to open when none was chosen yet.
+    BOOK_PATH = os.environ.get("MAROON_BOOK", "")
+    # Ghost cursors, in order: personal best first, then added recordings.
+    GHOST_COLORS = ["#a78bfa", "#facc15", "#38bdf8", "#f472b6"]
+    # LAN races (python -m maroon.race): server address, words per race,
+    # seconds between progress broadcasts and before the start.
+    RACE_HOST = os.environ.get("MAROON_RACE_HOST", "127.0.0.1")
+    RACE_PORT = int(os.environ.get("MAROON_RACE_PORT", "8765"))
+    RACE_WORDS = 30
+    RACE_TICK = 0.1
+    RACE_COUNTDOWN = 3.0
     LOCAL_WORDS = [
         "maroon", "type", "focus", "fluid", "shadow", "glow", "gradient", "cursor",
         "quiet", "quick", "brown", "fox", "lazy", "craft", "code", "night", "sun",
@@ -12,6 +51,16 @@ class Config:
     FONT_FAMILY = "JetBrains Mono" if sys.platform == "win32" else "Menlo"
     FONT_FALLBACK = "JetBrains Mono, Fira Code, Menlo, Consolas, monospace"
     FONT_SIZE = 26
+    # Recount the whole input after every update and compare with the running counters.
+    DEBUG_STATS = os.environ.get("MAROON_DEBUG_STATS", "") not in ("", "0")
+    # When set, key-to-paint latency histograms are written here on exit.
+    LATENCY_LOG = os.environ.get("MAROON_LATENCY_LOG", "")
+    # Header blur and text frame shadow: "live" Qt effects, "cached" (rebuilt only when
+    # their content or size changes) or "auto", which switches to cached once the median
+    # repaint over FRAME_SAMPLES frames of typing exceeds FRAME_BUDGET_MS.
+    EFFECTS = os.environ.get("MAROON_EFFECTS", "auto")
+    FRAME_BUDGET_MS = 8.0
+    FRAME_SAMPLES = 30
 
     THEMES = {
         "midnight": {
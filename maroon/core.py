@@ -0,0 +1,377 @@
+import math
+import time
+from typing import Callable, Iterable, List, Optional
+
+from .buffer import Edit, InputBuffer
+from .config import Config
+from .keylog import BACKSPACE, CHAR, SKIP, TRUNCATE, WORD_BACK, KeystrokeLog
+from .modes import IGameMode, QuoteMode, SuddenDeathMode, TimeMode, WordMode
+from .render import HtmlRenderer, common_prefix
+from .services import QuoteService, WordService
+from .stats import InputStats
+from .stream import TargetStream
+
+
+class GameObserver:
+    """Callbacks fired by ``GameCore``; override the ones you need."""
+
+    def on_target_changed(self, target: str):
+        pass
+
+    def on_text_changed(self, start: int, end: int):
+        pass
+
+    def on_stats_changed(self, stats_text: str):
+        pass
+
+    def on_game_started(self):
+        pass
+
+    def on_game_finished(self, success: bool):
+        pass
+
+    def on_tick_scheduled(self, delay: Optional[float]):
+        """Call ``GameCore.tick`` after ``delay`` seconds; ``None`` cancels."""
+        pass
+
+    def on_window_shifted(self, dropped: int, target: str):
+        """A streamed round moved its window: ``dropped`` typed characters left, ``target`` is the new window."""
+        pass
+
+
+class GameCore:
+    """Qt'den bağımsız oyun çekirdeği.
+
+    All game state and rules live here. Time comes from the injectable
+    ``clock`` (seconds, monotonic) and every change is reported to the
+    registered observers, so the core runs the same under Qt, in a batch
+    simulation or in a benchmark. ``clock_ns`` stamps the keystroke log and
+    defaults to ``perf_counter_ns``, or to ``clock`` scaled when that is replaced.
+
+    Modes that stream their target keep only a window of it in ``target_text``
+    and ``buffer``; ``window_offset`` is how much of the round scrolled out.
+    """
+
+    def __init__(self, service: Optional[WordService] = None,
+                 clock: Callable[[], float] = time.perf_counter,
+                 mode: Optional[IGameMode] = None,
+                 clock_ns: Optional[Callable[[], int]] = None):
+        self.service = service if service is not None else WordService()
+        self.clock = clock
+        if clock_ns is None:
+            clock_ns = time.perf_counter_ns if clock is time.perf_counter else (
+                lambda: int(clock() * 1e9))
+        self.clock_ns = clock_ns
+        self.observers: List[GameObserver] = []
+        self.mode: Optional[IGameMode] = None
+        self._modes: List[IGameMode] = []
+        self.target_text = ""
+        self.window_offset = 0
+        self.buffer = InputBuffer()
+        self.keylog = KeystrokeLog()
+        self.start_time: Optional[float] = None
+        self.is_running = False
+        self.finished = False
+        self.last_wpm = 0
+        self.last_acc = 100
+        self.last_elapsed = 0.0
+        self.renderer = HtmlRenderer()
+        self.stats = InputStats()
+        self._dirty_from = 0
+        self._html_dirty_from = 0
+        self._last_cursor = 0
+        self._tick_pending = False
+        self._stream: Optional[TargetStream] = None
+        self._dropped: List[str] = []
+        self.set_mode(mode or WordMode(25))
+
+    def add_observer(self, observer: GameObserver):
+        self.observers.append(observer)
+
+    def set_mode(self, mode: IGameMode):
+        self.mode = mode
+        self._track(mode)
+        self.reset_game()
+
+    def prefill(self, modes: Iterable[IGameMode]):
+        for mode in modes:
+            self._track(mode)
+            mode.prefill(self.service)
+
+    def _track(self, mode: IGameMode):
+        if not any(m is mode for m in self._modes):
+            self._modes.append(mode)
+
+    def reset_game(self):
+        assert self.mode is not None
+        # Close first: a stream saves where it stopped, and the next one resumes there.
+        self._close_stream()
+        stream = self.mode.open_stream(self.service)
+        if stream is None:
+            self.set_target(self.mode.next_target(self.service))
+        else:
+            self.set_target(stream.read(Config.STREAM_AHEAD + Config.STREAM_CHUNK), stream)
+
+    def set_target(self, target: str, stream: Optional[TargetStream] = None):
+        """Start a fresh round of the current mode on ``target``, continued from ``stream`` if given."""
+        self._close_stream()
+        self._stream = stream
+        self._set_target(target)
+        self.start_time = None
+        self.is_running = False
+        self.finished = False
+        self.last_wpm = 0
+        self.last_acc = 100
+        self.last_elapsed = 0.0
+        self._cancel_tick()
+        self.emit_update()
+        for o in self.observers:
+            o.on_game_started()
+
+    def _set_target(self, target: str):
+        self.target_text = target
+        self.window_offset = 0
+        self._dropped.clear()
+        self.buffer.clear()
+        self.keylog.clear()
+        self.renderer.set_target(target)
+        self.stats.reset()
+        self._dirty_from = 0
+        self._html_dirty_from = 0
+        self._last_cursor = 0
+        for o in self.observers:
+            o.on_target_changed(target)
+
+    def words_ready(self):
+        """The real word list replaced the built-in placeholder words."""
+        for mode in self._modes:
+            if mode.pool is not None:
+                mode.pool.clear()
+        if self.is_running or self.finished or isinstance(self.mode, QuoteMode):
+            return
+        self.reset_game()
+
+    def quote_ready(self, quote: str):
+        """Swap a fresh quote in for the placeholder, unless the user already started."""
+        if not isinstance(self.mode, QuoteMode) or self.is_running or self.finished:
+            return
+        if self.target_text != QuoteService.PLACEHOLDER:
+            return
+        self._set_target(quote)
+        self.emit_update()
+
+    @property
+    def user_input(self) -> str:
+        return self.buffer.text
+
+    @property
+    def session_target(self) -> str:
+        """The round's target so far, including text that already left the window."""
+        return "".join(self._dropped) + self.target_text
+
+    def insert_char(self, char: str) -> bool:
+        """Each edit operation returns whether it changed the input."""
+        if self.finished or len(self.buffer) >= len(self.target_text):
+            return False
+        self._apply(self.buffer.append(char), CHAR)
+        return True
+
+    def delete_char(self) -> bool:
+        if self.finished or not self.buffer:
+            return False
+        self._apply(self.buffer.truncate(len(self.buffer) - 1), BACKSPACE)
+        return True
+
+    def delete_word(self) -> bool:
+        if self.finished or not self.buffer:
+            return False
+        self._apply(self.buffer.truncate(self.buffer.word_start()), WORD_BACK)
+        return True
+
+    def skip_word(self) -> bool:
+        """Space: jump to the next word, filling the untyped rest of the current one."""
+        if self.finished or self.buffer.endswith(" "):
+            return False
+        idx = len(self.buffer)
+        target = self.target_text
+        if idx < len(target) and target[idx] != " ":
+            nxt = target.find(" ", idx)
+            nxt = len(target) if nxt == -1 else nxt
+            self._apply(self.buffer.append("_" * (nxt - idx) + " "), SKIP)
+        else:
+            self._apply(self.buffer.append(" "), SKIP)
+        return True
+
+    def process_input(self, text_input: str):
+        """Replace the whole input; kept for callers that only have the full text."""
+        if self.finished:
+            return
+        start = common_prefix(self.buffer.text, text_input)
+        self._apply(self.buffer.replace(start, text_input[start:]), CHAR)
+
+    def _apply(self, edit: Edit, kind: int):
+        if self.finished:
+            return
+
+        if not self.is_running:
+            self.is_running = True
+            self.start_time = self.clock()
+        if not self._tick_pending:
+            self._schedule_tick()
+
+        assert self.mode is not None
+        self._log(edit, kind)
+        self._dirty_from = min(self._dirty_from, edit.start)
+        self._html_dirty_from = min(self._html_dirty_from, edit.start)
+        self.stats.apply(self.target_text, edit)
+        if not self.mode.validate_edit(edit, self.buffer, self.target_text):
+            self._finish_game(success=False)
+            return
+        if self._stream is not None:
+            self._slide_window()
+
+        self.emit_update()
+
+        if self.mode.is_finished(self.buffer, self.target_text, self.elapsed()):
+            self._finish_game(success=True)
+
+    def _log(self, edit: Edit, kind: int):
+        now = self.clock_ns()
+        record = self.keylog.record
+        start = self.window_offset + edit.start
+        if kind != CHAR:
+            record(kind, start, len(edit.inserted if kind == SKIP else edit.removed), now)
+            return
+        if edit.removed:
+            record(TRUNCATE, start, len(edit.removed), now)
+        for i, char in enumerate(edit.inserted):
+            record(CHAR, start + i, ord(char), now)
+
+    def _slide_window(self):
+        """Read ahead of the cursor and drop whole words well behind it, so the window stays small."""
+        stream = self._stream
+        target = self.target_text
+        cursor = len(self.buffer)
+        appended = []
+        ahead = len(target) - cursor
+        while ahead < Config.STREAM_AHEAD and not stream.exhausted:
+            chunk = stream.read(Config.STREAM_CHUNK)
+            if not chunk:
+                break
+            appended.append(chunk)
+            ahead += len(chunk)
+        dropped = 0
+        if cursor > 2 * Config.STREAM_BEHIND:
+            dropped = target.rfind(" ", 0, cursor - Config.STREAM_BEHIND) + 1
+        if not appended and not dropped:
+            return
+        if dropped:
+            self._dropped.append(target[:dropped])
+            self.buffer.drop_prefix(dropped)
+            self.window_offset += dropped
+            self._last_cursor = max(0, self._last_cursor - dropped)
+            stream.release(self.window_offset)
+        self.target_text = target[dropped:] + "".join(appended)
+        self.renderer.set_target(self.target_text)
+        self._dirty_from = 0
+        self._html_dirty_from = 0
+        for o in self.observers:
+            o.on_window_shifted(dropped, self.target_text)
+
+    def _close_stream(self):
+        stream, self._stream = self._stream, None
+        if stream is not None:
+            stream.close(self.window_offset + len(self.buffer))
+
+    def elapsed(self) -> float:
+        return self.clock() - self.start_time if self.start_time is not None else 0
+
+    def _schedule_tick(self):
+        """Only the countdown changes while idle, so wake up when its second rolls over."""
+        if not self.is_running or not isinstance(self.mode, TimeMode):
+            return
+        elapsed = self.elapsed()
+        delay = math.ceil((math.floor(elapsed) + 1 - elapsed) * 1000) / 1000
+        self._tick_pending = True
+        for o in self.observers:
+            o.on_tick_scheduled(max(0.001, delay))
+
+    def _cancel_tick(self):
+        if self._tick_pending:
+            self._tick_pending = False
+            for o in self.observers:
+                o.on_tick_scheduled(None)
+
+    def tick(self):
+        assert self.mode is not None
+        self._tick_pending = False
+        if not self.is_running:
+            return
+        self.emit_stats()
+        if self.mode.is_finished(self.buffer, self.target_text, self.elapsed()):
+            self._finish_game(success=True)
+        else:
+            self._schedule_tick()
+
+    def close(self):
+        """Stop the countdown and close the round's stream, which saves its progress."""
+        self._cancel_tick()
+        self._close_stream()
+
+    def _finish_game(self, success: bool):
+        self.is_running = False
+        self.finished = True
+        self._cancel_tick()
+        self._close_stream()
+        self.emit_update(final=True)
+        for o in self.observers:
+            o.on_game_finished(success)
+
+    def emit_update(self, final=False):
+        """Text and stats changed (keystroke, new target, theme)."""
+        stats_text = self.stats_text(final)
+        cursor = len(self.buffer)
+        lo = min(self._dirty_from, self._last_cursor, cursor)
+        hi = max(self._last_cursor, cursor) + 1
+        self._last_cursor = cursor
+        self._dirty_from = cursor
+        for o in self.observers:
+            o.on_text_changed(lo, hi)
+        for o in self.observers:
+            o.on_stats_changed(stats_text)
+
+    def emit_stats(self, final=False):
+        """Only the stats changed (timer tick)."""
+        stats_text = self.stats_text(final)
+        for o in self.observers:
+            o.on_stats_changed(stats_text)
+
+    def stats_text(self, final=False) -> str:
+        elapsed = self.elapsed() if self.start_time is not None else 0.1
+        if elapsed < 0.1:
+            elapsed = 0.1
+
+        if Config.DEBUG_STATS and not self.window_offset:
+            self.stats.verify(self.target_text, self.buffer)
+        correct_chars = self.stats.correct
+        typed = self.stats.typed
+        wpm = int((correct_chars / 5) / (elapsed / 60))
+        acc = int((correct_chars / typed * 100)) if typed else 100
+        self.last_wpm = wpm
+        self.last_acc = acc
+        self.last_elapsed = elapsed
+
+        if self.mode:
+            stats_text = self.mode.get_stats_text(wpm, acc, elapsed)
+        else:
+            stats_text = f"WPM: {wpm} | ACC: {acc}%"
+        if final:
+            stats_text = f"FINISH | {stats_text}"
+        return stats_text
+
+    def generate_html(self) -> str:
+        c = Config.COLORS
+        cursor_color = c["death"] if isinstance(self.mode, SuddenDeathMode) else c["cursor"]
+        html = self.renderer.render(self.buffer, cursor_color, self._html_dirty_from)
+        self._html_dirty_from = len(self.buffer)
+        return html
@@ -1,139 +1,186 @@
-import time
-from typing import Optional
+from typing import Iterable, Optional
 
-from PyQt6.QtCore import QTimer, QObject, pyqtSignal
+from PyQt6.QtCore import QTimer, QObject, Qt, pyqtSignal
 
+from .buffer import InputBuffer
 from .config import Config
-from .modes import IGameMode, SuddenDeathMode, TimeMode, WordMode
+from .core import GameCore, GameObserver
+from .history import HistoryRecorder, HistoryStore
+from .keylog import KeystrokeLog
+from .modes import IGameMode
+from .render import HtmlRenderer
 from .services import WordService
+from .stats import InputStats
+
+
+class _SignalObserver(GameObserver):
+    """Forwards core callbacks to the engine's Qt signals and timer."""
+
+    def __init__(self, engine: "GameEngine"):
+        self.engine = engine
+
+    def on_target_changed(self, target: str):
+        self.engine.target_changed.emit(target)
+
+    def on_text_changed(self, start: int, end: int):
+        self.engine.text_changed.emit(start, end)
+
+    def on_stats_changed(self, stats_text: str):
+        self.engine._publish_stats(stats_text)
+
+    def on_game_started(self):
+        self.engine.game_started.emit()
+
+    def on_game_finished(self, success: bool):
+        self.engine.game_finished.emit(success)
+
+    def on_window_shifted(self, dropped: int, target: str):
+        self.engine.window_shifted.emit(dropped, target)
+
+    def on_tick_scheduled(self, delay: Optional[float]):
+        timer = self.engine.timer
+        if delay is None:
+            timer.stop()
+        else:
+            timer.start(max(1, round(delay * 1000)))
 
 
 class GameEngine(QObject):
-    """UI'dan bağımsız oyun mantığı."""
+    """Qt adapter over ``GameCore``: signals, the countdown timer and thread hand-off."""
+    # Legacy stats + full HTML; the HTML is only rendered while something is connected.
     stats_updated = pyqtSignal(str, str)
+    stats_changed = pyqtSignal(str)
+    target_changed = pyqtSignal(str)
+    text_changed = pyqtSignal(int, int)
+    window_shifted = pyqtSignal(int, str)
+    _quote_ready = pyqtSignal(str)
+    _words_ready = pyqtSignal()
     game_finished = pyqtSignal(bool)
     game_started = pyqtSignal()
 
-    def __init__(self):
+    def __init__(self, record_history: Optional[bool] = None):
         super().__init__()
-        self.service = WordService()
-        self.mode: Optional[IGameMode] = None
-        self.target_text = ""
-        self.user_input = ""
-        self.start_time = None
-        self.is_running = False
-        self.finished = False
-        self.last_wpm = 0
-        self.last_acc = 100
-        self.last_elapsed = 0.0
+        # Single-shot, re-armed for the next whole second of the countdown.
         self.timer = QTimer()
-        self.timer.timeout.connect(self._on_tick)
-        self.set_mode(WordMode(25))
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.core = GameCore(WordService(load_async=True))
+        self.core.add_observer(_SignalObserver(self))
+        self.history = HistoryStore()
+        if Config.HISTORY_RECORD if record_history is None else record_history:
+            self.core.add_observer(HistoryRecorder(self.core, self.history))
+        self.timer.timeout.connect(self.core.tick)
+        # Emitted from worker threads; the queued connection lands on the GUI thread.
+        # Both callbacks are wired before their workers start: the word load here,
+        # the quote prefetcher on the first QuoteMode round.
+        self._quote_ready.connect(self.core.quote_ready)
+        self.service.quotes.on_quote = self._quote_ready.emit
+        self._words_ready.connect(self.core.words_ready)
+        self.service.on_ready = self._words_ready.emit
+        self.service.start()
+
+    @property
+    def service(self) -> WordService:
+        return self.core.service
+
+    @property
+    def mode(self) -> Optional[IGameMode]:
+        return self.core.mode
+
+    @property
+    def target_text(self) -> str:
+        return self.core.target_text
+
+    @property
+    def window_offset(self) -> int:
+        return self.core.window_offset
+
+    @property
+    def session_target(self) -> str:
+        return self.core.session_target
+
+    @property
+    def buffer(self) -> InputBuffer:
+        return self.core.buffer
+
+    @property
+    def user_input(self) -> str:
+        return self.core.user_input
+
+    @property
+    def keylog(self) -> KeystrokeLog:
+        return self.core.keylog
+
+    @property
+    def stats(self) -> InputStats:
+        return self.core.stats
+
+    @property
+    def renderer(self) -> HtmlRenderer:
+        return self.core.renderer
+
+    @property
+    def start_time(self) -> Optional[float]:
+        return self.core.start_time
+
+    @property
+    def is_running(self) -> bool:
+        return self.core.is_running
+
+    @property
+    def finished(self) -> bool:
+        return self.core.finished
+
+    @property
+    def last_wpm(self) -> int:
+        return self.core.last_wpm
+
+    @property
+    def last_acc(self) -> int:
+        return self.core.last_acc
+
+    @property
+    def last_elapsed(self) -> float:
+        return self.core.last_elapsed
 
     def set_mode(self, mode: IGameMode):
-        self.mode = mode
-        self.reset_game()
+        self.core.set_mode(mode)
+
+    def prefill(self, modes: Iterable[IGameMode]):
+        self.core.prefill(modes)
 
     def reset_game(self):
-        assert self.mode is not None
-        self.target_text = self.mode.generate_target(self.service)
-        self.user_input = ""
-        self.start_time = None
-        self.is_running = False
-        self.finished = False
-        self.last_wpm = 0
-        self.last_acc = 100
-        self.last_elapsed = 0.0
-        self.timer.stop()
-        self._emit_update()
-        self.game_started.emit()
+        self.core.reset_game()
+
+    def insert_char(self, char: str) -> bool:
+        return self.core.insert_char(char)
+
+    def delete_char(self) -> bool:
+        return self.core.delete_char()
+
+    def delete_word(self) -> bool:
+        return self.core.delete_word()
+
+    def skip_word(self) -> bool:
+        return self.core.skip_word()
 
     def process_input(self, text_input: str):
-        if self.finished:
-            return
-
-        if self.is_running and not self.timer.isActive() and isinstance(self.mode, TimeMode):
-            self.timer.start(100)
-
-        if not self.is_running:
-            self.is_running = True
-            self.start_time = time.time()
-            if isinstance(self.mode, TimeMode):
-                self.timer.start(100)
-
-        assert self.mode is not None
-        if not self.mode.validate_input(text_input, self.target_text):
-            self.user_input = text_input
-            self._finish_game(success=False)
-            return
-
-        self.user_input = text_input
-        self._emit_update()
-
-        elapsed = time.time() - self.start_time if self.start_time else 0
-        if self.mode.is_finished(self.user_input, self.target_text, elapsed):
-            self._finish_game(success=True)
-
-    def _on_tick(self):
-        assert self.mode is not None
-        elapsed = time.time() - self.start_time if self.start_time else 0
-        self._emit_update()
-        if self.mode.is_finished(self.user_input, self.target_text, elapsed):
-            self._finish_game(success=True)
-
-    def _finish_game(self, success: bool):
-        self.is_running = False
-        self.finished = True
-        self.timer.stop()
-        self._emit_update(final=True)
-        self.game_finished.emit(success)
+        self.core.process_input(text_input)
+
+    def close(self):
+        self.core.close()
+        self.history.close()
+
+    def _elapsed(self) -> float:
+        return self.core.elapsed()
 
     def _emit_update(self, final=False):
-        elapsed = time.time() - self.start_time if self.start_time else 0.1
-        if elapsed < 0.1:
-            elapsed = 0.1
-
-        correct_chars = sum(
-            1 for i, c in enumerate(self.user_input)
-            if i < len(self.target_text) and c == self.target_text[i]
-        )
-        wpm = int((correct_chars / 5) / (elapsed / 60))
-        acc = int((correct_chars / len(self.user_input) * 100)) if self.user_input else 100
-        self.last_wpm = wpm
-        self.last_acc = acc
-        self.last_elapsed = elapsed
-
-        if self.mode:
-            stats_text = self.mode.get_stats_text(wpm, acc, elapsed)
-        else:
-            stats_text = f"WPM: {wpm} | ACC: {acc}%"
-        if final:
-            stats_text = f"FINISH | {stats_text}"
-
-        html = self._generate_html()
-        self.stats_updated.emit(stats_text, html)
-
-    def _generate_html(self):
-        c = Config.COLORS
-        html = "<html><head/><body><p style='line-height: 140%;'>"
-        inp_len = len(self.user_input)
-
-        for i, char in enumerate(self.target_text):
-            if i < inp_len:
-                if self.user_input[i] == char:
-                    html += f'<span style="color:{c["correct"]};">{char}</span>'
-                else:
-                    html += (
-                        f'<span style="background-color:{c["error"]}; color:#222; '
-                        f'border-radius:3px;">{char}</span>'
-                    )
-            elif i == inp_len:
-                display = "&nbsp;" if char == " " else char
-                cursor_color = c["death"] if isinstance(self.mode, SuddenDeathMode) else c["cursor"]
-                html += (
-                    f'<span style="background-color:{cursor_color}; color:{c["bg"]};">{display}</span>'
-                )
-            else:
-                html += f'<span style="color:{c["text_sub"]};">{char}</span>'
-        html += "</p></body></html>"
-        return html
+        self.core.emit_update(final)
+
+    def _publish_stats(self, stats_text: str):
+        self.stats_changed.emit(stats_text)
+        if self.receivers(self.stats_updated):
+            self.stats_updated.emit(stats_text, self._generate_html())
+
+    def _generate_html(self) -> str:
+        return self.core.generate_html()
@@ -0,0 +1,37 @@
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+
+from .keylog import KeystrokeLog
+
+
+class GhostTimeline:
+    """Cursor position over time of a recorded round, for racing against it.
+
+    Built once from a ``KeystrokeLog``: ``times`` (ns since the first key) is
+    sorted, so the position at any moment is one ``bisect`` away and drawing a
+    ghost costs O(log n) per frame however long the recording is.
+    """
+
+    def __init__(self, log: KeystrokeLog, label: str = ""):
+        self.label = label
+        self.times = array("q", log.times[:len(log)])
+        self.positions = log.cursors()
+
+    @classmethod
+    def from_file(cls, path: Path) -> "GhostTimeline":
+        """A recording saved with ``KeystrokeLog.to_bytes``."""
+        path = Path(path)
+        return cls(KeystrokeLog.from_bytes(path.read_bytes()), path.stem)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @property
+    def duration_ns(self) -> int:
+        return self.times[-1] if self.times else 0
+
+    def position_at(self, elapsed_ns: int) -> int:
+        """Characters typed ``elapsed_ns`` after the first key (0 before it)."""
+        i = bisect_right(self.times, elapsed_ns)
+        return self.positions[i - 1] if i else 0
@@ -0,0 +1,297 @@
+import queue
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .config import Config
+from .core import GameCore, GameObserver
+from .keylog import KeystrokeLog
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    mode TEXT NOT NULL,
+    target_len INTEGER NOT NULL,
+    typed INTEGER NOT NULL,
+    wpm INTEGER NOT NULL,
+    acc INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    success INTEGER NOT NULL,
+    keylog BLOB,
+    target TEXT
+);
+CREATE INDEX IF NOT EXISTS sessions_mode_ts ON sessions (mode, ts);
+CREATE INDEX IF NOT EXISTS sessions_ts ON sessions (ts);
+CREATE TABLE IF NOT EXISTS aggregates (
+    mode TEXT PRIMARY KEY,
+    sessions INTEGER NOT NULL,
+    completed INTEGER NOT NULL,
+    sum_wpm REAL NOT NULL,
+    sum_acc REAL NOT NULL,
+    best_wpm INTEGER NOT NULL,
+    best_id INTEGER,
+    best_ts REAL,
+    rolling_wpm REAL NOT NULL,
+    rolling_acc REAL NOT NULL,
+    last_ts REAL NOT NULL
+);
+"""
+ALL_MODES = "*"
+
+
+class SessionResult(NamedTuple):
+    ts: float
+    mode: str
+    target_len: int
+    typed: int
+    wpm: int
+    acc: int
+    duration: float
+    success: bool
+    keylog: Optional[bytes] = None
+    target: Optional[str] = None
+
+
+class SessionRow(NamedTuple):
+    id: int
+    ts: float
+    mode: str
+    target_len: int
+    typed: int
+    wpm: int
+    acc: int
+    duration: float
+    success: bool
+
+
+class Aggregate(NamedTuple):
+    """Running totals for one mode (``"*"`` is all of them).
+
+    Bests, averages and the rolling (exponential) values only count completed sessions.
+    """
+    mode: str
+    sessions: int
+    completed: int
+    sum_wpm: float
+    sum_acc: float
+    best_wpm: int
+    best_id: Optional[int]
+    best_ts: Optional[float]
+    rolling_wpm: float
+    rolling_acc: float
+    last_ts: float
+
+    @property
+    def avg_wpm(self) -> float:
+        return self.sum_wpm / self.completed if self.completed else 0.0
+
+    @property
+    def avg_acc(self) -> float:
+        return self.sum_acc / self.completed if self.completed else 0.0
+
+
+class HistoryStore:
+    """Session history in SQLite (WAL), written in batches by a background thread.
+
+    ``record`` only queues the result. The writer thread inserts whatever has
+    queued up in one transaction and updates the per-mode ``aggregates`` rows
+    in the same transaction, so personal bests, averages and counts are single
+    row reads no matter how many sessions exist. The writer's connection
+    creates the schema; reads from any thread share one connection under a
+    lock and, with WAL, are never blocked by the writer.
+    """
+    BATCH = 256
+    COALESCE = 0.2
+
+    def __init__(self, path: Optional[Path] = None, rolling: int = Config.HISTORY_ROLLING):
+        self.path = Path(path) if path else Config.DATA_DIR / "history.sqlite3"
+        self.alpha = 2 / (rolling + 1)
+        self._queue: "queue.Queue[Optional[SessionResult]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._reader: Optional[sqlite3.Connection] = None
+        self._read_lock = threading.Lock()
+        self._schema_ready = threading.Event()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        return conn
+
+    def _start_writer(self):
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_worker, daemon=True)
+                self._writer.start()
+
+    def record(self, result: SessionResult):
+        self._start_writer()
+        self._queue.put(result)
+
+    def flush(self):
+        """Block until everything queued so far is committed."""
+        if self._writer is not None:
+            self._queue.join()
+
+    def close(self):
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+        with self._read_lock:
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+
+    def _write_worker(self):
+        try:
+            conn = self._connect()
+        except Exception as e:
+            print(f"History open failed: {e}")
+            conn = None
+        # Set even on failure: readers then get SQLite's error instead of waiting forever.
+        self._schema_ready.set()
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            # Collect whatever else arrives shortly after, up to one batch.
+            while len(batch) < self.BATCH and batch[-1] is not None:
+                try:
+                    batch.append(self._queue.get(timeout=self.COALESCE))
+                except queue.Empty:
+                    break
+            results = [r for r in batch if r is not None]
+            stop = len(results) != len(batch)
+            if results and conn is not None:
+                try:
+                    self._write(conn, results)
+                except Exception as e:
+                    print(f"History write failed: {e}")
+            for _ in batch:
+                self._queue.task_done()
+        if conn is not None:
+            conn.close()
+
+    def _write(self, conn: sqlite3.Connection, results: List[SessionResult]):
+        with conn:
+            aggs = {row[0]: list(row) for row in conn.execute("SELECT * FROM aggregates")}
+            for r in results:
+                cur = conn.execute(
+                    "INSERT INTO sessions (ts, mode, target_len, typed, wpm, acc, duration, success,"
+                    " keylog, target) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (r.ts, r.mode, r.target_len, r.typed, r.wpm, r.acc, r.duration, int(r.success),
+                     zlib.compress(r.keylog, 1) if r.keylog else None, r.target),
+                )
+                for mode in (r.mode, ALL_MODES):
+                    self._fold(aggs, mode, r, cur.lastrowid)
+            conn.executemany(
+                "INSERT OR REPLACE INTO aggregates VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                aggs.values(),
+            )
+
+    def _fold(self, aggs: Dict[str, list], mode: str, r: SessionResult, row_id: int):
+        a = aggs.get(mode)
+        if a is None:
+            a = aggs[mode] = [mode, 0, 0, 0.0, 0.0, 0, None, None, 0.0, 0.0, r.ts]
+        a[1] += 1
+        a[10] = max(a[10], r.ts)
+        if not r.success:
+            return
+        a[2] += 1
+        a[3] += r.wpm
+        a[4] += r.acc
+        if r.wpm > a[5] or a[6] is None:
+            a[5], a[6], a[7] = r.wpm, row_id, r.ts
+        if a[2] == 1:
+            a[8], a[9] = float(r.wpm), float(r.acc)
+        else:
+            a[8] += self.alpha * (r.wpm - a[8])
+            a[9] += self.alpha * (r.acc - a[9])
+
+    def _query(self, sql: str, args=()) -> list:
+        """All rows of ``sql`` on the shared read connection, opened once the writer made the schema."""
+        with self._read_lock:
+            if self._reader is None:
+                self._start_writer()
+                self._schema_ready.wait()
+                self._reader = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            return self._reader.execute(sql, args).fetchall()
+
+    def aggregates(self) -> Dict[str, Aggregate]:
+        rows = self._query("SELECT * FROM aggregates")
+        return {row[0]: Aggregate(*row) for row in rows}
+
+    def aggregate(self, mode: str = ALL_MODES) -> Optional[Aggregate]:
+        rows = self._query("SELECT * FROM aggregates WHERE mode = ?", (mode,))
+        return Aggregate(*rows[0]) if rows else None
+
+    def recent(self, mode: Optional[str] = None, limit: int = 50,
+               before: Optional[float] = None) -> List[SessionRow]:
+        """Newest first; pass the last row's ``ts`` as ``before`` for the next page."""
+        sql = "SELECT id, ts, mode, target_len, typed, wpm, acc, duration, success FROM sessions"
+        where, args = [], []
+        if mode is not None:
+            where.append("mode = ?")
+            args.append(mode)
+        if before is not None:
+            where.append("ts < ?")
+            args.append(before)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY ts DESC LIMIT ?"
+        args.append(limit)
+        return [SessionRow(*row[:8], bool(row[8])) for row in self._query(sql, args)]
+
+    def rolling_average(self, mode: str, count: int = Config.HISTORY_ROLLING) -> Optional[float]:
+        """Exact mean WPM of the last ``count`` completed sessions of ``mode``."""
+        rows = self._query(
+            "SELECT avg(wpm) FROM (SELECT wpm FROM sessions WHERE mode = ? AND success = 1"
+            " ORDER BY ts DESC LIMIT ?)", (mode, count))
+        return rows[0][0]
+
+    def keylogs_since(self, last_id: int, limit: int = 5000) -> List[Tuple[int, str, bytes]]:
+        """``(id, target, raw keylog bytes)`` of sessions after ``last_id`` that kept a log."""
+        rows = self._query(
+            "SELECT id, target, keylog FROM sessions WHERE id > ? AND keylog IS NOT NULL"
+            " AND target IS NOT NULL ORDER BY id LIMIT ?", (last_id, limit))
+        return [(row_id, target, zlib.decompress(blob)) for row_id, target, blob in rows]
+
+    def keylog(self, session_id: int) -> Optional[KeystrokeLog]:
+        rows = self._query("SELECT keylog FROM sessions WHERE id = ?", (session_id,))
+        if not rows or rows[0][0] is None:
+            return None
+        return KeystrokeLog.from_bytes(zlib.decompress(rows[0][0]))
+
+
+class HistoryRecorder(GameObserver):
+    """Sends every finished round of ``core`` to ``store``."""
+
+    def __init__(self, core: GameCore, store: HistoryStore, keylogs: bool = Config.HISTORY_KEYLOGS):
+        self.core = core
+        self.store = store
+        self.keylogs = keylogs
+
+    def on_game_finished(self, success: bool):
+        core = self.core
+        if core.mode is None or core.start_time is None:
+            return
+        keylog = core.keylog.to_bytes() if self.keylogs and len(core.keylog) else None
+        self.store.record(SessionResult(
+            ts=time.time(),
+            mode=core.mode.key,
+            target_len=core.window_offset + len(core.target_text),
+            typed=core.window_offset + len(core.buffer),
+            wpm=core.last_wpm,
+            acc=core.last_acc,
+            duration=core.last_elapsed,
+            success=success,
+            keylog=keylog,
+            target=core.session_target if keylog else None,
+        ))
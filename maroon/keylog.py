@@ -0,0 +1,122 @@
+import struct
+import sys
+from array import array
+from typing import Iterator, Tuple
+
+# Event kinds. ``code`` is the character for CHAR and the inserted/removed
+# length for the others, so the typed text can be rebuilt from the log alone.
+CHAR, BACKSPACE, WORD_BACK, SKIP, TRUNCATE = range(5)
+KIND_NAMES = ("char", "backspace", "word_back", "skip", "truncate")
+
+
+class KeystrokeLog:
+    """Per-keystroke timeline in preallocated column arrays.
+
+    Each event is ``(offset, code, kind, t_ns)`` where ``t_ns`` is
+    nanoseconds since the first event; 17 bytes per event. Columns grow by
+    doubling, so ``record`` is amortised O(1) and only writes into existing
+    slots.
+    """
+    MAGIC = b"MKL1"
+    HEADER = struct.Struct("<4sIq")
+    COLUMNS = (("offsets", "I"), ("codes", "I"), ("kinds", "B"), ("times", "q"))
+
+    def __init__(self, capacity: int = 1024):
+        self.start_ns = 0
+        self._n = 0
+        self._cap = 0
+        self.offsets = array("I")
+        self.codes = array("I")
+        self.kinds = array("B")
+        self.times = array("q")
+        self._grow(capacity)
+
+    def _grow(self, capacity: int):
+        for name, code in self.COLUMNS:
+            col = getattr(self, name)
+            col.extend(array(code, bytes(col.itemsize * (capacity - self._cap))))
+        self._cap = capacity
+
+    def __len__(self) -> int:
+        return self._n
+
+    def clear(self):
+        """Forget the events but keep the allocated columns."""
+        self._n = 0
+        self.start_ns = 0
+
+    def record(self, kind: int, offset: int, code: int, now_ns: int):
+        n = self._n
+        if n == self._cap:
+            self._grow(self._cap * 2)
+        if n == 0:
+            self.start_ns = now_ns
+        self.offsets[n] = offset
+        self.codes[n] = code
+        self.kinds[n] = kind
+        self.times[n] = now_ns - self.start_ns
+        self._n = n + 1
+
+    def __getitem__(self, i: int) -> Tuple[int, int, int, int]:
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError(i)
+        return self.offsets[i], self.codes[i], self.kinds[i], self.times[i]
+
+    def __iter__(self) -> Iterator[Tuple[int, int, int, int]]:
+        n = self._n
+        return zip(self.offsets[:n], self.codes[:n], self.kinds[:n], self.times[:n])
+
+    @property
+    def duration_ns(self) -> int:
+        return self.times[self._n - 1] if self._n else 0
+
+    def cursors(self) -> array:
+        """Input length after each event."""
+        out = array("I", bytes(4 * self._n))
+        for i, (offset, code, kind, _) in enumerate(self):
+            out[i] = offset + (1 if kind == CHAR else code if kind == SKIP else 0)
+        return out
+
+    def rebuild(self, count: int = -1) -> str:
+        """Typed text after the first ``count`` events (all by default)."""
+        chars = []
+        for i, (offset, code, kind, _) in enumerate(self):
+            if i == count:
+                break
+            del chars[offset:]
+            if kind == CHAR:
+                chars.append(chr(code))
+            elif kind == SKIP:
+                chars.extend("_" * (code - 1) + " ")
+        return "".join(chars)
+
+    def to_bytes(self) -> bytes:
+        n = self._n
+        parts = [self.HEADER.pack(self.MAGIC, n, self.start_ns)]
+        for name, _ in self.COLUMNS:
+            col = getattr(self, name)[:n]
+            if sys.byteorder == "big":
+                col.byteswap()
+            parts.append(col.tobytes())
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "KeystrokeLog":
+        magic, n, start_ns = cls.HEADER.unpack_from(data, 0)
+        if magic != cls.MAGIC:
+            raise ValueError("not a keystroke log")
+        log = cls(max(1, n))
+        log.start_ns = start_ns
+        log._n = n
+        pos = cls.HEADER.size
+        for name, code in cls.COLUMNS:
+            col = array(code)
+            size = col.itemsize * n
+            col.frombytes(data[pos:pos + size])
+            if sys.byteorder == "big":
+                col.byteswap()
+            getattr(log, name)[:n] = col
+            pos += size
+        return log
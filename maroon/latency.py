@@ -0,0 +1,110 @@
+import json
+import statistics
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+STAGES = ("input", "emit", "paint")
+# Not a key stage: how long each window repaint took.
+FRAME = "frame"
+SERIES = STAGES + (FRAME,)
+
+
+def quantile(samples: Sequence[float], q: float) -> float:
+    """The ``q``-th percentile, interpolated (``statistics.quantiles``, inclusive)."""
+    if len(samples) < 2:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[round(q) - 1]
+
+
+class LatencyRecorder:
+    """Key-to-stage latencies in fixed-size ring buffers (nanoseconds).
+
+    ``key_processed`` is called once the engine applied a key; the same key is
+    then measured again when its update is emitted to the UI and when the
+    typing surface paints it. Coalesced keys all resolve on the same frame.
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self._rings = {stage: array("q", bytes(8 * capacity)) for stage in SERIES}
+        self._pos = dict.fromkeys(SERIES, 0)
+        self._count = dict.fromkeys(SERIES, 0)
+        self._pending_emit = array("q")
+        self._pending_paint = array("q")
+
+    def _record(self, stage: str, value: int):
+        pos = self._pos[stage]
+        self._rings[stage][pos] = value
+        self._pos[stage] = (pos + 1) % self.capacity
+        self._count[stage] += 1
+
+    def key_processed(self, key_ns: int):
+        self._record("input", time.perf_counter_ns() - key_ns)
+        self._pending_emit.append(key_ns)
+
+    def frame(self, ns: int) -> int:
+        """Record one window repaint; returns how many have been recorded."""
+        self._record(FRAME, ns)
+        return self._count[FRAME]
+
+    def mark_emit(self):
+        self._resolve("emit", self._pending_emit)
+
+    def mark_paint(self):
+        self._resolve("paint", self._pending_paint)
+
+    def _resolve(self, stage: str, pending: array):
+        if not pending:
+            return
+        now = time.perf_counter_ns()
+        for key_ns in pending:
+            self._record(stage, now - key_ns)
+        if stage == "emit":
+            self._pending_paint.extend(pending)
+            # Nothing painted (window hidden): keep only the newest keys.
+            if len(self._pending_paint) > self.capacity:
+                del self._pending_paint[:-self.capacity]
+        del pending[:]
+
+    def samples(self, stage: str) -> List[int]:
+        n = min(self._count[stage], self.capacity)
+        return list(self._rings[stage][:n])
+
+    def recent_ms(self, stage: str, n: int) -> List[float]:
+        """The last ``n`` samples of ``stage`` in milliseconds."""
+        n = min(n, self._count[stage], self.capacity)
+        ring, pos = self._rings[stage], self._pos[stage]
+        return [ring[(pos - i) % self.capacity] / 1e6 for i in range(1, n + 1)]
+
+    def percentiles(self, qs=(50, 95, 99)) -> Dict[str, Dict[int, float]]:
+        """Per stage ``{q: milliseconds}``; empty stages are left out."""
+        result = {}
+        for stage in SERIES:
+            data = self.samples(stage)
+            if not data:
+                continue
+            result[stage] = {q: quantile(data, q) / 1e6 for q in qs}
+        return result
+
+    def histogram(self, stage: str) -> Dict[str, int]:
+        """Sample counts in power-of-two microsecond buckets, keyed by upper bound."""
+        buckets: Dict[str, int] = {}
+        for ns in self.samples(stage):
+            bound = 1 << max(0, int(ns // 1000)).bit_length()
+            key = f"<{bound}us"
+            buckets[key] = buckets.get(key, 0) + 1
+        return dict(sorted(buckets.items(), key=lambda kv: int(kv[0][1:-2])))
+
+    def dump(self, path: Path):
+        data = {
+            "capacity": self.capacity,
+            "recorded": dict(self._count),
+            "percentiles_ms": self.percentiles(),
+            "histograms": {stage: self.histogram(stage) for stage in SERIES},
+        }
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
@@ -1,18 +1,26 @@
+import json
 from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
 
+from .buffer import Edit
 from .config import Config
+from .pool import TargetPool
 from .services import WordService
+from .stream import ChunkStream, TargetStream, TextFileStream
 
 
 class IGameMode(ABC):
     """Tüm oyun modları bu arayüzü uygulamalıdır."""
+    pool_size = Config.TARGET_POOL_SIZE
+    _pool: Optional[TargetPool] = None
 
     @abstractmethod
     def generate_target(self, service: WordService) -> str:
         pass
 
     @abstractmethod
-    def is_finished(self, input_text: str, target_text: str, time_elapsed: float) -> bool:
+    def is_finished(self, input_text: Sequence[str], target_text: str, time_elapsed: float) -> bool:
         pass
 
     @abstractmethod
@@ -20,81 +28,289 @@ class IGameMode(ABC):
         pass
 
     @abstractmethod
-    def validate_input(self, input_text: str, target_text: str) -> bool:
+    def validate_input(self, input_text: Sequence[str], target_text: str) -> bool:
         """Karakter girildiğinde özel bir kural (örn: Sudden Death) var mı?"""
         return True
 
+    def validate_edit(self, edit: Edit, input_text: Sequence[str], target_text: str) -> bool:
+        """Called with the change that was just applied; override to avoid rescanning."""
+        return self.validate_input(input_text, target_text)
+
+    @property
+    def style_state(self) -> str:
+        """Text frame state the theme stylesheet selects on: ``idle`` or ``death``."""
+        return "idle"
+
+    @property
+    def key(self) -> str:
+        """Stable identifier for history and stats, e.g. ``words-25``."""
+        return type(self).__name__.lower()
+
     @property
-    def style_color(self) -> str:
-        return Config.COLORS['border']
+    def pool(self) -> Optional[TargetPool]:
+        return self._pool
+
+    def prefill(self, service: WordService):
+        """Start generating targets in the background before the mode is first used."""
+        if self.pool_size <= 0:
+            return
+        if self._pool is None:
+            self._pool = TargetPool(self, service, self.pool_size)
+        self._pool.refill()
+
+    def open_stream(self, service: WordService) -> Optional[TargetStream]:
+        """Return a stream to have the core read the target piecewise; ``None`` uses ``next_target``."""
+        return None
+
+    def next_target(self, service: WordService) -> str:
+        if self.pool_size <= 0:
+            return self.generate_target(service)
+        if self._pool is None:
+            self._pool = TargetPool(self, service, self.pool_size)
+        return self._pool.pop()
 
 
 class WordMode(IGameMode):
     def __init__(self, count: int = 25):
         self.count = count
 
+    @property
+    def key(self) -> str:
+        return f"words-{self.count}"
+
     def generate_target(self, service: WordService) -> str:
         return " ".join(service.get_words(self.count))
 
-    def is_finished(self, inp: str, tgt: str, _: float) -> bool:
+    def is_finished(self, inp: Sequence[str], tgt: str, _: float) -> bool:
         return len(inp) >= len(tgt)
 
     def get_stats_text(self, wpm: int, acc: int, _: float) -> str:
         return f"WPM: {wpm} | ACC: {acc}%"
 
-    def validate_input(self, inp: str, tgt: str) -> bool:
+    def validate_input(self, inp: Sequence[str], tgt: str) -> bool:
         return True
 
 
+class AdaptiveMode(WordMode):
+    """Word mode that favours the player's weakest keys and bigrams (``WordService.focus``)."""
+
+    @property
+    def key(self) -> str:
+        return f"adaptive-{self.count}"
+
+    def generate_target(self, service: WordService) -> str:
+        return " ".join(service.get_focus_words(self.count))
+
+
+class RaceMode(WordMode):
+    """A LAN race round on the text the server sent; kept apart from solo word rounds."""
+    # The server picks every target, so there is nothing to pre-generate.
+    pool_size = 0
+
+    def __init__(self, text: str = ""):
+        super().__init__()
+        self.set_text(text)
+
+    def set_text(self, text: str):
+        self.text = text
+        self.count = text.count(" ") + 1
+
+    @property
+    def key(self) -> str:
+        return f"race-{self.count}"
+
+    def generate_target(self, service: WordService) -> str:
+        return self.text
+
+
 class TimeMode(IGameMode):
+    """Endless words until the time runs out, streamed in chunks as the cursor nears the end."""
+    # The stream replaces pre-generated targets; a chunk costs one word draw.
+    pool_size = 0
+    chunk_words = 20
+
     def __init__(self, seconds: int = 30):
         self.seconds = seconds
 
+    @property
+    def key(self) -> str:
+        return f"time-{self.seconds}"
+
+    def _chunks(self, service: WordService) -> Iterator[str]:
+        while True:
+            yield " ".join(service.get_words(self.chunk_words)) + " "
+
+    def open_stream(self, service: WordService) -> Optional[TargetStream]:
+        return ChunkStream(self._chunks(service))
+
     def generate_target(self, service: WordService) -> str:
-        return " ".join(service.get_words(100))
+        # Fallback for when no stream is used: a fixed run of the same chunks.
+        chunks = self._chunks(service)
+        return "".join(next(chunks) for _ in range(5)).rstrip()
 
-    def is_finished(self, _: str, __: str, t: float) -> bool:
+    def is_finished(self, _: Sequence[str], __: str, t: float) -> bool:
         return t >= self.seconds
 
     def get_stats_text(self, wpm: int, _: int, t: float) -> str:
         return f"Time: {int(self.seconds - t)}s | WPM: {wpm}"
 
-    def validate_input(self, inp: str, tgt: str) -> bool:
+    def validate_input(self, inp: Sequence[str], tgt: str) -> bool:
         return True
 
 
 class QuoteMode(IGameMode):
+    # QuoteService already keeps its own prefetch queue, and pooled placeholders
+    # would never be swapped for a real quote.
+    pool_size = 0
+
+    @property
+    def key(self) -> str:
+        return "quote"
+
     def generate_target(self, service: WordService) -> str:
         return service.get_quote()
 
-    def is_finished(self, inp: str, tgt: str, _: float) -> bool:
+    def is_finished(self, inp: Sequence[str], tgt: str, _: float) -> bool:
         return len(inp) >= len(tgt)
 
     def get_stats_text(self, _: int, __: int, ___: int) -> str:
         return "Quote Mode"
 
-    def validate_input(self, inp: str, tgt: str) -> bool:
+    def validate_input(self, inp: Sequence[str], tgt: str) -> bool:
         return True
 
 
 class SuddenDeathMode(IGameMode):
+    @property
+    def key(self) -> str:
+        return "death"
+
     def generate_target(self, service: WordService) -> str:
         return " ".join(service.get_words(30))
 
-    def is_finished(self, inp: str, tgt: str, _: float) -> bool:
+    def is_finished(self, inp: Sequence[str], tgt: str, _: float) -> bool:
         return len(inp) >= len(tgt)
 
     def get_stats_text(self, wpm: int, _: int, __: int) -> str:
         return f"💀 WPM: {wpm}"
 
     @property
-    def style_color(self) -> str:
-        return Config.COLORS['death']
+    def style_state(self) -> str:
+        return "death"
 
-    def validate_input(self, input_text: str, target_text: str) -> bool:
+    def validate_input(self, input_text: Sequence[str], target_text: str) -> bool:
         if not input_text:
             return True
         idx = len(input_text) - 1
         if idx < len(target_text) and input_text[idx] != target_text[idx]:
             return False
         return True
+
+    def validate_edit(self, edit: Edit, input_text: Sequence[str], target_text: str) -> bool:
+        if not edit.inserted:
+            return True
+        idx = edit.end - 1
+        return idx >= len(target_text) or edit.inserted[-1] == target_text[idx]
+
+
+class BookMode(IGameMode):
+    """Types through a text file of any size, resuming where the last session stopped.
+
+    The file is streamed (see ``TextFileStream``); progress is kept per file in
+    ``books.json`` under ``Config.DATA_DIR``.
+    """
+    pool_size = 0
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else self._default_path()
+        self._stream: Optional[TextFileStream] = None
+
+    @property
+    def key(self) -> str:
+        return "book"
+
+    @staticmethod
+    def _progress_path() -> Path:
+        return Config.DATA_DIR / "books.json"
+
+    @classmethod
+    def _load_progress(cls) -> dict:
+        try:
+            with cls._progress_path().open("r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    @classmethod
+    def _default_path(cls) -> Optional[Path]:
+        path = Config.BOOK_PATH or cls._load_progress().get("last")
+        return Path(path) if path else None
+
+    def _save_progress(self, path: Path, offset: int):
+        progress = self._load_progress()
+        progress.setdefault("offsets", {})[str(path)] = offset
+        progress["last"] = str(path)
+        try:
+            target = self._progress_path()
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_suffix(".tmp")
+            with tmp.open("w", encoding="utf-8") as f:
+                json.dump(progress, f)
+            tmp.replace(target)
+        except Exception as e:
+            print(f"Book progress save failed: {e}")
+
+    @staticmethod
+    def check(path: Path) -> Optional[str]:
+        """Why ``path`` cannot be typed as a book, or ``None`` if it can."""
+        try:
+            stream = TextFileStream(path)
+        except (OSError, ValueError) as e:
+            return str(e)
+        empty = stream.exhausted
+        stream.close(0)
+        return f"{Path(path).name} has no text to type" if empty else None
+
+    def open_stream(self, service: WordService) -> Optional[TargetStream]:
+        path = self.path
+        if path is None:
+            return None
+        offset = self._load_progress().get("offsets", {}).get(str(path), 0)
+
+        def on_close(off: int):
+            self._save_progress(path, off)
+
+        try:
+            stream = TextFileStream(path, offset, on_close)
+            if stream.exhausted and offset:
+                # Finished last time: release that mapping and start over.
+                stream.on_close = None
+                stream.close(0)
+                stream = TextFileStream(path, 0, on_close)
+        except (OSError, ValueError) as e:
+            print(f"Book open failed: {e}")
+            return None
+        if stream.exhausted:
+            # Empty or only whitespace: plain words rather than a blank round.
+            stream.on_close = None
+            stream.close(0)
+            print(f"Book open failed: {path.name} has no text to type")
+            return None
+        self._stream = stream
+        return stream
+
+    def generate_target(self, service: WordService) -> str:
+        # No book chosen (or it cannot be read): plain words.
+        self._stream = None
+        return " ".join(service.get_words(50))
+
+    def is_finished(self, inp: Sequence[str], tgt: str, _: float) -> bool:
+        return len(inp) >= len(tgt) and (self._stream is None or self._stream.exhausted)
+
+    def get_stats_text(self, wpm: int, acc: int, _: float) -> str:
+        if self._stream is None:
+            return f"WPM: {wpm} | ACC: {acc}%"
+        return f"📖 {self._stream.progress:.1%} | WPM: {wpm} | ACC: {acc}%"
+
+    def validate_input(self, inp: Sequence[str], tgt: str) -> bool:
+        return True
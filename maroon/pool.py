@@ -0,0 +1,80 @@
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Optional
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _submit(fn):
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="maroon-targets")
+    return _executor.submit(fn)
+
+
+class TargetPool:
+    """Birkaç hedef metni önceden üreten, arka planda yeniden dolan kuyruk.
+
+    ``pop`` serves a ready target when there is one (a hit) and generates it
+    inline otherwise (a miss); either way a background refill is scheduled.
+    """
+
+    def __init__(self, mode, service, size: int):
+        self.mode = mode
+        self.service = service
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._ready: Deque[str] = deque()
+        self._lock = threading.Lock()
+        self._refilling = False
+        self._generation = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __len__(self) -> int:
+        return len(self._ready)
+
+    def pop(self) -> str:
+        try:
+            target = self._ready.popleft()
+            self.hits += 1
+        except IndexError:
+            self.misses += 1
+            target = self.mode.generate_target(self.service)
+        self.refill()
+        return target
+
+    def refill(self):
+        with self._lock:
+            if self._refilling or len(self._ready) >= self.size:
+                return
+            self._refilling = True
+        _submit(self._fill)
+
+    def clear(self):
+        """Drop ready targets, e.g. after the word pool changed."""
+        with self._lock:
+            self._generation += 1
+            self._ready.clear()
+        self.refill()
+
+    def _fill(self):
+        try:
+            while len(self._ready) < self.size:
+                generation = self._generation
+                target = self.mode.generate_target(self.service)
+                with self._lock:
+                    if generation == self._generation:
+                        self._ready.append(target)
+        except Exception as e:
+            print(f"Target prefetch failed: {e}")
+        finally:
+            with self._lock:
+                self._refilling = False
@@ -0,0 +1,319 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .config import Config
+from .services import QuoteService, WordService
+
+LOBBY, COUNTDOWN, RUNNING = "lobby", "countdown", "running"
+
+
+def encode(msg: dict) -> bytes:
+    """One protocol line: compact JSON plus a newline."""
+    return json.dumps(msg, separators=(",", ":")).encode() + b"\n"
+
+
+class Player:
+    __slots__ = ("id", "name", "writer", "pos", "sent_pos", "done")
+
+    def __init__(self, player_id: int, name: str, writer: asyncio.StreamWriter):
+        self.id = player_id
+        self.name = name
+        self.writer = writer
+        self.pos = 0
+        self.sent_pos = 0
+        self.done = False
+
+
+class RaceServer:
+    """LAN race host speaking newline-delimited JSON over TCP.
+
+    Every race gets a target drawn from ``WordService`` with a fresh seed.
+    Progress messages only update a player record. Once per ``tick`` one
+    message carries ``[id, delta]`` for every player that moved since the last
+    tick; it is encoded once and the same bytes are written to every client.
+    Clients whose write buffer grows past ``MAX_BUFFER`` are dropped instead of
+    being waited for, so a slow client never delays the others.
+
+    Messages, server to client: ``welcome`` (own id and a snapshot of everyone),
+    ``join``, ``leave``, ``race`` (target text, countdown), ``go``, ``tick`` and
+    ``finish``. Client to server: ``hello``, ``p`` (position), ``start`` and
+    ``done``.
+    """
+    MAX_BUFFER = 256 * 1024
+
+    def __init__(self, service: Optional[WordService] = None, words: int = Config.RACE_WORDS,
+                 tick: float = Config.RACE_TICK, countdown: float = Config.RACE_COUNTDOWN,
+                 auto_start: int = 0):
+        self.service = service if service is not None else WordService(quotes=QuoteService(url=""))
+        self.words = words
+        self.tick = tick
+        self.countdown = countdown
+        self.auto_start = auto_start
+        self.players: Dict[int, Player] = {}
+        self.state = LOBBY
+        self.race: Optional[dict] = None
+        self.finished = 0
+        self.seq = 0
+        self._next_id = 1
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._ticker: Optional[asyncio.Task] = None
+        # Set to a list to record (seq, monotonic send time, seconds spent, bytes) per tick.
+        self.tick_log: Optional[List[Tuple[int, float, float, int]]] = None
+
+    async def start(self, host: str = Config.RACE_HOST, port: int = Config.RACE_PORT):
+        self._server = await asyncio.start_server(self._handle, host, port)
+        self._ticker = asyncio.create_task(self._tick_loop())
+        return self._server
+
+    @property
+    def port(self) -> int:
+        assert self._server is not None
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._ticker is not None:
+            self._ticker.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for p in list(self.players.values()):
+            p.writer.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        player = None
+        try:
+            hello = json.loads(await reader.readline() or b"{}")
+            if not isinstance(hello, dict):
+                return
+            player = Player(self._next_id, str(hello.get("name", ""))[:32] or f"player{self._next_id}",
+                            writer)
+            self._next_id += 1
+            self._broadcast({"t": "join", "id": player.id, "name": player.name})
+            self.players[player.id] = player
+            self._send(player, encode({
+                "t": "welcome", "id": player.id,
+                "players": [[p.id, p.name, p.sent_pos] for p in self.players.values()],
+            }))
+            if self.race is not None:
+                self._send(player, encode(self.race))
+                if self.state == RUNNING:
+                    self._send(player, encode({"t": "go", "id": self.race["id"]}))
+            if self.auto_start and len(self.players) >= self.auto_start and self.state == LOBBY:
+                self.start_race()
+            async for line in reader:
+                msg = json.loads(line)
+                if isinstance(msg, dict):
+                    self._on_message(player, msg)
+        except (ConnectionError, ValueError, KeyError, TypeError, AttributeError,
+                asyncio.IncompleteReadError):
+            # A peer sending malformed messages is dropped like one that hung up.
+            pass
+        finally:
+            if player is not None and self.players.pop(player.id, None) is not None:
+                self._broadcast({"t": "leave", "id": player.id})
+                if self.state == RUNNING and all(p.done for p in self.players.values()):
+                    self.state = LOBBY
+            writer.close()
+
+    def _on_message(self, player: Player, msg: dict):
+        kind = msg.get("t")
+        if kind == "p":
+            if self.state == RUNNING and not player.done and "pos" in msg:
+                player.pos = int(msg["pos"])
+        elif kind == "start":
+            self.start_race()
+        elif kind == "done" and self.state == RUNNING and not player.done:
+            player.done = True
+            player.pos = int(msg.get("pos", player.pos))
+            self.finished += 1
+            self._broadcast({"t": "finish", "id": player.id, "place": self.finished,
+                             "wpm": msg.get("wpm", 0), "acc": msg.get("acc", 0)})
+            if all(p.done for p in self.players.values()):
+                self.state = LOBBY
+
+    def start_race(self):
+        if self.state != LOBBY:
+            return
+        seed = random.randrange(2 ** 31)
+        race_id = (self.race["id"] + 1) if self.race else 1
+        self.race = {"t": "race", "id": race_id, "seed": seed, "start_in": self.countdown,
+                     "text": " ".join(self.service.get_words(self.words, seed=seed))}
+        self.finished = 0
+        for p in self.players.values():
+            p.pos = p.sent_pos = 0
+            p.done = False
+        self.state = COUNTDOWN
+        self._broadcast(self.race)
+        asyncio.get_running_loop().call_later(self.countdown, self._go, race_id)
+
+    def _go(self, race_id: int):
+        if self.race is None or self.race["id"] != race_id or self.state != COUNTDOWN:
+            return
+        self.state = RUNNING
+        self._broadcast({"t": "go", "id": race_id})
+
+    async def _tick_loop(self):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        while True:
+            deadline += self.tick
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
+            self.broadcast_tick()
+
+    def broadcast_tick(self):
+        t0 = time.perf_counter()
+        deltas = []
+        for p in self.players.values():
+            delta = p.pos - p.sent_pos
+            if delta:
+                deltas.append([p.id, delta])
+                p.sent_pos = p.pos
+        if not deltas:
+            return
+        self.seq += 1
+        data = encode({"t": "tick", "n": self.seq, "d": deltas})
+        self._write_all(data)
+        if self.tick_log is not None:
+            self.tick_log.append((self.seq, time.monotonic(), time.perf_counter() - t0, len(data)))
+
+    def _broadcast(self, msg: dict):
+        self._write_all(encode(msg))
+
+    def _write_all(self, data: bytes):
+        for p in list(self.players.values()):
+            self._send(p, data)
+
+    def _send(self, player: Player, data: bytes):
+        transport = player.writer.transport
+        if transport.is_closing():
+            return
+        if transport.get_write_buffer_size() > self.MAX_BUFFER:
+            print(f"Race client {player.id} too slow, dropped")
+            transport.abort()
+            return
+        player.writer.write(data)
+
+
+class RaceClient:
+    """Race participant; ``on_message`` runs on the client's event loop.
+
+    ``positions`` follows the server's deltas. ``progress`` may be set from any
+    thread after every keystroke; only the latest value is sent, once per tick.
+    """
+
+    def __init__(self, name: str, on_message: Optional[Callable[[dict], None]] = None,
+                 tick: float = Config.RACE_TICK):
+        self.name = name
+        self.on_message = on_message
+        self.tick = tick
+        self.id = 0
+        self.names: Dict[int, str] = {}
+        self.positions: Dict[int, int] = {}
+        self.progress = 0
+        self._sent = 0
+        self.racing = False
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def connect(self, host: str = Config.RACE_HOST, port: int = Config.RACE_PORT):
+        self._reader, self._writer = await asyncio.open_connection(host, port)
+        self._writer.write(encode({"t": "hello", "name": self.name}))
+
+    async def run(self):
+        """Read until the server goes away, flushing progress on the side."""
+        assert self._reader is not None
+        flusher = asyncio.create_task(self._flush_loop())
+        try:
+            async for line in self._reader:
+                try:
+                    msg = json.loads(line)
+                    if not isinstance(msg, dict):
+                        continue
+                    self._apply(msg)
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    continue
+                if self.on_message:
+                    self.on_message(msg)
+        finally:
+            flusher.cancel()
+
+    def _apply(self, msg: dict):
+        kind = msg.get("t")
+        if kind == "tick":
+            positions = self.positions
+            for player_id, delta in msg["d"]:
+                positions[player_id] = positions.get(player_id, 0) + delta
+        elif kind == "welcome":
+            self.id = msg["id"]
+            for player_id, name, pos in msg["players"]:
+                self.names[player_id] = name
+                self.positions[player_id] = pos
+        elif kind == "join":
+            self.names[msg["id"]] = msg["name"]
+            self.positions[msg["id"]] = 0
+        elif kind == "leave":
+            self.names.pop(msg["id"], None)
+            self.positions.pop(msg["id"], None)
+        elif kind == "race":
+            self.positions = dict.fromkeys(self.positions, 0)
+            self.progress = self._sent = 0
+            self.racing = False
+        elif kind == "go":
+            self.racing = True
+        elif kind == "finish" and msg["id"] == self.id:
+            self.racing = False
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.tick)
+            progress = self.progress
+            if self.racing and progress != self._sent:
+                self._sent = progress
+                self.send({"t": "p", "pos": progress})
+
+    def send(self, msg: dict):
+        if self._writer is not None and not self._writer.is_closing():
+            self._writer.write(encode(msg))
+
+    def request_start(self):
+        self.send({"t": "start"})
+
+    def finish(self, pos: int, wpm: int, acc: int):
+        self.progress = self._sent = pos
+        self.send({"t": "done", "pos": pos, "wpm": wpm, "acc": acc})
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+async def _serve(args):
+    server = RaceServer(words=args.words, tick=args.tick, countdown=args.countdown,
+                        auto_start=args.auto_start)
+    await server.start(args.host, args.port)
+    print(f"Race server on {args.host}:{server.port}")
+    await asyncio.Event().wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host LAN typing races.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=Config.RACE_PORT)
+    parser.add_argument("--words", type=int, default=Config.RACE_WORDS)
+    parser.add_argument("--tick", type=float, default=Config.RACE_TICK)
+    parser.add_argument("--countdown", type=float, default=Config.RACE_COUNTDOWN)
+    parser.add_argument("--auto-start", type=int, default=0,
+                        help="start a race once this many players are in the lobby")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
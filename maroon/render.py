@@ -0,0 +1,122 @@
+from html import escape
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from .config import Config
+
+CORRECT, ERROR, CURSOR, PENDING = range(4)
+
+
+def common_prefix(a: str, b: str) -> int:
+    """Length of the shared prefix; fast path for the usual append/backspace edits."""
+    if b.startswith(a):
+        return len(a)
+    if a.startswith(b):
+        return len(b)
+    i = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        i += 1
+    return i
+
+
+def style_runs(target: str, user_input: Sequence[str], start: int, end: int
+               ) -> Iterator[Tuple[int, int, int]]:
+    """Yield ``(state, run_start, run_end)`` for maximal same-styled runs in ``target[start:end]``."""
+    inp_len = len(user_input)
+    # Fast paths: untouched or fully correct ranges collapse into a single run.
+    if start > inp_len:
+        yield PENDING, start, end
+        return
+    if end <= inp_len and user_input[start:end] == target[start:end]:
+        yield CORRECT, start, end
+        return
+
+    run_state = -1
+    run_start = start
+    for i in range(start, end + 1):
+        if i == end:
+            state = -2
+        elif i < inp_len:
+            state = CORRECT if user_input[i] == target[i] else ERROR
+        elif i == inp_len:
+            state = CURSOR
+        else:
+            state = PENDING
+        if state != run_state:
+            if run_state >= 0:
+                yield run_state, run_start, i
+            run_state = state
+            run_start = i
+
+
+class HtmlRenderer:
+    """Target metnini blok blok önbellekleyerek HTML'e çevirir.
+
+    The target is cut into fixed-size blocks; each block keeps its HTML as merged
+    runs of same-styled characters. Only blocks touched by an edit (or by the old
+    and new cursor) are rebuilt, the rest are reused from the previous render.
+    """
+    BLOCK = 64
+    HEAD = "<html><head/><body><p style='line-height: 140%;'>"
+    TAIL = "</p></body></html>"
+
+    def __init__(self):
+        self.target = ""
+        self.user_input: Sequence[str] = ""
+        self._input_len = 0
+        self._blocks: List[str] = []
+        self._styles: Optional[Tuple[str, str, str, str]] = None
+        self._cursor_color = ""
+
+    def set_target(self, target: str):
+        self.target = target
+        self.user_input = ""
+        self._input_len = 0
+        self._blocks = []
+
+    def render(self, user_input: Sequence[str], cursor_color: str, dirty_from: int = 0) -> str:
+        styles = self._build_styles(cursor_color)
+        n_blocks = (len(self.target) + self.BLOCK - 1) // self.BLOCK
+        if styles != self._styles or len(self._blocks) != n_blocks:
+            self._styles = styles
+            self.user_input = user_input
+            self._input_len = len(user_input)
+            self._blocks = [self._build_block(b) for b in range(n_blocks)]
+        else:
+            old_len = self._input_len
+            self.user_input = user_input
+            self._input_len = len(user_input)
+            lo = min(dirty_from, old_len, len(user_input))
+            hi = max(old_len, len(user_input))
+            last = min(hi // self.BLOCK, n_blocks - 1)
+            for b in range(lo // self.BLOCK, last + 1):
+                self._blocks[b] = self._build_block(b)
+        return self.HEAD + "".join(self._blocks) + self.TAIL
+
+    @staticmethod
+    def _build_styles(cursor_color: str) -> Tuple[str, str, str, str]:
+        c = Config.COLORS
+        return (
+            f'<span style="color:{c["correct"]};">',
+            f'<span style="background-color:{c["error"]}; color:#222; border-radius:3px;">',
+            f'<span style="background-color:{cursor_color}; color:{c["bg"]};">',
+            f'<span style="color:{c["text_sub"]};">',
+        )
+
+    def _build_block(self, b: int) -> str:
+        assert self._styles is not None
+        tgt, inp = self.target, self.user_input
+        start = b * self.BLOCK
+        end = min(start + self.BLOCK, len(tgt))
+        styles = self._styles
+
+        parts = []
+        for state, run_start, run_end in style_runs(tgt, inp, start, end):
+            text = tgt[run_start:run_end]
+            if state == CURSOR and text == " ":
+                text = "&nbsp;"
+            else:
+                text = escape(text, quote=False)
+            parts.append(styles[state] + text + "</span>")
+        return "".join(parts)
@@ -1,53 +1,121 @@
+import json
+import queue
 import random
 import threading
 from pathlib import Path
-from typing import List
+from typing import TYPE_CHECKING, Callable, Dict, List, Mapping, Optional, Sequence
 import sys
 
-import requests
-
 from .config import Config
 
+# numpy and requests are imported where they are first needed so that they
+# stay off the startup path; see WordService(load_async=True).
+if TYPE_CHECKING:
+    from .wordlist import WordList, WordSampler
+
 
 class WordService:
-    """Kelimeleri ve alıntıları internetten çeken servis."""
+    """Kelimeleri ve alıntıları internetten çeken servis.
+
+    With ``load_async`` the word list is opened on a background thread started
+    by ``start``, so ``on_ready`` can be wired first; until then ``get_words``
+    draws from ``Config.LOCAL_WORDS`` and ``on_ready`` is called (from that
+    thread) once the real list is in place.
+    """
     _instance = None
 
-    def __init__(self):
-        self.word_pool = Config.LOCAL_WORDS.copy()
-        self.lock = threading.Lock()
-        loaded = self._load_local_words()
-        if not loaded:
-            self._start_download()
+    def __init__(self, load_async: bool = False, quotes: Optional["QuoteService"] = None):
+        # Readers grab the current sampler reference; loaders build a new one and swap it in.
+        self.sampler: Optional["WordSampler"] = None
+        self.word_list: Optional["WordList"] = None
+        self.lists: Dict[str, "WordList"] = {}
+        self.ready = threading.Event()
+        self.on_ready: Optional[Callable[[], None]] = None
+        # Letters/bigrams -> weight for get_focus_words; replaced as a whole, never mutated.
+        self.focus: Mapping[str, float] = {}
+        self.difficulty = self._load_settings().get("difficulty", Config.DEFAULT_DIFFICULTY)
+        if self.difficulty not in Config.DIFFICULTY_TIERS:
+            self.difficulty = Config.DEFAULT_DIFFICULTY
+        self.quotes = quotes if quotes is not None else QuoteService()
+        if not load_async:
+            self._load_words()
+
+    def start(self):
+        """Begin a ``load_async`` load; call after ``on_ready`` is set."""
+        threading.Thread(target=self._load_words, daemon=True).start()
+
+    def _load_words(self):
+        if not self._load_local_words():
+            threading.Thread(target=self._download_worker, daemon=True).start()
+        self.ready.set()
+        self._notify_ready()
 
-    def _start_download(self):
-        threading.Thread(target=self._download_worker, daemon=True).start()
+    def _notify_ready(self):
+        if self.on_ready:
+            self.on_ready()
 
     def _download_worker(self):
         try:
+            import requests
+            from .wordlist import WordSampler
+
             r = requests.get(Config.WORD_LIST_URL, timeout=10)
             words = [w for w in r.text.splitlines() if 3 <= len(w) <= 10 and w.isalpha()]
-            with self.lock:
-                self.word_pool = words
+            if words:
+                self.sampler = WordSampler(words)
+                self._notify_ready()
         except Exception as e:
             print(f"Word download failed: {e}")
 
     def _load_local_words(self) -> bool:
         """Load bundled 20k word list to avoid network dependency."""
         try:
-            path = self._data_path("20k.txt")
-            if not path.exists():
+            word_list = self.open_list(Config.WORD_LIST_NAME)
+            if word_list is None or not len(word_list):
                 return False
-            with path.open("r", encoding="utf-8") as f:
-                words = [w.strip() for w in f if 3 <= len(w.strip()) <= 10 and w.strip().isalpha()]
-            if words:
-                with self.lock:
-                    self.word_pool = words
-                return True
+            self.use_list(word_list)
+            return True
         except Exception as e:
             print(f"Local word load failed: {e}")
         return False
 
+    def open_list(self, name: str) -> Optional["WordList"]:
+        """Map ``<name>.txt`` through its compiled copy, recompiling it when the source changed."""
+        from .wordlist import WordList
+
+        word_list = self.lists.get(name)
+        if word_list is not None:
+            return word_list
+        source = self._data_path(f"{name}.txt")
+        compiled = Config.DATA_DIR / "wordlists" / f"{name}.mwl"
+        if compiled.exists():
+            word_list = WordList(compiled)
+            if source.exists() and not word_list.is_current(source):
+                word_list = None
+        if word_list is None:
+            if not source.exists():
+                return None
+            word_list = WordList.compile(source, compiled)
+        self.lists[name] = word_list
+        return word_list
+
+    def use_list(self, word_list: "WordList", difficulty: Optional[str] = None):
+        if difficulty in Config.DIFFICULTY_TIERS:
+            self.difficulty = difficulty
+        self.word_list = word_list
+        self.sampler = word_list.view(*Config.DIFFICULTY_TIERS[self.difficulty])
+
+    def set_difficulty(self, difficulty: str):
+        if self.word_list is not None:
+            self.use_list(self.word_list, difficulty)
+
+    def _load_settings(self) -> dict:
+        try:
+            with self._data_path("settings.json").open("r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
     @staticmethod
     def _data_path(filename: str) -> Path:
         base = getattr(sys, "_MEIPASS", None)
@@ -55,20 +123,143 @@ class WordService:
             return Path(base) / filename
         return Path(__file__).resolve().parents[1] / filename
 
-    def get_words(self, count: int) -> List[str]:
-        with self.lock:
-            if not self.word_pool:
-                return Config.LOCAL_WORDS[:count]
-            pool_len = len(self.word_pool)
-            return [self.word_pool[int(random.triangular(0, pool_len, 0))] for _ in range(count)]
+    @property
+    def word_pool(self) -> Sequence[str]:
+        sampler = self.sampler
+        return sampler.words if sampler is not None else tuple(Config.LOCAL_WORDS)
+
+    def get_words(self, count: int, seed: Optional[int] = None) -> List[str]:
+        """Draw ``count`` words; the same ``seed`` always yields the same words."""
+        sampler = self.sampler
+        if sampler is None or not len(sampler):
+            rng = random.Random(seed) if seed is not None else random
+            return rng.choices(Config.LOCAL_WORDS, k=count)
+        if seed is None:
+            return sampler.draw(count)
+        import numpy as np
+
+        return sampler.draw(count, np.random.default_rng(seed))
+
+    def get_focus_words(self, count: int, seed: Optional[int] = None) -> List[str]:
+        """Like ``get_words``, weighted towards words that contain a ``focus`` letter or bigram."""
+        sampler, focus = self.sampler, self.focus
+        if sampler is None or not len(sampler) or not focus:
+            return self.get_words(count, seed)
+        import numpy as np
+
+        rng = np.random.default_rng(seed) if seed is not None else None
+        return sampler.draw_focused(count, focus, Config.ADAPTIVE_SHARE, rng)
 
     def get_quote(self) -> str:
+        return self.quotes.get_quote()
+
+
+class QuoteService:
+    """Alıntıları arka planda çeken, kuyrukta ve diskte saklayan servis.
+
+    ``get_quote`` never touches the network: it pops a prefetched quote, falls
+    back to the on-disk cache, and only returns ``PLACEHOLDER`` when both are
+    empty. In that case ``on_quote`` is called (from the worker thread) with the
+    next fresh quote so the caller can swap it in. An empty ``url`` keeps the
+    service offline (cache and placeholder only).
+    """
+    PLACEHOLDER = "The quick brown fox jumps over the lazy dog. — Fallback"
+    RETRY_DELAY = 5.0
+
+    def __init__(self, url: str = Config.QUOTE_API_URL, cache_path: Optional[Path] = None,
+                 prefetch: int = Config.QUOTE_PREFETCH, timeout: float = 3):
+        self.url = url
+        self.timeout = timeout
+        self.cache_path = cache_path or Config.DATA_DIR / "quotes.json"
+        self.ready: "queue.Queue[str]" = queue.Queue(maxsize=max(1, prefetch))
+        self.on_quote: Optional[Callable[[str], None]] = None
+        self.lock = threading.Lock()
+        self._cache = self._load_cache()
+        self._waiting = False
+        self._wake = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+    def get_quote(self) -> str:
+        self._ensure_worker()
+        try:
+            quote = self.ready.get_nowait()
+        except queue.Empty:
+            quote = None
+        self._wake.set()
+        if quote:
+            return quote
+        with self.lock:
+            if self._cache:
+                return random.choice(self._cache)
+            self._waiting = True
+        return self.PLACEHOLDER
+
+    def _ensure_worker(self):
+        if self._worker is None and self.url:
+            self._worker = threading.Thread(target=self._prefetch_worker, daemon=True)
+            self._worker.start()
+
+    def _prefetch_worker(self):
+        while True:
+            if self.ready.full() and not self._waiting:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            quote = self._fetch()
+            if quote is None:
+                self._wake.wait(self.RETRY_DELAY)
+                self._wake.clear()
+                continue
+            self._remember(quote)
+            with self.lock:
+                waiting, self._waiting = self._waiting, False
+            if waiting and self.on_quote:
+                self.on_quote(quote)
+            else:
+                try:
+                    self.ready.put_nowait(quote)
+                except queue.Full:
+                    pass
+
+    def _fetch(self) -> Optional[str]:
         try:
-            r = requests.get(Config.QUOTE_API_URL, verify=False, timeout=3)
+            import requests
+
+            r = requests.get(self.url, verify=False, timeout=self.timeout)
             data = r.json()
             content = data.get("content", "")
             author = data.get("author", "Unknown")
+            if not content:
+                return None
             formatted = content.replace("’", "'").replace("“", '"').replace("”", '"')
             return f"{formatted} — {author}"
-        except Exception:
-            return "The quick brown fox jumps over the lazy dog. — Fallback"
+        except Exception as e:
+            print(f"Quote fetch failed: {e}")
+            return None
+
+    def _load_cache(self) -> List[str]:
+        try:
+            with self.cache_path.open("r", encoding="utf-8") as f:
+                quotes = json.load(f)
+            return [q for q in quotes if isinstance(q, str) and q]
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            print(f"Quote cache load failed: {e}")
+            return []
+
+    def _remember(self, quote: str):
+        with self.lock:
+            if quote in self._cache:
+                return
+            self._cache.append(quote)
+            del self._cache[:-Config.QUOTE_CACHE_SIZE]
+            snapshot = list(self._cache)
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_suffix(".tmp")
+            with tmp.open("w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+            tmp.replace(self.cache_path)
+        except Exception as e:
+            print(f"Quote cache save failed: {e}")
@@ -0,0 +1,53 @@
+from .buffer import Edit
+
+
+class InputStats:
+    """Running accuracy counters, updated from each input ``Edit``.
+
+    ``correct``/``incorrect`` count typed characters inside the target, ``extra``
+    counts characters past its end and ``corrected`` accumulates mistakes that
+    were later deleted. Every update only touches the characters that changed.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.correct = 0
+        self.incorrect = 0
+        self.extra = 0
+        self.corrected = 0
+
+    @property
+    def typed(self) -> int:
+        return self.correct + self.incorrect + self.extra
+
+    def apply(self, target: str, edit: Edit):
+        """Account for ``edit.removed`` being replaced by ``edit.inserted``."""
+        correct, incorrect, extra = self._count(target, edit.removed, edit.start)
+        self.correct -= correct
+        self.incorrect -= incorrect
+        self.extra -= extra
+        self.corrected += incorrect
+
+        correct, incorrect, extra = self._count(target, edit.inserted, edit.start)
+        self.correct += correct
+        self.incorrect += incorrect
+        self.extra += extra
+
+    @staticmethod
+    def _count(target: str, text: str, offset: int):
+        """Classify ``text`` as if it was typed starting at ``offset``."""
+        inside = max(0, min(len(text), len(target) - offset))
+        correct = sum(1 for i in range(inside) if text[i] == target[offset + i])
+        return correct, inside - correct, len(text) - inside
+
+    def verify(self, target: str, text):
+        """Debug check: recount everything and compare with the running counters."""
+        correct, incorrect, extra = self._count(target, str(text), 0)
+        expected = (correct, incorrect, extra)
+        actual = (self.correct, self.incorrect, self.extra)
+        if expected != actual:
+            raise AssertionError(
+                f"InputStats drift: counters {actual} != recount {expected}"
+            )
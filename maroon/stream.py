@@ -0,0 +1,170 @@
+import codecs
+import mmap
+import re
+from abc import ABC, abstractmethod
+from collections import deque
+from pathlib import Path
+from typing import Callable, Deque, Iterator, Optional, Tuple
+
+_SPACE = re.compile(rb"\s")
+_NON_SPACE = re.compile(rb"\S")
+_WORD = re.compile(rb"\S+")
+# Typographic characters most keyboards cannot type directly.
+_TYPABLE = str.maketrans({
+    "‘": "'", "’": "'", "“": '"', "”": '"',
+    "–": "-", "—": "-", "…": "...", "\u00a0": " ",
+})
+
+
+def normalize(text: str) -> str:
+    """Typable form of ``text``: plain punctuation, whitespace runs collapsed to one space."""
+    return " ".join(text.translate(_TYPABLE).split())
+
+
+class TargetStream(ABC):
+    """Target text handed to ``GameCore`` a chunk at a time.
+
+    Positions are characters since the stream was opened. The core reads ahead
+    of the cursor, calls ``release`` when it drops text from its window and
+    ``close`` when the round ends.
+    """
+    exhausted = False
+
+    @abstractmethod
+    def read(self, size: int) -> str:
+        """About ``size`` more characters, cut after a word; ``""`` once exhausted."""
+
+    def release(self, position: int):
+        """Everything before ``position`` left the window and will not be asked about again."""
+
+    def close(self, position: int):
+        """The round ended with the cursor at ``position``."""
+
+
+class ChunkStream(TargetStream):
+    """Stream over an iterator of text chunks, each ending in a space; endless if the iterator is."""
+
+    def __init__(self, chunks: Iterator[str]):
+        self._chunks = chunks
+
+    def read(self, size: int) -> str:
+        parts = []
+        n = 0
+        while n < size and not self.exhausted:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self.exhausted = True
+            else:
+                parts.append(chunk)
+                n += len(chunk)
+        return "".join(parts)
+
+
+class TextFileStream(TargetStream):
+    """Memory-mapped text file read from a byte offset, one word-aligned chunk at a time.
+
+    Only the mapping and the chunk being read are touched, so cost and memory do
+    not depend on the file size. Chunk start offsets are kept until released so
+    ``close`` can turn the cursor position back into a byte offset to resume from.
+    Files whose start is not UTF-8 text raise ``ValueError``.
+    """
+    # Bytes checked for text when opening; later damage only costs U+FFFD characters.
+    SNIFF = 64 * 1024
+
+    def __init__(self, path: Path, offset: int = 0,
+                 on_close: Optional[Callable[[int], None]] = None):
+        self.path = Path(path)
+        self.on_close = on_close
+        with self.path.open("rb") as f:
+            self.size = f.seek(0, 2)
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+        if self._mm is not None and not self._is_text(self._mm[:self.SNIFF], self.size <= self.SNIFF):
+            self._mm.close()
+            raise ValueError(f"{self.path.name} is not UTF-8 text")
+        self.offset = self._skip_space(min(max(0, offset), self.size))
+        self.position = 0
+        # (character position, byte offset) where each unreleased chunk starts.
+        self._anchors: Deque[Tuple[int, int]] = deque()
+        self.exhausted = self.offset >= self.size
+
+    @staticmethod
+    def _is_text(head: bytes, whole: bool) -> bool:
+        if b"\0" in head:
+            return False
+        try:
+            # A cut-off character at the end of the sample is not an error.
+            codecs.getincrementaldecoder("utf-8")().decode(head, final=whole)
+        except UnicodeDecodeError:
+            return False
+        return True
+
+    def _skip_space(self, offset: int) -> int:
+        if self._mm is None:
+            return self.size
+        m = _NON_SPACE.search(self._mm, offset)
+        return m.start() if m else self.size
+
+    def read(self, size: int) -> str:
+        if self.exhausted:
+            return ""
+        mm = self._mm
+        start = self.offset
+        end = start + size
+        if end >= self.size:
+            end = self.size
+        else:
+            # Prefer a word boundary, but never scan far on text without spaces.
+            limit = min(self.size, end + 256)
+            m = _SPACE.search(mm, end, limit)
+            if m:
+                end = m.start()
+            elif limit == self.size:
+                end = self.size
+            else:
+                while end > start + 1 and mm[end] & 0xC0 == 0x80:
+                    end -= 1
+        text = normalize(mm[start:end].decode("utf-8", "replace"))
+        self.offset = self._skip_space(end)
+        self.exhausted = self.offset >= self.size
+        if text and not self.exhausted:
+            text += " "
+        self._anchors.append((self.position, start))
+        self.position += len(text)
+        return text
+
+    @property
+    def progress(self) -> float:
+        return self.offset / self.size if self.size else 1.0
+
+    def release(self, position: int):
+        anchors = self._anchors
+        while len(anchors) > 1 and anchors[1][0] <= position:
+            anchors.popleft()
+
+    def byte_offset(self, position: int) -> int:
+        """Offset of the word holding character ``position`` (the file end once all is typed)."""
+        if position >= self.position and self.exhausted:
+            return self.size
+        if not self._anchors:
+            return self.offset
+        chars, offset = self._anchors[0]
+        for anchor in self._anchors:
+            if anchor[0] > position:
+                break
+            chars, offset = anchor
+        # Walk the chunk's words until the one the cursor is in.
+        for m in _WORD.finditer(self._mm, offset, self.offset):
+            width = len(normalize(m.group().decode("utf-8", "replace"))) + 1
+            if chars + width > position:
+                return m.start()
+            chars += width
+        return self.offset
+
+    def close(self, position: int):
+        offset = self.byte_offset(position)
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self.exhausted = True
+        if self.on_close:
+            self.on_close(offset)
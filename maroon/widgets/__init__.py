@@ -1,6 +1,17 @@
 from .finish_overlay import FinishOverlay
+from .latency_overlay import LatencyOverlay
 from .main_window import MainWindow
 from .mode_button import ModeButton
 from .settings_dialog import SettingsDialog
+from .stats_dialog import StatsDialog
+from .typing_surface import TypingSurface
 
-__all__ = ["MainWindow", "ModeButton", "FinishOverlay", "SettingsDialog"]
+__all__ = [
+    "MainWindow",
+    "ModeButton",
+    "FinishOverlay",
+    "SettingsDialog",
+    "StatsDialog",
+    "TypingSurface",
+    "LatencyOverlay",
+]
@@ -0,0 +1,219 @@
+import math
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from PyQt6.QtCore import QPoint, QRect, QRectF, Qt, pyqtProperty
+from PyQt6.QtGui import QColor, QImage, QPainter, QPixmap, QTransform
+from PyQt6.QtWidgets import (QGraphicsBlurEffect, QGraphicsDropShadowEffect, QGraphicsEffect,
+                             QGraphicsPixmapItem, QGraphicsScene)
+
+_DEVICE = Qt.CoordinateSystem.DeviceCoordinates
+_PAD = QGraphicsEffect.PixmapPadMode.PadToEffectiveBoundingRect
+_ARGB = QImage.Format.Format_ARGB32_Premultiplied
+
+
+def blur_image(image: QImage, radius: float) -> QImage:
+    """``image`` blurred by Qt's own blur filter; same size, transparent beyond the edges."""
+    source = QImage(image)
+    source.setDevicePixelRatio(1)
+    item = QGraphicsPixmapItem(QPixmap.fromImage(source))
+    effect = QGraphicsBlurEffect()
+    effect.setBlurRadius(radius)
+    item.setGraphicsEffect(effect)
+    scene = QGraphicsScene()
+    scene.addItem(item)
+    out = QImage(source.size(), _ARGB)
+    out.fill(0)
+    painter = QPainter(out)
+    scene.render(painter, QRectF(out.rect()), QRectF(out.rect()))
+    painter.end()
+    return out
+
+
+def _pixels(image: QImage) -> np.ndarray:
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+    rows = np.frombuffer(bits, np.uint32).reshape(image.height(), image.bytesPerLine() // 4)
+    return rows[:, :image.width()].copy()
+
+
+def _draw_in_device(painter: QPainter, offset: QPoint, image: QImage):
+    restore = painter.worldTransform()
+    painter.setWorldTransform(QTransform())
+    painter.drawImage(offset, image)
+    painter.setWorldTransform(restore)
+
+
+class CachedBlurEffect(QGraphicsEffect):
+    """``QGraphicsBlurEffect`` that keeps its output between repaints.
+
+    Qt re-blurs the whole source whenever any part of it repaints. This effect
+    keeps the last source and its blur; when the source changes it re-blurs
+    only the changed rectangle plus the blur's reach, so a label ticking in a
+    blurred header costs a blur of the label, not of the header.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._shape = QGraphicsBlurEffect(self)
+        self._source: Optional[np.ndarray] = None
+        self._source_key = 0
+        self._offset = QPoint()
+        self._image: Optional[QImage] = None
+
+    def _radius(self) -> float:
+        return self._shape.blurRadius()
+
+    def setBlurRadius(self, radius: float):
+        if radius == self._shape.blurRadius():
+            return
+        self._shape.setBlurRadius(radius)
+        self._image = None
+        self.updateBoundingRect()
+        self.update()
+
+    blurRadius = pyqtProperty(float, _radius, setBlurRadius)
+
+    def boundingRectFor(self, rect: QRectF) -> QRectF:
+        return self._shape.boundingRectFor(rect)
+
+    def sourceChanged(self, flags):
+        if flags & (QGraphicsEffect.ChangeFlag.SourceBoundingRectChanged
+                    | QGraphicsEffect.ChangeFlag.SourceDetached):
+            self._image = None
+
+    def draw(self, painter: QPainter):
+        radius = self._shape.blurRadius()
+        if radius <= 0:
+            self.drawSource(painter)
+            return
+        pixmap, offset = self.sourcePixmap(_DEVICE, _PAD)
+        if pixmap.isNull():
+            return
+        if self._image is None or pixmap.cacheKey() != self._source_key or offset != self._offset:
+            self._refresh(pixmap, offset, radius)
+        _draw_in_device(painter, offset, self._image)
+
+    def _refresh(self, pixmap: QPixmap, offset: QPoint, radius: float):
+        image = pixmap.toImage().convertToFormat(_ARGB)
+        pixels = _pixels(image)
+        old, blurred = self._source, self._image
+        if blurred is None or offset != self._offset or old is None or old.shape != pixels.shape:
+            blurred = blur_image(image, radius)
+        else:
+            changed = pixels != old
+            rows = np.flatnonzero(changed.any(axis=1))
+            if rows.size:
+                cols = np.flatnonzero(changed.any(axis=0))
+                dirty = QRect(int(cols[0]), int(rows[0]), int(cols[-1] - cols[0]) + 1,
+                              int(rows[-1] - rows[0]) + 1)
+                self._patch(blurred, image, dirty, radius)
+        blurred.setDevicePixelRatio(pixmap.devicePixelRatio())
+        self._source, self._source_key, self._offset, self._image = pixels, pixmap.cacheKey(), offset, blurred
+
+    @staticmethod
+    def _patch(blurred: QImage, image: QImage, dirty: QRect, radius: float):
+        # A changed pixel moves the blur up to ``reach`` pixels away. The band
+        # is blurred with four reaches of real context, enough for Qt's
+        # recursive blur to settle to the same values as a full pass; even
+        # origins keep its half-scaled pass aligned.
+        reach = math.ceil(radius * 2.5) + 1
+        bounds = image.rect()
+        band = dirty.adjusted(-4 * reach, -4 * reach, 4 * reach, 4 * reach).intersected(bounds)
+        band.setLeft(band.left() & ~1)
+        band.setTop(band.top() & ~1)
+        patch = blur_image(image.copy(band), radius)
+        target = dirty.adjusted(-reach, -reach, reach, reach).intersected(bounds)
+        painter = QPainter(blurred)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+        painter.drawImage(target.topLeft(), patch, target.translated(-band.topLeft()))
+        painter.end()
+
+
+class CachedDropShadowEffect(QGraphicsEffect):
+    """``QGraphicsDropShadowEffect`` with the shadow kept as an image.
+
+    The shadow only depends on the source's outline, so it is built once per
+    geometry and radius (the pulse animation steps through whole-pixel radii)
+    and the source is painted directly, clipped to the repainted region,
+    instead of being rendered offscreen and re-blurred on every keystroke.
+    """
+    CACHE_SIZE = 32
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._shape = QGraphicsDropShadowEffect(self)
+        self._shadows: Dict[Tuple[int, int, int, int, float], Tuple[QPoint, QImage]] = {}
+
+    def _radius(self) -> float:
+        return self._shape.blurRadius()
+
+    def setBlurRadius(self, radius: float):
+        radius = float(round(radius))
+        if radius == self._shape.blurRadius():
+            return
+        self._shape.setBlurRadius(radius)
+        self.updateBoundingRect()
+        self.update()
+
+    blurRadius = pyqtProperty(float, _radius, setBlurRadius)
+
+    def color(self) -> QColor:
+        return self._shape.color()
+
+    def setColor(self, color: QColor):
+        self._shape.setColor(color)
+        self._shadows.clear()
+        self.update()
+
+    def offset(self):
+        return self._shape.offset()
+
+    def setOffset(self, dx: float, dy: float):
+        self._shape.setOffset(dx, dy)
+        self._shadows.clear()
+        self.updateBoundingRect()
+        self.update()
+
+    def boundingRectFor(self, rect: QRectF) -> QRectF:
+        return self._shape.boundingRectFor(rect)
+
+    def sourceChanged(self, flags):
+        if flags & (QGraphicsEffect.ChangeFlag.SourceBoundingRectChanged
+                    | QGraphicsEffect.ChangeFlag.SourceDetached):
+            self._shadows.clear()
+
+    def draw(self, painter: QPainter):
+        rect = painter.worldTransform().mapRect(self.sourceBoundingRect()).toAlignedRect()
+        key = (rect.x(), rect.y(), rect.width(), rect.height(), self._shape.blurRadius())
+        shadow = self._shadows.get(key)
+        if shadow is None:
+            shadow = self._build()
+            if shadow is None:
+                return
+            if len(self._shadows) >= self.CACHE_SIZE:
+                self._shadows.clear()
+            self._shadows[key] = shadow
+        _draw_in_device(painter, *shadow)
+        self.drawSource(painter)
+
+    def _build(self) -> Optional[Tuple[QPoint, QImage]]:
+        """Same steps as Qt's drop shadow filter: offset alpha, blur, tint."""
+        pixmap, offset = self.sourcePixmap(_DEVICE, _PAD)
+        if pixmap.isNull():
+            return None
+        source = pixmap.toImage()
+        source.setDevicePixelRatio(1)
+        shifted = QImage(source.size(), _ARGB)
+        shifted.fill(0)
+        painter = QPainter(shifted)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+        painter.drawImage(self._shape.offset() * pixmap.devicePixelRatio(), source)
+        painter.end()
+        shadow = blur_image(shifted, self._shape.blurRadius())
+        painter = QPainter(shadow)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceIn)
+        painter.fillRect(shadow.rect(), self._shape.color())
+        painter.end()
+        shadow.setDevicePixelRatio(pixmap.devicePixelRatio())
+        return offset, shadow
@@ -3,6 +3,7 @@ from PyQt6.QtGui import QFont
 from PyQt6.QtWidgets import QFrame, QLabel, QVBoxLayout
 
 from ..config import Config
+from .theme_style import ThemeStyle, set_sheet, set_state
 
 
 class FinishOverlay(QFrame):
@@ -17,10 +18,12 @@ class FinishOverlay(QFrame):
         layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         self.lbl_finish_score = QLabel("", self)
+        self.lbl_finish_score.setObjectName("finishScore")
         self.lbl_finish_score.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.lbl_finish_score.setFont(QFont(Config.FONT_FAMILY, 46, QFont.Weight.Black))
 
         self.lbl_finish_sub = QLabel("", self)
+        self.lbl_finish_sub.setObjectName("finishSub")
         self.lbl_finish_sub.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.lbl_finish_sub.setWordWrap(True)
         self.lbl_finish_sub.setFont(QFont(Config.FONT_FAMILY, 16, QFont.Weight.DemiBold))
@@ -32,21 +35,13 @@ class FinishOverlay(QFrame):
         self.apply_theme()
 
     def apply_theme(self):
-        c = Config.COLORS
-        self.setStyleSheet(
-            f"background-color: rgba(0, 0, 0, 150); border: 2px solid {c['border']}; "
-            f"border-radius: 16px; padding: 28px;"
-        )
-        self.lbl_finish_score.setStyleSheet(f"color: {c['accent']};")
-        self.lbl_finish_sub.setStyleSheet(f"color: {c['text_main']}; letter-spacing: 0.3px;")
+        set_sheet(self, ThemeStyle.current().finish_overlay)
 
     def set_result(self, success: bool, wpm: int, acc: int):
-        c = Config.COLORS
-        accent = c['correct'] if success else c['death']
         status = "Tamamlandı" if success else "Hata!"
         self.lbl_finish_score.setText(f"{wpm} WPM")
         self.lbl_finish_sub.setText(f"{status} • Doğruluk: {acc}%\nTAB ile yeniden başlat.")
-        self.lbl_finish_score.setStyleSheet(f"color: {accent};")
+        set_state(self.lbl_finish_score, "state", "success" if success else "death")
         self.show()
         self.raise_()
 
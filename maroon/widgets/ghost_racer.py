@@ -0,0 +1,119 @@
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from PyQt6.QtCore import QObject, Qt, QTimer
+
+from ..config import Config
+from ..ghost import GhostTimeline
+
+
+class GhostRacer(QObject):
+    """Moves ghost cursors on the typing surface once per frame while a round runs.
+
+    The personal-best ghost is the best completed round of the current mode in
+    the history store; recordings are keystroke-log files added by the user;
+    live ghosts are positions pushed from outside (race opponents).
+    Each update costs one timeline lookup per ghost, and the surface only
+    repaints ghosts that moved. While the player types, ``update_positions``
+    rides along with the text flush so both land in one paint; the timer only
+    fills the gaps.
+    """
+
+    def __init__(self, engine, surface, interval_ms: int = 16, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.surface = surface
+        self.pb_enabled = False
+        self.pb: Optional[GhostTimeline] = None
+        self.recordings: List[GhostTimeline] = []
+        self.live: Dict[int, int] = {}
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._on_timer)
+        self._interval_ns = interval_ms * 1_000_000
+        self._last_update_ns = 0
+
+    @property
+    def ghosts(self) -> List[GhostTimeline]:
+        return ([self.pb] if self.pb is not None else []) + self.recordings
+
+    def toggle_pb(self) -> bool:
+        self.pb_enabled = not self.pb_enabled
+        self.reload()
+        return self.pb_enabled
+
+    def add_recording(self, path: Path) -> bool:
+        try:
+            timeline = GhostTimeline.from_file(path)
+        except Exception as e:
+            print(f"Ghost load failed: {e}")
+            return False
+        self.add(timeline)
+        return True
+
+    def add(self, timeline: GhostTimeline):
+        self.recordings.append(timeline)
+        self._restart()
+
+    def set_live(self, positions: Dict[int, int]):
+        """Replace the live ghosts; ``positions`` are round positions keyed by player."""
+        restart = positions.keys() != self.live.keys()
+        self.live = positions
+        if restart:
+            self._restart()
+        else:
+            self.update_positions()
+
+    def clear_recordings(self):
+        self.recordings.clear()
+        self._restart()
+
+    def reload(self):
+        """New round: pick up the current mode's personal best."""
+        self.pb = self._load_pb() if self.pb_enabled else None
+        self._restart()
+
+    def _load_pb(self) -> Optional[GhostTimeline]:
+        mode = self.engine.mode
+        if mode is None:
+            return None
+        try:
+            history = self.engine.history
+            best = history.aggregate(mode.key)
+            log = history.keylog(best.best_id) if best and best.best_id else None
+        except Exception as e:
+            print(f"Ghost load failed: {e}")
+            return None
+        return GhostTimeline(log, "best") if log is not None and len(log) else None
+
+    def _restart(self):
+        count = len(self.ghosts) + len(self.live)
+        colors = [Config.GHOST_COLORS[i % len(Config.GHOST_COLORS)] for i in range(count)]
+        self.surface.set_ghosts([0] * count, colors)
+        if count:
+            self._timer.start()
+            self.update_positions()
+        else:
+            self._timer.stop()
+
+    def _on_timer(self):
+        if time.perf_counter_ns() - self._last_update_ns >= self._interval_ns // 2:
+            self.update_positions()
+
+    def update_positions(self):
+        if not self._timer.isActive():
+            return
+        self._last_update_ns = time.perf_counter_ns()
+        core = self.engine.core
+        if core.start_time is None:
+            elapsed_ns = -1
+        elif core.finished:
+            elapsed_ns = int(core.last_elapsed * 1e9)
+        else:
+            elapsed_ns = int(core.elapsed() * 1e9)
+        offset = core.window_offset
+        positions = [g.position_at(elapsed_ns) - offset for g in self.ghosts]
+        positions.extend(pos - offset for pos in self.live.values())
+        self.surface.set_ghosts(positions)
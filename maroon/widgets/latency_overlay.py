@@ -0,0 +1,53 @@
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import QLabel
+
+from ..config import Config
+from ..latency import SERIES, LatencyRecorder
+from .theme_style import ThemeStyle, set_sheet
+
+
+class LatencyOverlay(QLabel):
+    """Small corner panel with live p50/p95/p99 key-to-stage latencies."""
+
+    def __init__(self, recorder: LatencyRecorder, parent=None):
+        super().__init__(parent)
+        self.recorder = recorder
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
+        font = QFont(Config.FONT_FAMILY, 10)
+        font.setStyleHint(QFont.StyleHint.Monospace)
+        self.setFont(font)
+        self.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
+        self.timer = QTimer(self)
+        self.timer.setInterval(500)
+        self.timer.timeout.connect(self.refresh)
+        self.apply_theme()
+        self.hide()
+
+    def apply_theme(self):
+        set_sheet(self, ThemeStyle.current().latency_overlay)
+
+    def toggle(self):
+        if self.isVisible():
+            self.timer.stop()
+            self.hide()
+        else:
+            self.refresh()
+            self.show()
+            self.raise_()
+            self.timer.start()
+
+    def refresh(self):
+        stats = self.recorder.percentiles()
+        lines = ["key → stage   p50    p95    p99 (ms)"]
+        for stage in SERIES:
+            p = stats.get(stage)
+            if p is None:
+                lines.append(f"{stage:<10}     -      -      -")
+            else:
+                lines.append(f"{stage:<10} {p[50]:6.2f} {p[95]:6.2f} {p[99]:6.2f}")
+        self.setText("\n".join(lines))
+        self.adjustSize()
+        parent = self.parentWidget()
+        if parent is not None:
+            self.move(parent.width() - self.width() - 12, 12)
@@ -1,22 +1,39 @@
-from PyQt6.QtCore import QAbstractAnimation, QEasingCurve, QPropertyAnimation, Qt
-from PyQt6.QtGui import QColor, QCursor, QFont
-from PyQt6.QtWidgets import (QFrame, QGraphicsBlurEffect, QGraphicsDropShadowEffect,
+import getpass
+import importlib
+import os
+import threading
+import time
+from pathlib import Path
+
+from PyQt6.QtCore import QAbstractAnimation, QEasingCurve, QEvent, QPropertyAnimation, Qt
+from PyQt6.QtGui import QColor, QCursor
+from PyQt6.QtWidgets import (QFileDialog, QFrame, QGraphicsBlurEffect, QGraphicsDropShadowEffect,
                              QHBoxLayout, QLabel, QMainWindow, QPushButton, QVBoxLayout,
                              QWidget)
 
 from ..config import Config
 from ..engine import GameEngine
-from ..modes import IGameMode, QuoteMode, SuddenDeathMode, TimeMode, WordMode
+from ..latency import FRAME, LatencyRecorder
+from ..modes import (AdaptiveMode, BookMode, IGameMode, QuoteMode, RaceMode, SuddenDeathMode,
+                     TimeMode, WordMode)
 from .finish_overlay import FinishOverlay
+from .ghost_racer import GhostRacer
+from .latency_overlay import LatencyOverlay
 from .mode_button import ModeButton
+from .race_link import RaceLink
+from .render_scheduler import RenderScheduler
 from .settings_dialog import SettingsDialog
+from .stats_dialog import StatsDialog
+from .theme_style import ThemeStyle, set_sheet, set_state
+from .typing_surface import TypingSurface
 
 
 class MainWindow(QMainWindow):
     lbl_stats: QLabel
-    lbl_text: QLabel
+    typing_surface: TypingSurface
     lbl_info: QLabel
     finish_overlay: FinishOverlay
+    latency_overlay: LatencyOverlay
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Maroon Type - Modular Pro")
@@ -28,6 +45,20 @@ class MainWindow(QMainWindow):
         self.theme_index = self.theme_names.index(Config.ACTIVE_THEME)
         self.running_blur_radius = 5
         self.start_in_focus = False
+        self.latency = LatencyRecorder()
+        self.auto_effects = Config.EFFECTS == "auto"
+        self.cached_effects = False
+        # Frames ran over budget; the cached effects go in at the next round boundary.
+        self.effects_pending = False
+        # The header blurs once per round, on its first stats update while running.
+        self.blur_pending = True
+        self.analytics = None
+        self.stats_dialog = None
+        self._analytics_lock = threading.Lock()
+        self.race = None
+        self.race_mode = None
+        self.race_active = False
+        self.race_locked = False
 
         self.setup_ui()
         self.connect_signals()
@@ -40,43 +71,27 @@ class MainWindow(QMainWindow):
         self.main_layout = QVBoxLayout(self.central_widget)
         self.main_layout.setContentsMargins(60, 60, 60, 60)
         self.main_layout.setSpacing(20)
-        self.central_widget.setStyleSheet(f"""
-            QWidget {{
-                background-color: {Config.COLORS['bg']};
-            }}
-        """)
 
         self.header_container = QWidget()
         self.header_layout = QVBoxLayout(self.header_container)
 
         self.lbl_title = QLabel("MAROON TYPE")
+        self.lbl_title.setObjectName("title")
         self.lbl_title.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.lbl_title.setStyleSheet(
-            f"color: {Config.COLORS['accent']}; font-size: 32px; font-weight: bold; letter-spacing: 2px;"
-        )
         self.header_layout.addWidget(self.lbl_title)
 
         self.toolbar = QFrame()
         self.toolbar_layout = QHBoxLayout(self.toolbar)
-        self.toolbar.setStyleSheet(
-            f"""
-            QFrame {{
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 {Config.COLORS['surface']}, stop:1 {Config.COLORS['surface_alt']});
-                border-radius: 10px;
-                border: 1px solid {Config.COLORS['border']};
-                padding: 6px;
-            }}
-        """
-        )
 
         self.mode_buttons = []
         modes = [
             ("25 Words", WordMode(25)),
+            ("Adaptive", AdaptiveMode(25)),
             ("Quotes", QuoteMode()),
             ("30s Time", TimeMode(30)),
             ("15s Sprint", TimeMode(15)),
-            ("💀 Death", SuddenDeathMode())
+            ("💀 Death", SuddenDeathMode()),
+            ("📖 Book", BookMode()),
         ]
 
         for name, mode_obj in modes:
@@ -84,14 +99,12 @@ class MainWindow(QMainWindow):
             btn.clicked.connect(self.change_mode)
             self.toolbar_layout.addWidget(btn)
             self.mode_buttons.append(btn)
+        self.engine.prefill(mode_obj for _, mode_obj in modes)
 
         self.toolbar_layout.addStretch(1)
         self.btn_settings = QPushButton("⚙ Settings")
+        self.btn_settings.setObjectName("settings")
         self.btn_settings.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
-        self.btn_settings.setStyleSheet(
-            f"color: {Config.COLORS['text_main']}; background: transparent; border: none; "
-            f"padding: 6px 10px; border-radius: 6px;"
-        )
         self.btn_settings.clicked.connect(self.open_settings)
         self.toolbar_layout.addWidget(self.btn_settings)
 
@@ -99,81 +112,113 @@ class MainWindow(QMainWindow):
         self.header_layout.addWidget(QLabel())
 
         self.lbl_stats = QLabel("Ready")
+        self.lbl_stats.setObjectName("stats")
         self.lbl_stats.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.lbl_stats.setStyleSheet(
-            f"color: {Config.COLORS['text_main']}; font-size: 18px; font-family: {Config.FONT_FALLBACK};"
-        )
         self.header_layout.addWidget(self.lbl_stats)
 
         self.main_layout.addWidget(self.header_container)
 
         self.text_frame = QFrame()
+        self.text_frame.setObjectName("textFrame")
         self.text_layout = QVBoxLayout(self.text_frame)
-        self.lbl_text = QLabel()
-        self.lbl_text.setWordWrap(True)
-        self.lbl_text.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
-        self.lbl_text.setFont(QFont(Config.FONT_FAMILY, Config.FONT_SIZE))
-        self.lbl_text.setStyleSheet(
-            f"letter-spacing: 0.5px; line-height: 1.55; font-family: {Config.FONT_FALLBACK};"
-        )
-        self.text_layout.addWidget(self.lbl_text)
+        self.typing_surface = TypingSurface()
+        self.text_layout.addWidget(self.typing_surface)
 
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(30)
-        shadow.setColor(QColor(0, 0, 0, 100))
-        shadow.setOffset(0, 10)
-        self.text_frame.setGraphicsEffect(shadow)
+        self.shadow = QGraphicsDropShadowEffect()
+        self.shadow.setBlurRadius(30)
+        self.shadow.setColor(QColor(0, 0, 0, 100))
+        self.shadow.setOffset(0, 10)
+        self.text_frame.setGraphicsEffect(self.shadow)
 
         self.finish_overlay: FinishOverlay = FinishOverlay(self.text_frame)
         self.finish_overlay.raise_()
         self._update_overlay_geometry()
 
-        self.update_style(Config.COLORS['border'])
+        self.update_style("idle")
         self.main_layout.addWidget(self.text_frame, stretch=1)
 
         self.lbl_info = QLabel("TAB to restart | Blur Focus Active")
+        self.lbl_info.setObjectName("info")
         self.lbl_info.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.lbl_info.setStyleSheet(f"color: {Config.COLORS['text_sub']}; letter-spacing: 0.3px;")
         self.main_layout.addWidget(self.lbl_info)
 
+        self.latency_overlay = LatencyOverlay(self.latency, self.central_widget)
+
         self.blur = QGraphicsBlurEffect()
         self.blur.setBlurRadius(0)
         self.header_container.setGraphicsEffect(self.blur)
+        if Config.EFFECTS == "cached":
+            self.use_cached_effects()
         self.apply_theme()
 
     def connect_signals(self):
-        self.engine.stats_updated.connect(self.update_ui)
+        self.scheduler = RenderScheduler(self.on_text_changed, self.update_stats, parent=self)
+        self.engine.stats_changed.connect(self.scheduler.mark_stats)
+        self.engine.target_changed.connect(self.typing_surface.set_target)
+        self.engine.window_shifted.connect(self.typing_surface.shift_window)
+        self.engine.text_changed.connect(self.scheduler.mark_text)
+        self.typing_surface.painted.connect(self.latency.mark_paint)
         self.engine.game_finished.connect(self.on_game_finish)
         self.engine.game_started.connect(self.on_game_start)
+        self.ghost_racer = GhostRacer(self.engine, self.typing_surface,
+                                      max(1, 2 * self.scheduler.interval_ns // 1_000_000), parent=self)
 
     def change_mode(self, mode: IGameMode):
         assert mode is not None
+        if self.race_active:
+            # Like TAB: the round belongs to the race until it is finished or left.
+            self.lbl_info.setText("Finish the race or leave it (Ctrl+Shift+R) to change modes")
+            return
+        if isinstance(mode, BookMode) and mode.path is None and not self.choose_book(mode):
+            return
         self.engine.set_mode(mode)
         for btn in self.mode_buttons:
             btn.set_active(btn.mode_instance == mode)
-        style_color = mode.style_color if mode else Config.COLORS["border"]
-        self.update_style(style_color)
+        self.update_style(mode.style_state)
         self._pulse_text_frame()
+        if isinstance(mode, AdaptiveMode):
+            self.refresh_focus()
 
-    def update_ui(self, stats_text, html):
+    def update_stats(self, stats_text):
         self.lbl_stats.setText(stats_text)
-        self.lbl_text.setText(html)
-        if self.engine.is_running:
-            self.set_blur(5)
+        if self.blur_pending and self.engine.is_running:
+            self.blur_pending = False
+            self.set_blur(self.running_blur_radius)
+
+    def on_text_changed(self, start, end):
+        self.latency.mark_emit()
+        self.typing_surface.refresh(self.engine.buffer, start, end)
+        self.ghost_racer.update_positions()
+        if self.race_active:
+            self.race.set_progress(self.engine.window_offset + len(self.engine.buffer))
 
     def on_game_finish(self, success):
+        self._apply_pending_effects()
+        self.blur_pending = False
         self.set_blur(0)
-        color = Config.COLORS['correct'] if success else Config.COLORS['death']
-        self.update_style(color)
+        self.update_style("success" if success else "death")
         self._pulse_text_frame()
         self.show_finish_overlay(success)
+        if self.race_active:
+            self.race_active = False
+            self.race.finish(self.engine.window_offset + len(self.engine.buffer),
+                             self.engine.last_wpm, self.engine.last_acc)
+        if isinstance(self.engine.mode, AdaptiveMode):
+            self.refresh_focus()
 
     def on_game_start(self):
+        self._apply_pending_effects()
+        self.blur_pending = True
         self.set_blur(0)
         if self.finish_overlay:
             self.finish_overlay.hide()
-        style_color = self.engine.mode.style_color if self.engine.mode else Config.COLORS['border']
-        self.update_style(style_color)
+        self.update_style(self.engine.mode.style_state if self.engine.mode else "idle")
+        self.typing_surface.set_cursor_color(self._cursor_color())
+        self.ghost_racer.reload()
+
+    def _cursor_color(self) -> str:
+        c = Config.COLORS
+        return c["death"] if isinstance(self.engine.mode, SuddenDeathMode) else c["cursor"]
 
     def show_finish_overlay(self, success: bool):
         if not self.finish_overlay:
@@ -186,31 +231,64 @@ class MainWindow(QMainWindow):
     def set_blur(self, radius):
         self.blur.setBlurRadius(radius)
 
-    def update_style(self, border_color):
-        self.text_frame.setStyleSheet(f"""
-            QFrame {{
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                    stop:0 {Config.COLORS['surface']}, stop:1 {Config.COLORS['surface_alt']});
-                border-radius: 18px;
-                padding: 28px;
-                border: 2px solid {border_color};
-            }}
-        """)
-        self.central_widget.setStyleSheet(
-            f"""
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                stop:0 {Config.COLORS['bg']}, stop:1 {Config.COLORS['bg_alt']});
-        """
-        )
+    def _apply_pending_effects(self):
+        if self.effects_pending:
+            self.use_cached_effects()
+
+    def use_cached_effects(self):
+        """Swap the live blur and shadow for cached ones that look the same."""
+        self.auto_effects = self.effects_pending = False
+        if self.cached_effects:
+            return
+        # Loaded on first use: it pulls in NumPy, which stays off the startup path.
+        from .cached_effects import CachedBlurEffect, CachedDropShadowEffect
+
+        self.cached_effects = True
+        if self.pulse_anim:
+            self.pulse_anim.stop()
+            self.pulse_anim = None
+        blur = CachedBlurEffect()
+        blur.setBlurRadius(self.blur.blurRadius())
+        shadow = CachedDropShadowEffect()
+        shadow.setBlurRadius(self.shadow.blurRadius())
+        shadow.setColor(self.shadow.color())
+        shadow.setOffset(self.shadow.offset().x(), self.shadow.offset().y())
+        # The widgets own their effects; setting new ones deletes the live ones.
+        self.header_container.setGraphicsEffect(blur)
+        self.text_frame.setGraphicsEffect(shadow)
+        self.blur, self.shadow = blur, shadow
+
+    def event(self, event):
+        if event.type() != QEvent.Type.UpdateRequest or not self.engine.is_running:
+            return super().event(event)
+        start = time.perf_counter_ns()
+        handled = super().event(event)
+        frames = self.latency.frame(time.perf_counter_ns() - start)
+        if self.auto_effects and frames % Config.FRAME_SAMPLES == 0:
+            recent = sorted(self.latency.recent_ms(FRAME, Config.FRAME_SAMPLES))
+            if recent[len(recent) // 2] > Config.FRAME_BUDGET_MS:
+                # Swapping mid-round would stall it on the NumPy import: load the
+                # module on a worker now and swap when this round ends.
+                self.auto_effects = False
+                self.effects_pending = True
+                threading.Thread(target=importlib.import_module, args=(".cached_effects", __package__),
+                                 daemon=True).start()
+        return handled
+
+    def update_style(self, state: str):
+        """Text frame border for ``idle``, ``death`` or ``success``; no CSS is re-parsed."""
+        set_state(self.text_frame, "state", state)
 
     def keyPressEvent(self, event):
+        key_ns = time.perf_counter_ns()
         key = event.key()
         text = event.text()
 
+        if self.race_active and key == Qt.Key.Key_Tab:
+            return
         if key == Qt.Key.Key_Tab:
             self.engine.reset_game()
-            style_color = self.engine.mode.style_color if self.engine.mode else Config.COLORS['border']
-            self.update_style(style_color)
+            self.update_style(self.engine.mode.style_state if self.engine.mode else "idle")
             return
         if key == Qt.Key.Key_F and event.modifiers() & Qt.KeyboardModifier.ControlModifier:
             self.toggle_focus_mode()
@@ -221,46 +299,72 @@ class MainWindow(QMainWindow):
         if key == Qt.Key.Key_Comma and event.modifiers() & Qt.KeyboardModifier.ControlModifier:
             self.open_settings()
             return
+        if key == Qt.Key.Key_L and event.modifiers() & Qt.KeyboardModifier.ControlModifier:
+            self.latency_overlay.toggle()
+            return
+        if key == Qt.Key.Key_I and event.modifiers() & Qt.KeyboardModifier.ControlModifier:
+            self.open_stats()
+            return
+        if key == Qt.Key.Key_O and event.modifiers() & Qt.KeyboardModifier.ControlModifier:
+            self.open_book()
+            return
+        if key == Qt.Key.Key_G and event.modifiers() & Qt.KeyboardModifier.ControlModifier:
+            if event.modifiers() & Qt.KeyboardModifier.ShiftModifier:
+                self.toggle_recordings()
+            else:
+                self.ghost_racer.toggle_pb()
+            return
+        if key == Qt.Key.Key_S and event.modifiers() & Qt.KeyboardModifier.ControlModifier:
+            self.save_recording()
+            return
+        if key == Qt.Key.Key_R and event.modifiers() & Qt.KeyboardModifier.ControlModifier:
+            if event.modifiers() & Qt.KeyboardModifier.ShiftModifier:
+                self.leave_race()
+            else:
+                self.join_race()
+            return
+        if self.race_locked:
+            return
 
         if key == Qt.Key.Key_Backspace:
-            current = self.engine.user_input
             if event.modifiers() & Qt.KeyboardModifier.ControlModifier:
-                space_idx = current.rstrip().rfind(' ')
-                new_input = current[:space_idx+1] if space_idx != -1 else ""
+                changed = self.engine.delete_word()
             else:
-                new_input = current[:-1]
-            self.engine.process_input(new_input)
+                changed = self.engine.delete_char()
 
         elif key == Qt.Key.Key_Space:
-            current = self.engine.user_input
-            target = self.engine.target_text
-
-            if not current.endswith(" "):
-                idx = len(current)
-                if idx < len(target) and target[idx] != " ":
-                    nxt = target.find(" ", idx)
-                    nxt = len(target) if nxt == -1 else nxt
-                    missing = nxt - idx
-                    self.engine.process_input(current + "_" * missing + " ")
-                else:
-                    self.engine.process_input(current + " ")
+            changed = self.engine.skip_word()
 
         elif text and text.isprintable():
-            if len(self.engine.user_input) < len(self.engine.target_text):
-                self.engine.process_input(self.engine.user_input + text)
+            changed = self.engine.insert_char(text)
+
+        else:
+            changed = False
+        if changed:
+            self.latency.key_processed(key_ns)
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
         self._update_overlay_geometry()
+        if self.latency_overlay.isVisible():
+            self.latency_overlay.refresh()
+
+    def closeEvent(self, event):
+        if Config.LATENCY_LOG:
+            try:
+                self.latency.dump(Path(Config.LATENCY_LOG))
+            except Exception as e:
+                print(f"Latency dump failed: {e}")
+        if self.race is not None:
+            self.race.close()
+        self.engine.close()
+        super().closeEvent(event)
 
     def _pulse_text_frame(self):
         # Small opacity pulse to emphasize state change.
-        effect = self.text_frame.graphicsEffect()
-        if not effect or not isinstance(effect, QGraphicsDropShadowEffect):
-            return
         if self.pulse_anim and self.pulse_anim.state() == QAbstractAnimation.State.Running:
             self.pulse_anim.stop()
-        self.pulse_anim = QPropertyAnimation(effect, b"blurRadius", self)
+        self.pulse_anim = QPropertyAnimation(self.shadow, b"blurRadius", self)
         self.pulse_anim.setDuration(220)
         self.pulse_anim.setStartValue(18)
         self.pulse_anim.setEndValue(34)
@@ -287,49 +391,148 @@ class MainWindow(QMainWindow):
         if self.finish_overlay:
             self.finish_overlay.update_geometry(self.text_frame.rect())
 
-    def apply_theme(self, border_color=None):
-        c = Config.COLORS
-        self.central_widget.setStyleSheet(
-            f"""
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                stop:0 {c['bg']}, stop:1 {c['bg_alt']});
-        """
-        )
-        self.toolbar.setStyleSheet(
-            f"""
-            QFrame {{
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 {c['surface']}, stop:1 {c['surface_alt']});
-                border-radius: 10px;
-                border: 1px solid {c['border']};
-                padding: 6px;
-            }}
-        """
-        )
-        self.lbl_title.setStyleSheet(
-            f"color: {c['accent']}; font-size: 32px; font-weight: bold; letter-spacing: 2px;"
-        )
-        self.lbl_stats.setStyleSheet(
-            f"color: {c['text_main']}; font-size: 18px; font-family: {Config.FONT_FALLBACK};"
-        )
-        self.lbl_info.setStyleSheet(f"color: {c['text_sub']}; letter-spacing: 0.3px;")
+    def apply_theme(self):
+        style = ThemeStyle.current()
+        set_sheet(self.central_widget, style.central)
+        set_sheet(self.toolbar, style.toolbar)
+        set_sheet(self.text_frame, style.text_frame)
         if self.finish_overlay:
             self.finish_overlay.apply_theme()
-        for btn in self.mode_buttons:
-            btn.setStyleSheet(btn._style(active=btn._active))
-        style_color = border_color
-        if not style_color and self.engine.mode:
-            style_color = self.engine.mode.style_color
-        self.update_style(style_color or Config.COLORS["border"])
+        self.latency_overlay.apply_theme()
+        self.typing_surface.apply_theme(self._cursor_color())
 
     def update_info_text(self):
         theme = Config.ACTIVE_THEME.capitalize()
         if self.focus_mode:
             text = f"Focus Mode ON | Theme: {theme} | Ctrl+F to exit"
         else:
-            text = f"TAB restart | Ctrl+F focus | Ctrl+T theme ({theme}) | Ctrl+, settings"
+            text = (
+                f"TAB restart | Ctrl+F focus | Ctrl+T theme ({theme}) | Ctrl+, settings "
+                f"| Ctrl+L latency | Ctrl+I stats | Ctrl+O book | Ctrl+G ghost | Ctrl+R race"
+            )
         self.lbl_info.setText(text)
 
+    def choose_book(self, mode: BookMode) -> bool:
+        path, _ = QFileDialog.getOpenFileName(self, "Open a book", "", "Text files (*.txt);;All files (*)")
+        if not path:
+            return False
+        error = BookMode.check(Path(path))
+        if error:
+            self.lbl_info.setText(f"Cannot open book: {error}")
+            return False
+        mode.path = Path(path)
+        return True
+
+    def open_book(self):
+        mode = next(b.mode_instance for b in self.mode_buttons if isinstance(b.mode_instance, BookMode))
+        if self.choose_book(mode):
+            self.change_mode(mode)
+
+    def toggle_recordings(self):
+        """Race a saved recording; with recordings already racing, remove them."""
+        if self.ghost_racer.recordings:
+            self.ghost_racer.clear_recordings()
+            return
+        path, _ = QFileDialog.getOpenFileName(self, "Race a recording", "",
+                                              "Keystroke recordings (*.mkl);;All files (*)")
+        if path:
+            self.ghost_racer.add_recording(Path(path))
+
+    def save_recording(self):
+        """Save the last round's keystrokes for someone else to race (Ctrl+S)."""
+        if not len(self.engine.keylog):
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Save recording", "round.mkl",
+                                              "Keystroke recordings (*.mkl)")
+        if not path:
+            return
+        try:
+            Path(path).write_bytes(self.engine.keylog.to_bytes())
+        except Exception as e:
+            print(f"Recording save failed: {e}")
+
+    def join_race(self):
+        """Connect to the LAN race server; once connected, ask it to start a race."""
+        if self.race is not None:
+            self.race.request_start()
+            return
+        self.race = RaceLink(os.environ.get("MAROON_RACE_NAME") or getpass.getuser(), parent=self)
+        self.race.message.connect(self.on_race_message)
+        self.race.disconnected.connect(self.on_race_disconnected)
+        self.race.connect_to()
+        self.lbl_info.setText(f"Joining race at {Config.RACE_HOST}:{Config.RACE_PORT}…")
+
+    def leave_race(self):
+        if self.race is not None:
+            self.race.close()
+
+    def on_race_message(self, msg: dict, positions: dict):
+        kind = msg.get("t")
+        me = self.race.player_id
+        if kind == "welcome":
+            self.lbl_info.setText(f"In the race lobby ({len(positions)} players) | Ctrl+R start "
+                                  f"| Ctrl+Shift+R leave")
+        elif kind == "race":
+            if self.race_mode is None:
+                self.race_mode = RaceMode()
+            self.race_mode.set_text(msg["text"])
+            self.engine.set_mode(self.race_mode)
+            for btn in self.mode_buttons:
+                btn.set_active(False)
+            self.race_active = self.race_locked = True
+            self.lbl_stats.setText(f"Race starts in {msg['start_in']:.0f}s")
+        elif kind == "go":
+            self.race_locked = False
+            self.lbl_stats.setText("GO!")
+        elif kind == "finish":
+            who = "You" if msg["id"] == me else f"Player {msg['id']}"
+            self.lbl_info.setText(f"{who} finished #{msg['place']} ({msg['wpm']} WPM) | Ctrl+R new race")
+        self.ghost_racer.set_live({pid: pos for pid, pos in positions.items() if pid != me})
+
+    def on_race_disconnected(self, reason: str):
+        self.race = None
+        self.race_active = self.race_locked = False
+        self.ghost_racer.set_live({})
+        self.lbl_info.setText(f"Left the race ({reason})")
+
+    def _get_analytics(self):
+        with self._analytics_lock:
+            if self.analytics is None:
+                # NumPy is only loaded once the stats or the adaptive mode are first used.
+                from ..analytics import KeyAnalytics
+                self.analytics = KeyAnalytics()
+            return self.analytics
+
+    def refresh_focus(self):
+        """Re-target the adaptive mode at the current weakest keys, off the GUI thread."""
+        threading.Thread(target=self._focus_worker, daemon=True).start()
+
+    def _focus_worker(self):
+        try:
+            analytics = self._get_analytics()
+            self.engine.history.flush()
+            analytics.update(self.engine.history)
+            focus = analytics.focus_weights(Config.ADAPTIVE_FOCUS)
+        except Exception as e:
+            print(f"Focus update failed: {e}")
+            return
+        service = self.engine.service
+        if focus != service.focus:
+            sampler = service.sampler
+            if focus and sampler is not None:
+                sampler.build_index()
+            service.focus = focus
+            for btn in self.mode_buttons:
+                mode = btn.mode_instance
+                if isinstance(mode, AdaptiveMode) and mode.pool is not None:
+                    mode.pool.clear()
+
+    def open_stats(self):
+        if self.stats_dialog is None:
+            self.stats_dialog = StatsDialog(self, self.engine.history, self._get_analytics)
+        self.stats_dialog.reload()
+        self.stats_dialog.exec()
+
     def open_settings(self):
         dialog = SettingsDialog(
             self,
@@ -0,0 +1,65 @@
+import asyncio
+import threading
+from typing import Optional
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from ..config import Config
+from ..race import RaceClient
+
+
+class RaceLink(QObject):
+    """Runs a ``RaceClient`` on its own asyncio thread and hands its messages to the GUI thread.
+
+    ``message`` carries the server message plus a snapshot of every player's
+    position. Typing only stores the latest position; the client sends it on
+    its next tick, so racing adds nothing to the keystroke path.
+    """
+    message = pyqtSignal(object, object)
+    disconnected = pyqtSignal(str)
+
+    def __init__(self, name: str, parent=None):
+        super().__init__(parent)
+        self.client = RaceClient(name, on_message=self._on_message)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def player_id(self) -> int:
+        return self.client.id
+
+    def connect_to(self, host: str = Config.RACE_HOST, port: int = Config.RACE_PORT):
+        threading.Thread(target=self._run, args=(host, port), daemon=True).start()
+
+    def _run(self, host: str, port: int):
+        reason = "server closed the connection"
+        try:
+            asyncio.run(self._main(host, port))
+        except Exception as e:
+            reason = str(e) or type(e).__name__
+        self._loop = None
+        self.disconnected.emit(reason)
+
+    async def _main(self, host: str, port: int):
+        self._loop = asyncio.get_running_loop()
+        await self.client.connect(host, port)
+        await self.client.run()
+
+    def _on_message(self, msg: dict):
+        self.message.emit(msg, dict(self.client.positions))
+
+    def _call(self, fn, *args):
+        loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(fn, *args)
+
+    def set_progress(self, pos: int):
+        self.client.progress = pos
+
+    def request_start(self):
+        self._call(self.client.request_start)
+
+    def finish(self, pos: int, wpm: int, acc: int):
+        self._call(self.client.finish, pos, wpm, acc)
+
+    def close(self):
+        self._call(self.client.close)
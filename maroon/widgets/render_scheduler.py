@@ -0,0 +1,100 @@
+import math
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from PyQt6.QtCore import QObject, Qt, QTimer
+from PyQt6.QtGui import QGuiApplication
+
+from ..config import Config
+
+
+class RenderScheduler(QObject):
+    """Coalesces engine updates into at most one UI flush per display frame.
+
+    The engine applies every key immediately; only the resulting repaint
+    requests are merged here. Text dirty ranges are unioned, the latest stats
+    text wins, and both are handed to the callbacks at the next frame boundary.
+    """
+
+    def __init__(self, on_text: Callable[[int, int], None], on_stats: Callable[[str], None],
+                 fps: Optional[float] = None, parent=None):
+        super().__init__(parent)
+        self._on_text = on_text
+        self._on_stats = on_stats
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self.flush)
+        self._text_range: Optional[Tuple[int, int]] = None
+        self._stats: Optional[str] = None
+        self._last_flush_ns = 0
+        self._pending_since_ns = 0
+        self.interval_ns = 0
+        self.set_rate(fps or Config.TARGET_FPS)
+        self.reset_counters()
+
+    def set_rate(self, fps: float = 0):
+        """Frames per second; ``0`` follows the primary screen's refresh rate."""
+        if fps <= 0:
+            screen = QGuiApplication.primaryScreen()
+            fps = screen.refreshRate() if screen and screen.refreshRate() > 0 else 60.0
+        self.fps = fps
+        self.interval_ns = int(1e9 / fps)
+
+    def reset_counters(self):
+        self.frames = 0
+        self.merged_text = 0
+        self.merged_stats = 0
+        self.dropped = 0
+
+    def counters(self) -> Dict[str, float]:
+        return {
+            "fps": self.fps,
+            "frames": self.frames,
+            "merged_text": self.merged_text,
+            "merged_stats": self.merged_stats,
+            "dropped": self.dropped,
+        }
+
+    def mark_text(self, start: int, end: int):
+        if self._text_range is None:
+            self._text_range = (start, end)
+        else:
+            self.merged_text += 1
+            lo, hi = self._text_range
+            self._text_range = (min(lo, start), max(hi, end))
+        self._request()
+
+    def mark_stats(self, stats_text: str):
+        if self._stats is not None:
+            self.merged_stats += 1
+        self._stats = stats_text
+        self._request()
+
+    def _request(self):
+        if self._timer.isActive():
+            return
+        now = time.perf_counter_ns()
+        self._pending_since_ns = now
+        wait_ns = self._last_flush_ns + self.interval_ns - now
+        self._timer.start(max(0, math.ceil(wait_ns / 1e6)))
+
+    def flush(self):
+        self._timer.stop()
+        now = time.perf_counter_ns()
+        if self._pending_since_ns:
+            # Whole frames that went by while this update was already due.
+            due = max(self._pending_since_ns, self._last_flush_ns + self.interval_ns)
+            self.dropped += max(0, now - due) // self.interval_ns
+        text_range, stats = self._text_range, self._stats
+        self._text_range = None
+        self._stats = None
+        self._pending_since_ns = 0
+        self._last_flush_ns = now
+        if text_range is None and stats is None:
+            return
+        self.frames += 1
+        if text_range is not None:
+            self._on_text(*text_range)
+        if stats is not None:
+            self._on_stats(stats)
@@ -0,0 +1,131 @@
+import math
+import threading
+from typing import TYPE_CHECKING, Callable, Optional
+
+from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtWidgets import (
+    QDialog,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+)
+
+from ..history import ALL_MODES, HistoryStore
+
+if TYPE_CHECKING:
+    from ..analytics import KeyAnalytics
+
+
+class StatsDialog(QDialog):
+    """Personal bests per mode plus the weakest keys and slowest bigrams.
+
+    Opens straight away with what the store already has; ``reload`` loads the
+    analytics (``load_analytics``), waits for pending history writes and folds
+    in new sessions on a worker thread, and the tables refresh when it is done.
+    One dialog is kept and reloaded on every open.
+    """
+    _updated = pyqtSignal(int)
+
+    def __init__(self, parent, store: HistoryStore, load_analytics: Callable[[], "KeyAnalytics"]):
+        super().__init__(parent)
+        self.setWindowTitle("Stats")
+        self.resize(720, 520)
+        self.store = store
+        self.load_analytics = load_analytics
+        self.analytics: Optional["KeyAnalytics"] = None
+        layout = QVBoxLayout(self)
+
+        self.lbl_summary = QLabel(self)
+        layout.addWidget(self.lbl_summary)
+        self.modes_table = self._table(["Mode", "Sessions", "Best", "Average", "Recent"])
+        layout.addWidget(self.modes_table)
+
+        tables = QHBoxLayout()
+        keys_box = QVBoxLayout()
+        keys_box.addWidget(QLabel("Weakest keys", self))
+        self.keys_table = self._table(["Key", "Typed", "Error %", "Median ms"])
+        keys_box.addWidget(self.keys_table)
+        bigrams_box = QVBoxLayout()
+        bigrams_box.addWidget(QLabel("Slowest bigrams", self))
+        self.bigrams_table = self._table(["Bigram", "Count", "Median ms", "p90 ms"])
+        bigrams_box.addWidget(self.bigrams_table)
+        tables.addLayout(keys_box)
+        tables.addLayout(bigrams_box)
+        layout.addLayout(tables)
+
+        self.lbl_status = QLabel(self)
+        layout.addWidget(self.lbl_status)
+        btn_close = QPushButton("Close", self)
+        btn_close.clicked.connect(self.accept)
+        layout.addWidget(btn_close)
+
+        self._updated.connect(self._on_updated)
+
+    def reload(self):
+        self.refresh()
+        self.lbl_status.setText("Updating…")
+        threading.Thread(target=self._update_worker, daemon=True).start()
+
+    def _table(self, headers):
+        table = QTableWidget(0, len(headers), self)
+        table.setHorizontalHeaderLabels(headers)
+        table.verticalHeader().setVisible(False)
+        table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        table.horizontalHeader().setStretchLastSection(True)
+        return table
+
+    @staticmethod
+    def _fill(table: QTableWidget, rows):
+        table.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            for c, value in enumerate(row):
+                table.setItem(r, c, QTableWidgetItem(value))
+
+    def _update_worker(self):
+        try:
+            analytics = self.load_analytics()
+            self.store.flush()
+            added = analytics.update(self.store)
+            self.analytics = analytics
+        except Exception as e:
+            print(f"Analytics update failed: {e}")
+            added = -1
+        self._updated.emit(added)
+
+    def _on_updated(self, added: int):
+        self.lbl_status.setText("Update failed" if added < 0 else f"{added} new session(s) analysed")
+        self.refresh()
+
+    def refresh(self):
+        aggs = self.store.aggregates()
+        total = aggs.pop(ALL_MODES, None)
+        if total:
+            self.lbl_summary.setText(
+                f"{total.sessions} sessions | best {total.best_wpm} WPM | "
+                f"average {total.avg_wpm:.0f} WPM, {total.avg_acc:.0f}% | "
+                f"recent {total.rolling_wpm:.0f} WPM"
+            )
+        else:
+            self.lbl_summary.setText("No sessions yet")
+        self._fill(self.modes_table, [
+            (mode, str(a.sessions), str(a.best_wpm), f"{a.avg_wpm:.0f}", f"{a.rolling_wpm:.0f}")
+            for mode, a in sorted(aggs.items())
+        ])
+
+        if self.analytics is None:
+            return
+
+        def ms(v):
+            return "–" if math.isnan(v) else f"{v:.0f}"
+
+        self._fill(self.keys_table, [
+            (repr(s.key) if s.key == " " else s.key, str(s.attempts), f"{s.error_rate:.1%}", ms(s.median_ms))
+            for s in self.analytics.key_stats()[:15]
+        ])
+        self._fill(self.bigrams_table, [
+            (repr(s.bigram), str(s.count), ms(s.median_ms), ms(s.p90_ms))
+            for s in self.analytics.bigram_stats()[:15]
+        ])
@@ -0,0 +1,100 @@
+from typing import Dict, Mapping
+
+from PyQt6.QtWidgets import QWidget
+
+from ..config import Config
+
+
+class ThemeStyle:
+    """Every stylesheet of one theme, built once and cached by theme name.
+
+    Widget states (active mode, hover, death, success) are selectors on
+    dynamic properties or pseudo-states inside these sheets, so sheets are
+    only set when the theme changes; a state change re-polishes one widget
+    through ``set_state`` and never re-parses CSS.
+    """
+    _cache: Dict[str, "ThemeStyle"] = {}
+
+    def __init__(self, c: Mapping[str, str]):
+        self.central = f"""
+            * {{
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                    stop:0 {c['bg']}, stop:1 {c['bg_alt']});
+            }}
+            QLabel#title {{
+                color: {c['accent']}; font-size: 32px; font-weight: bold; letter-spacing: 2px;
+            }}
+            QLabel#stats {{
+                color: {c['text_main']}; font-size: 18px; font-family: {Config.FONT_FALLBACK};
+            }}
+            QLabel#info {{ color: {c['text_sub']}; letter-spacing: 0.3px; }}
+        """
+        self.toolbar = f"""
+            QFrame {{
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                    stop:0 {c['surface']}, stop:1 {c['surface_alt']});
+                border-radius: 10px;
+                border: 1px solid {c['border']};
+                padding: 6px;
+            }}
+            ModeButton {{
+                color: {c['text_sub']}; padding: 7px 10px; border-radius: 6px;
+                letter-spacing: 0.4px; background-color: transparent;
+            }}
+            ModeButton[active="true"] {{ color: {c['active_mode']}; }}
+            ModeButton:hover {{ background-color: {c['surface_alt']}; }}
+            QPushButton#settings {{
+                color: {c['text_main']}; background: transparent; border: none;
+                padding: 6px 10px; border-radius: 6px;
+            }}
+        """
+        self.text_frame = f"""
+            QFrame {{
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+                    stop:0 {c['surface']}, stop:1 {c['surface_alt']});
+                border-radius: 18px;
+                padding: 28px;
+                border: 2px solid {c['border']};
+            }}
+            QFrame#textFrame[state="death"] {{ border-color: {c['death']}; }}
+            QFrame#textFrame[state="success"] {{ border-color: {c['correct']}; }}
+        """
+        self.finish_overlay = f"""
+            * {{
+                background-color: rgba(0, 0, 0, 150); border: 2px solid {c['border']};
+                border-radius: 16px; padding: 28px;
+            }}
+            QLabel#finishScore {{ color: {c['accent']}; }}
+            QLabel#finishScore[state="success"] {{ color: {c['correct']}; }}
+            QLabel#finishScore[state="death"] {{ color: {c['death']}; }}
+            QLabel#finishSub {{ color: {c['text_main']}; letter-spacing: 0.3px; }}
+        """
+        self.latency_overlay = (
+            f"background-color: rgba(0, 0, 0, 170); color: {c['text_main']}; "
+            f"border: 1px solid {c['border']}; border-radius: 6px; padding: 6px 8px;"
+        )
+
+    @classmethod
+    def current(cls) -> "ThemeStyle":
+        style = cls._cache.get(Config.ACTIVE_THEME)
+        if style is None:
+            style = cls._cache[Config.ACTIVE_THEME] = cls(Config.COLORS)
+        return style
+
+
+def set_sheet(widget: QWidget, sheet: str):
+    """``setStyleSheet`` unless the widget already has exactly this sheet."""
+    if widget.styleSheet() != sheet:
+        widget.setStyleSheet(sheet)
+
+
+def set_state(widget: QWidget, name: str, value) -> bool:
+    """Change a dynamic property the stylesheet selects on; re-polishes only on change."""
+    if widget.property(name) == value:
+        return False
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    widget.update()
+    return True
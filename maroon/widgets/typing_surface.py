@@ -0,0 +1,179 @@
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Sequence
+
+from PyQt6.QtCore import QPointF, QRect, QRectF, Qt, pyqtSignal
+from PyQt6.QtGui import QBrush, QColor, QFont, QPainter, QTextCharFormat, QTextLayout, QTextOption
+from PyQt6.QtWidgets import QSizePolicy, QWidget
+
+from ..config import Config
+from ..render import CORRECT, CURSOR, ERROR, style_runs
+
+
+class TypingSurface(QWidget):
+    """Target text laid out once per game; keystrokes only repaint the touched glyphs.
+
+    The target is shaped and wrapped with a single QTextLayout when it changes or
+    the width changes. Typing state is applied at paint time as format ranges for
+    the visible lines only, so an update never re-parses or re-lays out the text.
+    Ghost cursors are painted on top, never into the text formats.
+    """
+    LINE_HEIGHT = 1.4
+    painted = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        font = QFont(Config.FONT_FAMILY, Config.FONT_SIZE)
+        font.setLetterSpacing(QFont.SpacingType.AbsoluteSpacing, 0.5)
+        self.setFont(font)
+        self.target = ""
+        self.user_input: Sequence[str] = ""
+        self._layout = QTextLayout("", font)
+        self._line_tops: List[float] = []
+        self._line_starts: List[int] = []
+        self._line_height = 0.0
+        self._laid_out_width = -1
+        self._cursor_color = Config.COLORS["cursor"]
+        self._formats: Dict[int, QTextCharFormat] = {}
+        self._ghosts: List[int] = []
+        self._ghost_colors: List[QColor] = []
+        self.apply_theme()
+
+    def apply_theme(self, cursor_color: str = ""):
+        c = Config.COLORS
+        if cursor_color:
+            self._cursor_color = cursor_color
+        correct = QTextCharFormat()
+        correct.setForeground(QBrush(QColor(c["correct"])))
+        error = QTextCharFormat()
+        error.setForeground(QBrush(QColor("#222")))
+        error.setBackground(QBrush(QColor(c["error"])))
+        cursor = QTextCharFormat()
+        cursor.setForeground(QBrush(QColor(c["bg"])))
+        cursor.setBackground(QBrush(QColor(self._cursor_color)))
+        self._formats = {CORRECT: correct, ERROR: error, CURSOR: cursor}
+        self.update()
+
+    def set_cursor_color(self, color: str):
+        if color != self._cursor_color:
+            self.apply_theme(color)
+
+    def set_target(self, target: str):
+        self.target = target
+        self.user_input = ""
+        self._laid_out_width = -1
+        self._relayout()
+        self.update()
+
+    def shift_window(self, dropped: int, target: str):
+        """Streamed target moved on; the typed input is the engine's buffer, already shifted."""
+        self.target = target
+        self._relayout()
+        self.update()
+
+    def set_ghosts(self, positions: Sequence[int], colors: Sequence[str] = ()):
+        """Thin cursors at ``positions`` (window indices; those outside the window are hidden).
+
+        Only the cells a ghost left and entered are repainted.
+        """
+        if colors:
+            self._ghost_colors = [QColor(c) for c in colors]
+        positions = list(positions)
+        if positions == self._ghosts:
+            return
+        moved = set(self._ghosts).symmetric_difference(positions)
+        self._ghosts = positions
+        for pos in moved:
+            rect = self._ghost_rect(pos)
+            if rect is not None:
+                self.update(rect)
+
+    def _ghost_rect(self, pos: int) -> Optional[QRect]:
+        if not self._line_starts or not 0 <= pos <= len(self.target):
+            return None
+        i = bisect_right(self._line_starts, pos) - 1
+        x, _ = self._layout.lineAt(i).cursorToX(pos)
+        return QRect(int(x) - 1, int(self._line_tops[i]), 3, int(self._line_height))
+
+    def refresh(self, user_input: Sequence[str], start: int, end: int):
+        """Repaint only the lines holding ``target[start:end]``."""
+        self.user_input = user_input
+        if not self._line_starts:
+            return
+        end = max(start, min(end, len(self.target)))
+        first = max(0, bisect_right(self._line_starts, start) - 1)
+        last = max(0, bisect_right(self._line_starts, end) - 1)
+        top = self._line_tops[first]
+        bottom = self._line_tops[last] + self._line_height
+        self.update(QRect(0, int(top), self.width(), int(bottom - top) + 1))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.width() != self._laid_out_width:
+            self._relayout()
+
+    def _relayout(self):
+        width = self.width()
+        self._laid_out_width = width
+        layout = QTextLayout(self.target, self.font())
+        option = QTextOption()
+        option.setWrapMode(QTextOption.WrapMode.WrapAtWordBoundaryOrAnywhere)
+        layout.setTextOption(option)
+        self._line_height = self.fontMetrics().lineSpacing() * self.LINE_HEIGHT
+        tops, starts = [], []
+        y = 0.0
+        layout.beginLayout()
+        while True:
+            line = layout.createLine()
+            if not line.isValid():
+                break
+            line.setLineWidth(max(1, width))
+            line.setPosition(QPointF(0, y + (self._line_height - line.height()) / 2))
+            tops.append(y)
+            starts.append(line.textStart())
+            y += self._line_height
+        layout.endLayout()
+        self._layout = layout
+        self._line_tops = tops
+        self._line_starts = starts
+
+    def _visible_ranges(self, clip: QRect):
+        first = max(0, bisect_right(self._line_tops, clip.top()) - 1)
+        last = bisect_left(self._line_tops, clip.bottom() + 1)
+        start = self._line_starts[first]
+        end = self._line_starts[last] if last < len(self._line_starts) else len(self.target)
+        return start, end
+
+    def paintEvent(self, event):
+        if not self._line_starts:
+            return
+        clip = event.rect()
+        start, end = self._visible_ranges(clip)
+        selections = []
+        for state, run_start, run_end in style_runs(self.target, self.user_input, start, end):
+            fmt = self._formats.get(state)
+            if fmt is None:
+                continue
+            rng = QTextLayout.FormatRange()
+            rng.start = run_start
+            rng.length = run_end - run_start
+            rng.format = fmt
+            selections.append(rng)
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+        painter.setPen(QColor(Config.COLORS["text_sub"]))
+        self._layout.draw(painter, QPointF(0, 0), selections, QRectF(clip))
+        for pos, color in zip(self._ghosts, self._ghost_colors):
+            rect = self._ghost_rect(pos)
+            if rect is not None and rect.intersects(clip):
+                painter.fillRect(rect.adjusted(0, 6, 0, -6), color)
+        painter.end()
+        self.painted.emit()
+
+    def sizeHint(self):
+        hint = super().sizeHint()
+        if self._line_tops:
+            hint.setHeight(int(self._line_tops[-1] + self._line_height))
+        return hint
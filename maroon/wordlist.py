@@ -0,0 +1,210 @@
+import mmap
+import struct
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+_rng = np.random.default_rng()
+
+
+def rank_weights(n: int) -> np.ndarray:
+    """Cumulative weights: rank ``i`` of ``n`` gets ``2(n - i) - 1``.
+
+    That is the probability mass ``random.triangular(0, n, 0)`` puts on ``[i, i + 1)``.
+    """
+    return np.cumsum(2.0 * (n - np.arange(n)) - 1.0)
+
+
+class FeatureIndex:
+    """Inverted index from letters and bigrams to the words containing them.
+
+    Postings are stored CSR-style: feature ``f`` owns ``postings[starts[f]:starts[f + 1]]``,
+    word positions in rank order. ``cum_weights`` runs over all postings and
+    continues across features, so a word containing any chosen feature is
+    drawn, frequency-weighted, by one ``searchsorted`` over the whole table.
+    """
+    __slots__ = ("features", "starts", "postings", "cum_weights")
+
+    def __init__(self, words: Sequence[str]):
+        features: Dict[str, int] = {}
+        feature_ids: List[int] = []
+        word_ids: List[int] = []
+        for i, word in enumerate(words):
+            grams = set(word)
+            grams.update(word[j:j + 2] for j in range(len(word) - 1))
+            for gram in grams:
+                feature_ids.append(features.setdefault(gram, len(features)))
+            word_ids.extend([i] * len(grams))
+        fids = np.array(feature_ids, dtype=np.int32)
+        wids = np.array(word_ids, dtype=np.int32)
+        order = np.argsort(fids, kind="stable")
+        self.features = features
+        self.starts = np.zeros(len(features) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(fids, minlength=len(features)), out=self.starts[1:])
+        self.postings = wids[order]
+        # Same rank weights the plain sampler uses, so common words still dominate.
+        n = len(words)
+        self.cum_weights = np.concatenate(([0.0], np.cumsum(2.0 * (n - self.postings) - 1.0)))
+
+    def pick(self, features: Sequence[str], weights: Sequence[float], count: int,
+             rng: np.random.Generator) -> Optional[np.ndarray]:
+        """Word positions: a feature by ``weights``, then a word containing it by rank."""
+        known = [(self.features[f], w) for f, w in zip(features, weights) if f in self.features and w > 0]
+        if not known:
+            return None
+        fids = np.array([f for f, _ in known])
+        cum = np.cumsum([w for _, w in known])
+        chosen = fids[np.searchsorted(cum, rng.random(count) * cum[-1], side="right")]
+        lo = self.cum_weights[self.starts[chosen]]
+        hi = self.cum_weights[self.starts[chosen + 1]]
+        idx = np.searchsorted(self.cum_weights, lo + rng.random(count) * (hi - lo), side="right") - 1
+        return self.postings[np.minimum(idx, self.starts[chosen + 1] - 1)]
+
+
+class WordSampler:
+    """Immutable, frequency-ranked word list with a cumulative weight table.
+
+    A whole batch is drawn with one vectorised ``searchsorted``.
+    """
+    __slots__ = ("_words", "_cum_weights", "_index")
+
+    def __init__(self, words: Sequence[str]):
+        self._words = np.array(list(words), dtype=object)
+        self._cum_weights = rank_weights(len(self._words))
+        self._index: Optional[FeatureIndex] = None
+
+    def __len__(self) -> int:
+        return len(self._cum_weights)
+
+    @property
+    def words(self) -> Tuple[str, ...]:
+        return tuple(self._words.tolist())
+
+    def _pick(self, count: int, rng: Optional[np.random.Generator]) -> np.ndarray:
+        rng = rng or _rng
+        points = rng.random(count) * self._cum_weights[-1]
+        return np.searchsorted(self._cum_weights, points, side="right")
+
+    def _take(self, positions: np.ndarray) -> List[str]:
+        return self._words[positions].tolist()
+
+    def draw(self, count: int, rng: Optional[np.random.Generator] = None) -> List[str]:
+        return self._take(self._pick(count, rng))
+
+    @property
+    def index(self) -> FeatureIndex:
+        """Letter/bigram index, built on first use (a few tens of ms for 20k words)."""
+        return self.build_index()
+
+    def build_index(self) -> FeatureIndex:
+        """Build ``index`` now (e.g. on a worker thread) rather than in the first focused draw."""
+        if self._index is None:
+            self._index = FeatureIndex(self.words)
+        return self._index
+
+    def draw_focused(self, count: int, focus: Mapping[str, float], share: float,
+                     rng: Optional[np.random.Generator] = None) -> List[str]:
+        """Like ``draw``, but about ``share`` of the words contain a ``focus`` letter or bigram."""
+        rng = rng or _rng
+        positions = self._pick(count, rng)
+        focused = np.flatnonzero(rng.random(count) < share)
+        if len(focused):
+            picked = self.index.pick(list(focus), list(focus.values()), len(focused), rng)
+            if picked is not None:
+                positions[focused] = picked
+        return self._take(positions)
+
+
+class WordList:
+    """Memory-mapped compiled word list; word ``i`` is the ``i``-th most frequent.
+
+    File layout (little-endian)::
+
+        header   magic "MWL1", u32 count, u64 source size, u64 source mtime_ns
+        offsets  u32 * (count + 1)   byte offsets into the data section
+        lengths  u8 * count          length in characters (capped at 255)
+        data     UTF-8 words, back to back
+
+    Opening only maps the file and reads the header; length/difficulty views are
+    filtered with NumPy on first use and cached.
+    """
+    MAGIC = b"MWL1"
+    HEADER = struct.Struct("<4sIQQ")
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, self.source_size, self.source_mtime = self.HEADER.unpack_from(self._mm, 0)
+        if magic != self.MAGIC:
+            raise ValueError(f"{self.path} is not a compiled word list")
+        self.count = count
+        pos = self.HEADER.size
+        self.offsets = np.frombuffer(self._mm, dtype="<u4", count=count + 1, offset=pos)
+        pos += 4 * (count + 1)
+        self.lengths = np.frombuffer(self._mm, dtype=np.uint8, count=count, offset=pos)
+        self._data = pos + count
+        self._views: Dict[Tuple[int, int, int], "WordListView"] = {}
+
+    def __len__(self) -> int:
+        return self.count
+
+    def word(self, i: int) -> str:
+        start = self._data + int(self.offsets[i])
+        end = self._data + int(self.offsets[i + 1])
+        return self._mm[start:end].decode("utf-8")
+
+    def is_current(self, source: Path) -> bool:
+        st = source.stat()
+        return st.st_size == self.source_size and st.st_mtime_ns == self.source_mtime
+
+    def view(self, min_len: int = 1, max_len: int = 255, max_rank: Optional[int] = None
+             ) -> "WordListView":
+        key = (min_len, max_len, max_rank or self.count)
+        view = self._views.get(key)
+        if view is None:
+            lengths = self.lengths[:key[2]]
+            ids = np.flatnonzero((lengths >= min_len) & (lengths <= max_len))
+            view = self._views[key] = WordListView(self, ids)
+        return view
+
+    @classmethod
+    def compile(cls, source: Path, target: Path) -> "WordList":
+        """Parse a one-word-per-line, frequency-ordered text file into ``target``."""
+        with source.open("r", encoding="utf-8") as f:
+            words = [w for w in (line.strip() for line in f) if w.isalpha()]
+        data = [w.encode("utf-8") for w in words]
+        offsets = np.zeros(len(data) + 1, dtype="<u4")
+        offsets[1:] = np.cumsum([len(b) for b in data], dtype=np.int64)
+        lengths = np.minimum(np.array([len(w) for w in words], dtype=np.int64), 255).astype(np.uint8)
+        st = source.stat()
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_suffix(".tmp")
+        with tmp.open("wb") as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, len(data), st.st_size, st.st_mtime_ns))
+            f.write(offsets.tobytes())
+            f.write(lengths.tobytes())
+            f.write(b"".join(data))
+        tmp.replace(target)
+        return cls(target)
+
+
+class WordListView(WordSampler):
+    """Rank-ordered subset of a ``WordList``; only drawn words are decoded."""
+    __slots__ = ("word_list", "ids")
+
+    def __init__(self, word_list: WordList, ids: np.ndarray):
+        self.word_list = word_list
+        self.ids = ids
+        self._cum_weights = rank_weights(len(ids))
+        self._index = None
+
+    @property
+    def words(self) -> Tuple[str, ...]:
+        return tuple(self.word_list.word(int(i)) for i in self.ids)
+
+    def _take(self, positions: np.ndarray) -> List[str]:
+        word = self.word_list.word
+        return [word(int(i)) for i in self.ids[positions]]
@@ -0,0 +1,70 @@
+"""Window repaint time per keystroke with live vs cached graphics effects.
+
+Drives a real ``MainWindow`` (offscreen Qt unless QT_QPA_PLATFORM is set),
+types the target text one character at a time and times each repaint, as the
+app's own frame recorder does. "live" is Qt's ``QGraphicsBlurEffect`` and
+``QGraphicsDropShadowEffect``; "cached" swaps in the cached effects.
+
+Usage: python scripts/bench_effects.py [--keys 200]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Benchmark rounds stay out of the user's session history.
+os.environ["MAROON_HISTORY"] = "0"
+os.environ["MAROON_EFFECTS"] = "live"
+
+from PyQt6.QtCore import QEvent  # noqa: E402
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from maroon.latency import quantile  # noqa: E402
+
+
+def run(app, win, keys: int):
+    """Type ``keys`` characters; returns per-key repaint ms."""
+    engine = win.engine
+    engine.reset_game()
+    times = []
+    for _ in range(keys):
+        if not engine.is_running and engine.buffer:
+            engine.reset_game()
+        engine.insert_char(engine.target_text[len(engine.buffer)])
+        win.scheduler.flush()
+        app.sendPostedEvents(None, QEvent.Type.LayoutRequest)
+        t0 = time.perf_counter()
+        app.sendPostedEvents()
+        times.append((time.perf_counter() - t0) * 1e3)
+    return sorted(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keys", type=int, default=200)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    from maroon.widgets import MainWindow
+    win = MainWindow()
+    win.resize(1100, 750)
+    win.show()
+    app.processEvents()
+
+    print(f"{'effects':<8} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for name in ("live", "cached"):
+        if name == "cached":
+            win.use_cached_effects()
+        times = run(app, win, args.keys)
+        print(f"{name:<8} {statistics.median(times):8.2f} "
+              f"{quantile(times, 95):8.2f} {times[-1]:8.2f}")
+    win.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+"""Engine micro-benchmarks: every mode x target size x edit pattern.
+
+Each case loads a target of ``size`` words, types the first ``--offset`` of it in
+one edit, then replays ``--keys`` keystrokes of the pattern and times, per
+keystroke and over ``--repeat`` sweeps, the input call (``process_input``,
+``delete_word`` or ``skip_word``, including the update fan-out), ``emit_update``
+and ``generate_html``.
+A second, untimed pass under tracemalloc records allocations per keystroke.
+
+Patterns:
+    clean      correct characters only
+    backspace  every third key is a mistake followed by Backspace
+    ctrl_bs    every word is retyped once after Ctrl+Backspace
+    skip       half of each word, then Space to skip the rest
+
+Sudden Death never types a wrong character (it would end the round), so its
+"mistakes" are correct characters that get deleted again.
+
+Results go to ``--out`` as JSON. ``--save-baseline PATH`` stores them as the
+reference; ``--baseline PATH`` compares p50 times and allocations against it and
+exits 1 on a regression (see ``compare``). The committed reference is
+``scripts/bench_engine_baseline.json``, which CI compares every push against;
+refresh it with ``--save-baseline`` when a slowdown is intended.
+
+Usage: python scripts/bench_engine.py [--sizes 25,100,1000,5000] [--keys 400] [--repeat 5]
+                                      [--modes word,time,quote,death] [--patterns ...]
+                                      [--qt] [--out bench_engine.json]
+                                      [--baseline FILE] [--save-baseline FILE]
+"""
+import argparse
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from maroon.core import GameCore  # noqa: E402
+from maroon.modes import QuoteMode, SuddenDeathMode, TimeMode, WordMode  # noqa: E402
+from maroon.services import QuoteService, WordService  # noqa: E402
+
+MODES = {
+    "word": WordMode,
+    "time": TimeMode,
+    "quote": QuoteMode,
+    "death": SuddenDeathMode,
+}
+PATTERNS = ("clean", "backspace", "ctrl_bs", "skip")
+PHASES = ("input", "emit", "html")
+
+
+def keystrokes(pattern: str, target: str, start: int, keys: int, death: bool):
+    """Key script ``[(op, arg)]`` continuing the correctly typed ``target[:start]``."""
+    ops = []
+    pos = start
+    word_start = target.rfind(" ", 0, pos) + 1
+    retyped = set()
+    while len(ops) < keys and pos < len(target):
+        ch = target[pos]
+        if pattern == "backspace" and len(ops) % 3 == 2:
+            ops.append(("type", ch if death else ("x" if ch != "x" else "y")))
+            ops.append(("back", None))
+            continue
+        if pattern == "skip" and ch != " ":
+            word_end = target.find(" ", pos)
+            word_end = len(target) if word_end == -1 else word_end
+            if pos - word_start >= (word_end - word_start + 1) // 2:
+                ops.append(("skip", None))
+                pos = word_start = word_end + 1
+                continue
+        if ch == " ":
+            if pattern == "ctrl_bs" and word_start not in retyped:
+                retyped.add(word_start)
+                ops.append(("word_back", None))
+                pos = word_start
+                continue
+            ops.append(("type", ch))
+            pos += 1
+            word_start = pos
+            continue
+        ops.append(("type", ch))
+        pos += 1
+    return ops[:keys]
+
+
+class Driver:
+    """Uniform access to GameCore (headless) or GameEngine (``--qt``)."""
+
+    def __init__(self, qt: bool):
+        if qt:
+            from PyQt6.QtCore import QCoreApplication
+
+            from maroon.engine import GameEngine
+
+            self.app = QCoreApplication.instance() or QCoreApplication([])
+            engine = GameEngine(record_history=False)
+            engine.stats_updated.connect(lambda *_: None)  # exercise the legacy HTML path too
+            self.game = engine
+            self.core = engine.core
+            self.emit_update = engine._emit_update
+            self.generate_html = engine._generate_html
+        else:
+            service = WordService(quotes=QuoteService(url=""))
+            self.game = self.core = GameCore(service, clock=lambda: 0.0)
+            self.emit_update = self.core.emit_update
+            self.generate_html = self.core.generate_html
+
+    def run(self, ops, timed: bool):
+        game = self.game
+        buffer = self.core.buffer
+        samples = {phase: [] for phase in PHASES}
+        clock = time.perf_counter_ns
+        for op, arg in ops:
+            t0 = clock()
+            if op == "type":
+                game.process_input(buffer.text + arg)
+            elif op == "back":
+                game.process_input(buffer.text[:-1])
+            elif op == "word_back":
+                game.delete_word()
+            else:
+                game.skip_word()
+            t1 = clock()
+            self.emit_update()
+            t2 = clock()
+            self.generate_html()
+            t3 = clock()
+            if timed:
+                samples["input"].append(t1 - t0)
+                samples["emit"].append(t2 - t1)
+                samples["html"].append(t3 - t2)
+        return samples
+
+
+def calibrate() -> float:
+    """Microseconds for a fixed pure-Python workload, used to normalise machine speed."""
+    t0 = time.perf_counter_ns()
+    chars = []
+    for i in range(20000):
+        chars.append(chr(97 + i % 26))
+        if i % 7 == 0:
+            "".join(chars[-32:])
+    return (time.perf_counter_ns() - t0) / 1e3
+
+
+def summarize(ns):
+    ns = sorted(ns)
+    q = statistics.quantiles(ns, n=100, method="inclusive") if len(ns) > 1 else ns * 99
+    return {
+        "mean_us": round(statistics.fmean(ns) / 1e3, 2),
+        "p50_us": round(q[49] / 1e3, 2),
+        "p95_us": round(q[94] / 1e3, 2),
+        "p99_us": round(q[98] / 1e3, 2),
+        "max_us": round(ns[-1] / 1e3, 2),
+    }
+
+
+class Case:
+    """One mode x pattern x size combination and its timed passes."""
+
+    def __init__(self, mode_name: str, pattern: str, size: int, target: str, args):
+        self.id = f"{mode_name}/{pattern}/{size}"
+        self.mode_name = mode_name
+        self.pattern = pattern
+        self.size = size
+        self.target = target
+        start = int(len(target) * args.offset)
+        self.start = target.rfind(" ", 0, start) + 1
+        self.ops = keystrokes(pattern, target, self.start, args.keys, mode_name == "death")
+        self.runs = []
+        self.calibration = []
+        self.alloc = {}
+        self.finished_early = False
+
+    def prepare(self, driver: Driver):
+        driver.core.set_mode(MODES[self.mode_name]())
+        driver.core.set_target(self.target)
+        if self.start:
+            driver.game.process_input(self.target[:self.start])
+        driver.generate_html()
+
+    def time(self, driver: Driver):
+        self.calibration.append(calibrate())
+        self.prepare(driver)
+        self.runs.append(driver.run(self.ops, timed=True))
+        self.finished_early = driver.core.finished
+
+    def measure_alloc(self, driver: Driver):
+        self.prepare(driver)
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        snap0 = tracemalloc.take_snapshot()
+        driver.run(self.ops, timed=False)
+        snap1 = tracemalloc.take_snapshot()
+        after, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        diff = snap1.compare_to(snap0, "filename")
+        n = max(1, len(self.ops))
+        self.alloc = {
+            "retained_bytes_per_key": round(sum(d.size_diff for d in diff if d.size_diff > 0) / n, 1),
+            "retained_blocks_per_key": round(sum(d.count_diff for d in diff if d.count_diff > 0) / n, 2),
+            "peak_bytes": peak - before,
+            "net_bytes": after - before,
+        }
+
+    def result(self) -> dict:
+        case = {
+            "id": self.id,
+            "mode": self.mode_name,
+            "pattern": self.pattern,
+            "words": self.size,
+            "target_chars": len(self.target),
+            "keys": len(self.ops),
+            "finished_early": self.finished_early,
+            "calibration_us": round(min(self.calibration), 1),
+            "alloc": self.alloc,
+        }
+        for phase in PHASES:
+            # Best of the repeats per statistic filters out scheduler and frequency noise.
+            summaries = [summarize(run[phase]) for run in self.runs]
+            case[phase] = {k: min(x[k] for x in summaries) for k in summaries[0]}
+        case["total_p50_us"] = round(sum(case[p]["p50_us"] for p in PHASES), 2)
+        return case
+
+
+def compare(results, baseline, threshold: float, case_threshold: float) -> int:
+    """Gate on the suite-wide geometric mean; single cases only on large slowdowns.
+
+    Each case's times are divided by its calibration ratio first (measured right
+    before every pass), so a slower machine or a busy CI runner does not read as a
+    regression.
+    One case can land 1.5x slower for a whole process run (allocation layout, a
+    noisy neighbour), so per-case p50s alone make a flaky gate.
+    """
+    ref = {r["id"]: r for r in baseline["cases"]}
+    regressions = 0
+    log_sum, n = 0.0, 0
+    for case in results["cases"]:
+        old = ref.get(case["id"])
+        if old is None:
+            continue
+        raw = case["total_p50_us"] / max(old["total_p50_us"], 0.01)
+        ratio = raw / (case["calibration_us"] / old["calibration_us"])
+        log_sum += math.log(ratio)
+        n += 1
+        # A lucky calibration can inflate one case, so it must be slow either way.
+        if min(raw, ratio) > 1 + case_threshold:
+            regressions += 1
+            print(f"REGRESSION {case['id']}: p50 {old['total_p50_us']} -> {case['total_p50_us']} us "
+                  f"({ratio:.2f}x)")
+        old_b = old["alloc"]["retained_bytes_per_key"]
+        new_b = case["alloc"]["retained_bytes_per_key"]
+        if new_b > old_b * (1 + threshold) + 32:
+            regressions += 1
+            print(f"REGRESSION {case['id']} alloc: {old_b} -> {new_b} bytes/key")
+    geomean = math.exp(log_sum / n) if n else 1.0
+    if geomean > 1 + threshold:
+        regressions += 1
+        print(f"REGRESSION suite: geometric mean p50 ratio {geomean:.3f}")
+    print(f"{n} cases compared, normalised geomean p50 ratio {geomean:.3f}, {regressions} regression(s)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="25,100,1000,5000", help="target lengths in words")
+    parser.add_argument("--keys", type=int, default=400, help="measured keystrokes per case")
+    parser.add_argument("--offset", type=float, default=0.5,
+                        help="fraction of the target already typed when measuring starts")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--patterns", default=",".join(PATTERNS))
+    parser.add_argument("--repeat", type=int, default=5, help="timed sweeps over all cases")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--qt", action="store_true", help="drive the Qt GameEngine adapter")
+    parser.add_argument("--out", type=Path, default=Path("bench_engine.json"))
+    parser.add_argument("--baseline", type=Path, help="compare against this result file")
+    parser.add_argument("--save-baseline", type=Path, help="also write the results here")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed suite-wide slowdown and per-key allocation growth")
+    parser.add_argument("--case-threshold", type=float, default=1.0,
+                        help="allowed slowdown of a single case")
+    args = parser.parse_args()
+
+    driver = Driver(args.qt)
+    service = driver.core.service
+    results = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "driver": "qt" if args.qt else "core",
+        "keys": args.keys,
+        "offset": args.offset,
+        "cases": [],
+    }
+    cases = [
+        Case(mode_name, pattern, size, " ".join(service.get_words(size, seed=args.seed)), args)
+        for size in (int(s) for s in args.sizes.split(","))
+        for mode_name in args.modes.split(",")
+        for pattern in args.patterns.split(",")
+    ]
+    # Whole sweeps are repeated, so a slow stretch of the machine hits one pass of
+    # many cases instead of every pass of one case.
+    for _ in range(args.repeat):
+        for case in cases:
+            case.time(driver)
+    for case in cases:
+        case.measure_alloc(driver)
+
+    print(f"{'case':<28} {'chars':>6} {'input p50/p95':>15} {'emit p50':>9} {'html p50':>9} {'B/key':>7}")
+    for case in cases:
+        r = case.result()
+        results["cases"].append(r)
+        print(f"{r['id']:<28} {r['target_chars']:>6} "
+              f"{r['input']['p50_us']:>7}/{r['input']['p95_us']:<7} "
+              f"{r['emit']['p50_us']:>9} {r['html']['p50_us']:>9} "
+              f"{r['alloc']['retained_bytes_per_key']:>7}")
+
+    args.out.write_text(json.dumps(results, indent=1), encoding="utf-8")
+    print(f"results: {args.out}")
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(results, indent=1), encoding="utf-8")
+        print(f"baseline saved: {args.save_baseline}")
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if compare(results, baseline, args.threshold, args.case_threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Session history store: batched write throughput and history-view query times.
+
+Fills a fresh database with ``--sessions`` synthetic results through the
+background writer, then times what a history view needs on open (aggregates,
+first page, rolling average, a deep page) against a full-table GROUP BY scan.
+
+Usage: python scripts/bench_history.py [--sessions 100000] [--keylog-events 300] [--db PATH]
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from maroon.history import ALL_MODES, HistoryStore, SessionResult  # noqa: E402
+from maroon.keylog import CHAR, KeystrokeLog  # noqa: E402
+
+MODES = ("words-25", "time-30", "time-15", "quote", "death")
+
+
+def fake_keylog(events: int, rng: random.Random) -> bytes:
+    log = KeystrokeLog(events)
+    t = 0
+    for i in range(events):
+        t += int(rng.gauss(150e6, 40e6))
+        log.record(CHAR, i, 97 + i % 26, t)
+    return log.to_bytes()
+
+
+def timed(label: str, fn, repeat: int = 5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    print(f"{label:<34} {best * 1e3:8.2f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--keylog-events", type=int, default=0,
+                        help="attach a keystroke log of this many events to every session")
+    parser.add_argument("--db", type=Path, help="database file (default: a temporary one)")
+    args = parser.parse_args()
+
+    tmp = None
+    if args.db is None:
+        tmp = tempfile.TemporaryDirectory()
+        args.db = Path(tmp.name) / "history.sqlite3"
+    rng = random.Random(1)
+    blob = fake_keylog(args.keylog_events, rng) if args.keylog_events else None
+
+    store = HistoryStore(args.db)
+    now = time.time() - args.sessions * 60
+    t0 = time.perf_counter()
+    for i in range(args.sessions):
+        store.record(SessionResult(
+            ts=now + i * 60, mode=rng.choice(MODES), target_len=170, typed=170,
+            wpm=int(rng.gauss(80, 15)), acc=min(100, int(rng.gauss(95, 3))),
+            duration=rng.uniform(10, 60), success=rng.random() > 0.05, keylog=blob,
+        ))
+    queued = time.perf_counter() - t0
+    store.flush()
+    written = time.perf_counter() - t0
+    store.close()
+    print(f"record(): {queued / args.sessions * 1e6:.2f} us/session on the caller's thread")
+    print(f"written: {args.sessions} sessions in {written:.2f}s "
+          f"({args.sessions / written:,.0f}/s), {args.db.stat().st_size / 1e6:.1f} MB")
+
+    # A fresh store, as a history view would open it.
+    store = HistoryStore(args.db)
+    timed("open + aggregates()", lambda: HistoryStore(args.db).aggregates(), repeat=3)
+    aggs = timed("aggregates()", store.aggregates)
+    timed("recent(limit=50)", lambda: store.recent(limit=50))
+    timed("recent('time-30', limit=50)", lambda: store.recent("time-30", limit=50))
+    timed("rolling_average('quote', 10)", lambda: store.rolling_average("quote", 10))
+    page = store.recent(limit=50)
+    for _ in range(200):
+        page = store.recent(limit=50, before=page[-1].ts) or page
+    timed("recent() page 200 (keyset)", lambda: store.recent(limit=50, before=page[-1].ts))
+    timed("full scan GROUP BY mode", lambda: store._query(
+        "SELECT mode, count(*), max(wpm), avg(wpm), avg(acc) FROM sessions"
+        " WHERE success = 1 GROUP BY mode"), repeat=3)
+    total = aggs[ALL_MODES]
+    print(f"all modes: {total.sessions} sessions, best {total.best_wpm} WPM, "
+          f"avg {total.avg_wpm:.1f}, rolling {total.rolling_wpm:.1f}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
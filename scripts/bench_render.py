@@ -0,0 +1,76 @@
+"""Per-keystroke render cost of the cached HtmlRenderer vs. a full rebuild.
+
+Usage: python scripts/bench_render.py [--keys 300]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from maroon.config import Config  # noqa: E402
+from maroon.render import HtmlRenderer  # noqa: E402
+
+
+def full_render(target: str, user_input: str, cursor_color: str) -> str:
+    """Reference: the old one-span-per-character builder."""
+    c = Config.COLORS
+    html = "<html><head/><body><p style='line-height: 140%;'>"
+    inp_len = len(user_input)
+    for i, char in enumerate(target):
+        if i < inp_len:
+            if user_input[i] == char:
+                html += f'<span style="color:{c["correct"]};">{char}</span>'
+            else:
+                html += (
+                    f'<span style="background-color:{c["error"]}; color:#222; '
+                    f'border-radius:3px;">{char}</span>'
+                )
+        elif i == inp_len:
+            display = "&nbsp;" if char == " " else char
+            html += f'<span style="background-color:{cursor_color}; color:{c["bg"]};">{display}</span>'
+        else:
+            html += f'<span style="color:{c["text_sub"]};">{char}</span>'
+    return html + "</p></body></html>"
+
+
+def make_target(words: int) -> str:
+    rng = random.Random(words)
+    return " ".join(rng.choice(Config.LOCAL_WORDS) for _ in range(words))
+
+
+def run(words: int, keys: int):
+    target = make_target(words)
+    cursor = Config.COLORS["cursor"]
+    rng = random.Random(0)
+    typed = [c if rng.random() > 0.05 else "x" for c in target[:keys]]
+
+    renderer = HtmlRenderer()
+    renderer.set_target(target)
+    renderer.render("", cursor)
+    t0 = time.perf_counter()
+    for i in range(1, len(typed) + 1):
+        renderer.render("".join(typed[:i]), cursor, i - 1)
+    cached = (time.perf_counter() - t0) / len(typed)
+
+    t0 = time.perf_counter()
+    for i in range(1, len(typed) + 1):
+        full_render(target, "".join(typed[:i]), cursor)
+    full = (time.perf_counter() - t0) / len(typed)
+    return len(target), cached, full
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--keys", type=int, default=300)
+    args = parser.parse_args()
+    print(f"{'words':>6} {'chars':>7} {'cached us/key':>14} {'full us/key':>12}")
+    for words in (25, 100, 500, 2000, 5000):
+        chars, cached, full = run(words, args.keys)
+        print(f"{words:>6} {chars:>7} {cached * 1e6:>14.1f} {full * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Restyle cost per UI event: game start/finish, TAB, mode hover, mode change, theme.
+
+Drives a real ``MainWindow`` (offscreen Qt unless QT_QPA_PLATFORM is set).
+"restyle" is the handler plus the layout work it posts; "paint" is the
+repaint that follows. Also counts ``setStyleSheet`` calls per event, each of
+which makes Qt re-parse CSS and re-polish the widget's whole subtree.
+
+Usage: python scripts/bench_restyle.py [--repeat 200]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Benchmark rounds stay out of the user's session history.
+os.environ["MAROON_HISTORY"] = "0"
+
+from PyQt6.QtCore import QEvent, QPoint, Qt  # noqa: E402
+from PyQt6.QtGui import QKeyEvent  # noqa: E402
+from PyQt6.QtTest import QTest  # noqa: E402
+from PyQt6.QtWidgets import QApplication, QWidget  # noqa: E402
+
+from maroon.latency import quantile  # noqa: E402
+
+
+class SheetCounter:
+    """Counts ``QWidget.setStyleSheet`` calls made from Python."""
+
+    def __init__(self):
+        self.calls = 0
+        self._original = QWidget.setStyleSheet
+        counter = self
+
+        def set_style_sheet(widget, sheet):
+            counter.calls += 1
+            return counter._original(widget, sheet)
+
+        QWidget.setStyleSheet = set_style_sheet
+
+
+def hover(win, button, inside: bool):
+    """Real mouse moves, so both enter/leave handlers and ``:hover`` rules fire."""
+    pos = button.mapTo(win, button.rect().center()) if inside else QPoint(2, 2)
+    QTest.mouseMove(win, pos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    counter = SheetCounter()
+    app = QApplication(sys.argv)
+    from maroon.widgets import MainWindow
+    win = MainWindow()
+    win.show()
+    app.processEvents()
+    button = win.mode_buttons[1]
+    modes = [b.mode_instance for b in win.mode_buttons[:2]]
+    tab = QKeyEvent(QEvent.Type.KeyPress, Qt.Key.Key_Tab, Qt.KeyboardModifier.NoModifier)
+    events = {
+        "game start": lambda i: win.on_game_start(),
+        "game finish": lambda i: win.on_game_finish(i % 2 == 0),
+        "TAB": lambda i: win.keyPressEvent(tab),
+        "hover": lambda i: hover(win, button, i % 2 == 0),
+        "mode change": lambda i: win.change_mode(modes[i % 2]),
+        "theme": lambda i: win.toggle_theme(),
+    }
+
+    print(f"{'event':<12} {'restyle ms':>11} {'p95':>8} {'paint ms':>9} {'sheets/event':>13}")
+    for name, action in events.items():
+        repeat = args.repeat if name != "theme" else max(2, args.repeat // 10)
+        restyle, paint = [], []
+        counter.calls = 0
+        for i in range(repeat):
+            t0 = time.perf_counter()
+            action(i)
+            app.sendPostedEvents(None, QEvent.Type.LayoutRequest)
+            t1 = time.perf_counter()
+            app.sendPostedEvents()
+            restyle.append(t1 - t0)
+            paint.append(time.perf_counter() - t1)
+            app.processEvents()
+        print(f"{name:<12} {statistics.median(restyle) * 1e3:11.3f} "
+              f"{quantile(restyle, 95) * 1e3:8.3f} "
+              f"{statistics.median(paint) * 1e3:9.3f} {counter.calls / repeat:13.1f}")
+    win.close()
+
+
+if __name__ == "__main__":
+    main()
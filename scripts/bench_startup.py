@@ -0,0 +1,81 @@
+"""Cold-start benchmark: import time and time to the first stats update.
+
+Each run starts a fresh interpreter (offscreen Qt unless QT_QPA_PLATFORM is
+set) and reports milliseconds since the child script started:
+
+    import       ``maroon.widgets`` imported
+    first_stats  MainWindow received its first ``stats_changed``
+    words_ready  background word list loaded (not on the critical path)
+
+Exits with status 1 when the median first_stats exceeds ``--budget-ms``; the
+perf workflow runs it on every push, so a slower startup fails CI.
+
+Usage: python scripts/bench_startup.py [--runs 5] [--budget-ms 300]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+CHILD = r"""
+import json, os, sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, ROOT)
+from PyQt6.QtWidgets import QApplication
+from maroon.widgets import MainWindow
+t_import = time.perf_counter()
+marks = {}
+original = MainWindow.update_stats
+def update_stats(self, *args):
+    marks.setdefault("first_stats", time.perf_counter())
+    return original(self, *args)
+MainWindow.update_stats = update_stats
+app = QApplication(sys.argv)
+win = MainWindow()
+win.show()
+app.processEvents()
+win.engine.service.ready.wait(10)
+marks["words_ready"] = time.perf_counter()
+print(json.dumps({
+    "import": (t_import - t0) * 1e3,
+    "first_stats": (marks["first_stats"] - t0) * 1e3,
+    "words_ready": (marks["words_ready"] - t0) * 1e3,
+}), flush=True)
+# Skip interpreter teardown; only the numbers above matter.
+os._exit(0)
+"""
+
+
+def run_once() -> dict:
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    env["MAROON_HISTORY"] = "0"
+    code = CHILD.replace("ROOT", repr(str(ROOT)), 1)
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True,
+                         text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=300.0)
+    args = parser.parse_args()
+
+    results = [run_once() for _ in range(args.runs)]
+    medians = {k: statistics.median(r[k] for r in results) for k in results[0]}
+    for key, value in medians.items():
+        print(f"{key:>12}: {value:7.1f} ms (median of {args.runs})")
+    over = medians["first_stats"] > args.budget_ms
+    print(f"budget {args.budget_ms:.0f} ms: {'OVER' if over else 'ok'}")
+    sys.exit(1 if over else 0)
+
+
+if __name__ == "__main__":
+    main()
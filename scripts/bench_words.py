@@ -0,0 +1,70 @@
+"""Word draw throughput: per-word triangular loop vs. the batched WordSampler.
+
+Usage: python scripts/bench_words.py [--words 1000000] [--batch 100]
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from maroon.wordlist import WordSampler  # noqa: E402
+
+
+def load_words():
+    path = Path(__file__).resolve().parents[1] / "20k.txt"
+    with path.open("r", encoding="utf-8") as f:
+        return [w for w in (line.strip() for line in f) if 3 <= len(w) <= 10 and w.isalpha()]
+
+
+def old_draw(pool, lock, count):
+    with lock:
+        pool_len = len(pool)
+        return [pool[int(random.triangular(0, pool_len, 0))] for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--words", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=100, help="words per get_words call")
+    args = parser.parse_args()
+
+    words = load_words()
+    calls = max(1, args.words // args.batch)
+
+    lock = threading.Lock()
+    t0 = time.perf_counter()
+    for _ in range(calls):
+        old_draw(words, lock, args.batch)
+    old = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    sampler = WordSampler(words)
+    build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for _ in range(calls):
+        sampler.draw(args.batch)
+    new = time.perf_counter() - t0
+
+    seeded = sampler.draw(10, np.random.default_rng(42)) == WordSampler(words).draw(
+        10, np.random.default_rng(42))
+
+    t0 = time.perf_counter()
+    sampler.draw(args.words)
+    single = time.perf_counter() - t0
+
+    total = calls * args.batch
+    print(f"pool: {len(words)} words, draws: {total} in batches of {args.batch}")
+    print(f"triangular loop : {old:.3f}s ({total / old / 1e6:.2f} M words/s)")
+    print(f"WordSampler     : {new:.3f}s ({total / new / 1e6:.2f} M words/s), index build {build * 1e3:.1f} ms")
+    print(f"WordSampler x1  : {single:.3f}s for one batch of {args.words}")
+    print(f"seeded draws reproducible: {seeded}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Race server load test: many simulated clients racing on localhost.
+
+Starts a ``RaceServer`` in-process (or uses ``--connect HOST:PORT``), connects
+``--clients`` ``RaceClient``s, starts a race and lets every client "type" at
+its own WPM. Each client only stores its latest position; progress goes out
+once per client tick and comes back as one delta-encoded broadcast per server
+tick, exactly as from the app.
+
+Reported: server time and bytes per tick, how long a tick took to reach the
+clients, event-loop lag (what a keystroke handled on this loop would wait),
+and whether every client's view of the race ended identical to the server's.
+
+Usage: python scripts/race_load.py [--clients 300] [--seconds 60] [--wpm 40-140]
+                                   [--tick 0.1] [--connect HOST:PORT]
+"""
+import argparse
+import asyncio
+import random
+import resource
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from maroon.race import RaceClient, RaceServer  # noqa: E402
+
+
+def pct(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+class SimClient(RaceClient):
+    def __init__(self, name: str, wpm: float, tick: float):
+        super().__init__(name, tick=tick)
+        self.cps = wpm * 5 / 60
+        self.text_len = 0
+        self.go_at = 0.0
+        self.received = {}
+        self.on_message = self._record
+
+    def _record(self, msg: dict):
+        kind = msg["t"]
+        if kind == "tick":
+            self.received[msg["n"]] = time.monotonic()
+        elif kind == "race":
+            self.text_len = len(msg["text"])
+        elif kind == "go":
+            self.go_at = time.monotonic()
+
+    def type_until_now(self, now: float) -> bool:
+        """Advance to where this typist would be by ``now``; True once finished."""
+        if not self.racing:
+            return not self.go_at == 0.0
+        pos = min(self.text_len, int((now - self.go_at) * self.cps))
+        if pos >= self.text_len:
+            elapsed = now - self.go_at
+            self.finish(pos, int(pos / 5 / (elapsed / 60)), 100)
+            self.racing = False
+            return True
+        self.progress = pos
+        return False
+
+
+async def loop_lag(samples, stop: asyncio.Event, interval: float = 0.01):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        t = loop.time()
+        await asyncio.sleep(interval)
+        samples.append(loop.time() - t - interval)
+
+
+async def run(args) -> int:
+    server = None
+    if args.connect:
+        host, _, port = args.connect.rpartition(":")
+        port = int(port)
+    else:
+        server = RaceServer(words=args.words, tick=args.tick, countdown=args.countdown)
+        server.tick_log = []
+        await server.start("127.0.0.1", 0)
+        host, port = "127.0.0.1", server.port
+
+    lo, _, hi = args.wpm.partition("-")
+    rng = random.Random(args.seed)
+    clients = [SimClient(f"sim{i}", rng.uniform(float(lo), float(hi or lo)), args.tick)
+               for i in range(args.clients)]
+    t0 = time.perf_counter()
+    for c in clients:
+        await c.connect(host, port)
+    readers = [asyncio.create_task(c.run()) for c in clients]
+    print(f"{len(clients)} clients connected in {time.perf_counter() - t0:.2f}s")
+
+    lag = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(loop_lag(lag, stop))
+    await asyncio.sleep(0.5)
+    cpu0 = resource.getrusage(resource.RUSAGE_SELF)
+    clients[0].request_start()
+    deadline = time.monotonic() + args.countdown + args.seconds
+    while time.monotonic() < deadline:
+        await asyncio.sleep(0.02)
+        now = time.monotonic()
+        if all([c.type_until_now(now) for c in clients]):
+            break
+    await asyncio.sleep(args.tick * 3)
+    cpu1 = resource.getrusage(resource.RUSAGE_SELF)
+    stop.set()
+    await monitor
+
+    cpu = (cpu1.ru_utime - cpu0.ru_utime) + (cpu1.ru_stime - cpu0.ru_stime)
+    finished = sum(1 for c in clients if not c.racing and c.go_at)
+    print(f"race: {finished}/{len(clients)} finished, process CPU {cpu:.2f}s")
+    print(f"event-loop lag ms: p50 {pct(lag, 50) * 1e3:.2f}  p99 {pct(lag, 99) * 1e3:.2f}  "
+          f"max {max(lag, default=0) * 1e3:.2f}")
+
+    status = 0
+    if server is not None:
+        log = server.tick_log
+        cost = [entry[2] for entry in log]
+        size = [entry[3] for entry in log]
+        sent = {entry[0]: entry[1] for entry in log}
+        delivery = [t - sent[n] for c in clients for n, t in c.received.items() if n in sent]
+        print(f"server ticks: {len(log)}, build+write ms p50 {pct(cost, 50) * 1e3:.2f} "
+              f"p99 {pct(cost, 99) * 1e3:.2f}, bytes/tick mean {statistics.fmean(size or [0]):.0f} "
+              f"max {max(size, default=0)}, out {sum(size) * len(clients) / 1024:.0f} KiB total")
+        print(f"tick delivery ms: p50 {pct(delivery, 50) * 1e3:.2f}  p99 {pct(delivery, 99) * 1e3:.2f}")
+        truth = {p.id: p.sent_pos for p in server.players.values()}
+        diverged = sum(1 for c in clients if c.positions != truth)
+        print(f"client views matching the server: {len(clients) - diverged}/{len(clients)}")
+        status = 1 if diverged else 0
+
+    for c in clients:
+        c.close()
+    await asyncio.gather(*readers, return_exceptions=True)
+    if server is not None:
+        await server.close()
+    return status
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=300)
+    parser.add_argument("--seconds", type=float, default=60, help="race time limit")
+    parser.add_argument("--wpm", default="40-140", help="range clients type at")
+    parser.add_argument("--words", type=int, default=30)
+    parser.add_argument("--tick", type=float, default=0.1)
+    parser.add_argument("--countdown", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--connect", help="HOST:PORT of a running server instead of an in-process one")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
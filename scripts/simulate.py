@@ -0,0 +1,147 @@
+"""Headless batch simulation: drive GameCore with a synthetic typist and a fake clock.
+
+Runs without Qt. Every session types its target at ``--wpm`` with mistakes
+(wrong key + backspace) at ``--error-rate`` and the occasional Ctrl+Backspace,
+so all edit paths and every game mode get exercised.
+
+Usage: python scripts/simulate.py [--sessions 2000] [--modes word,time,quote,death]
+                                  [--wpm 90] [--error-rate 0.05] [--seed 1] [--profile]
+"""
+import argparse
+import cProfile
+import pstats
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from maroon.core import GameCore, GameObserver  # noqa: E402
+from maroon.modes import QuoteMode, SuddenDeathMode, TimeMode, WordMode  # noqa: E402
+from maroon.services import QuoteService, WordService  # noqa: E402
+
+MODES = {
+    "word": lambda: WordMode(25),
+    "word100": lambda: WordMode(100),
+    "time": lambda: TimeMode(30),
+    "quote": QuoteMode,
+    "death": SuddenDeathMode,
+}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class SimObserver(GameObserver):
+    """Stands in for the Qt timer and counts what a UI would receive."""
+
+    def __init__(self):
+        self.tick_at = None
+        self.clock = None
+        self.text_updates = 0
+        self.stats_updates = 0
+        self.results = {True: 0, False: 0}
+
+    def on_text_changed(self, start, end):
+        self.text_updates += 1
+
+    def on_stats_changed(self, stats_text):
+        self.stats_updates += 1
+
+    def on_game_finished(self, success):
+        self.results[success] += 1
+
+    def on_tick_scheduled(self, delay):
+        self.tick_at = None if delay is None else self.clock.now + delay
+
+
+def play(core: GameCore, clock: FakeClock, obs: SimObserver, rng: random.Random,
+         key_interval: float, error_rate: float, max_keys: int) -> int:
+    keys = 0
+    while not core.finished and keys < max_keys:
+        clock.now += key_interval * rng.uniform(0.5, 1.5)
+        if obs.tick_at is not None and clock.now >= obs.tick_at:
+            clock.now, obs.tick_at = obs.tick_at, None  # single-shot, like the Qt timer
+            core.tick()
+            continue
+        pos = len(core.buffer)
+        target = core.target_text
+        if pos >= len(target):
+            core.delete_word()
+        elif rng.random() < error_rate:
+            core.insert_char(chr(rng.randrange(97, 123)))
+            if rng.random() < 0.2:
+                core.delete_word()
+            else:
+                core.delete_char()
+            keys += 1
+        elif target[pos] == " ":
+            core.skip_word()
+        else:
+            core.insert_char(target[pos])
+        keys += 1
+    return keys
+
+
+def run(args) -> dict:
+    clock = FakeClock()
+    obs = SimObserver()
+    obs.clock = clock
+    service = WordService(quotes=QuoteService(url=""))
+    core = GameCore(service, clock=clock)
+    core.add_observer(obs)
+    rng = random.Random(args.seed)
+    key_interval = 60 / (args.wpm * 5)
+    modes = [MODES[name]() for name in args.modes.split(",")]
+    core.prefill(modes)
+
+    keys = 0
+    t0 = time.perf_counter()
+    for i in range(args.sessions):
+        core.set_mode(modes[i % len(modes)])
+        keys += play(core, clock, obs, rng, key_interval, args.error_rate, args.max_keys)
+    wall = time.perf_counter() - t0
+    return {
+        "sessions": args.sessions,
+        "keys": keys,
+        "wall": wall,
+        "finished": obs.results[True],
+        "failed": obs.results[False],
+        "text_updates": obs.text_updates,
+        "stats_updates": obs.stats_updates,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--modes", default="word,time,quote,death", help=",".join(MODES))
+    parser.add_argument("--wpm", type=float, default=90)
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--max-keys", type=int, default=20000, help="per session")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--profile", action="store_true", help="print the top cProfile entries")
+    args = parser.parse_args()
+
+    if args.profile:
+        profiler = cProfile.Profile()
+        result = profiler.runcall(run, args)
+    else:
+        result = run(args)
+
+    keys, wall = result["keys"], result["wall"]
+    print(f"sessions: {result['sessions']} ({result['finished']} finished, {result['failed']} failed)")
+    print(f"keystrokes: {keys} in {wall:.2f}s -> {keys / wall:,.0f}/s, {keys / wall * 60 / 1e6:.2f} M/min")
+    print(f"observer calls: {result['text_updates']} text, {result['stats_updates']} stats")
+    if args.profile:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(20)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,428 @@
+"""Synthetic typist: post real key events to an offscreen MainWindow at a set WPM.
+
+Keys are generated from the current ``engine.target_text`` and posted to the
+window's event queue on a fixed timeline, exactly as the platform would deliver
+them, so they go through ``MainWindow.keyPressEvent``, the render scheduler and
+the typing surface. For every key the harness reports how far behind its
+scheduled time it was processed and painted, and how many posted keys were
+still waiting in the queue.
+
+Rhythms:
+    steady   intervals jittered +-15% around the WPM mean
+    bursty   fast runs inside words, longer pauses between them
+    FILE     intervals replayed from a recorded session (a saved KeystrokeLog,
+             a JSON list of milliseconds or one number per line), rescaled
+             to the WPM
+
+``--ghosts N`` races N synthetic ghost cursors (steady, 60 WPM and up) to
+check what drawing them costs.
+
+``--sustain SECONDS`` keeps typing (restarting rounds with Tab) and samples
+RSS, live GC objects and optionally tracemalloc to catch memory growth.
+
+Usage: python scripts/typist.py [--wpm 100,200,400] [--seconds 10] [--errors 0.03]
+                                [--rhythm steady|bursty|FILE] [--mode word|time|quote|death|book]
+                                [--ghosts 4] [--sustain 600] [--json out.json]
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import deque
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Bot rounds stay out of the user's session history, PBs and adaptive focus.
+os.environ["MAROON_HISTORY"] = "0"
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from PyQt6.QtCore import QEvent, QEventLoop, Qt, QTimer  # noqa: E402
+from PyQt6.QtGui import QKeyEvent  # noqa: E402
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from maroon.ghost import GhostTimeline  # noqa: E402
+from maroon.keylog import CHAR, KeystrokeLog  # noqa: E402
+from maroon.modes import BookMode, QuoteMode, SuddenDeathMode, TimeMode, WordMode  # noqa: E402
+from maroon.widgets import MainWindow  # noqa: E402
+
+MODES = {
+    "word": lambda: WordMode(25),
+    "time": lambda: TimeMode(30),
+    "quote": QuoteMode,
+    "death": SuddenDeathMode,
+    "book": BookMode,  # the file in MAROON_BOOK
+}
+NO_MODS = Qt.KeyboardModifier.NoModifier
+
+
+class Rhythm:
+    """Inter-key intervals in seconds with a mean of ``60 / (wpm * 5)``."""
+
+    def __init__(self, kind: str, wpm: float, rng: random.Random):
+        self.kind = kind
+        self.mean = 60 / (wpm * 5)
+        self.rng = rng
+        self.recorded = None
+        if kind not in ("steady", "bursty"):
+            self.recorded = self._load(Path(kind))
+            scale = self.mean / statistics.fmean(self.recorded)
+            self.recorded = [v * scale for v in self.recorded]
+            self._pos = 0
+
+    @staticmethod
+    def _load(path: Path):
+        data = path.read_bytes()
+        if data.startswith(KeystrokeLog.MAGIC):
+            times = KeystrokeLog.from_bytes(data).times
+            values = [(b - a) / 1e9 for a, b in zip(times, times[1:]) if b > a]
+            if not values:
+                raise ValueError(f"{path} has no intervals")
+            return values
+        text = data.decode("utf-8").strip()
+        values = json.loads(text) if text.startswith("[") else [float(v) for v in text.split()]
+        values = [v / 1000 for v in values if v > 0]
+        if not values:
+            raise ValueError(f"{path} has no intervals")
+        return values
+
+    def next(self, char: str) -> float:
+        if self.recorded is not None:
+            value = self.recorded[self._pos]
+            self._pos = (self._pos + 1) % len(self.recorded)
+            return value
+        if self.kind == "steady":
+            return self.mean * self.rng.uniform(0.85, 1.15)
+        # Bursty: ~70% of the mean inside words, the rest spent around spaces.
+        if char == " ":
+            return self.mean * self.rng.uniform(2.0, 3.4)
+        return self.mean * self.rng.uniform(0.45, 0.95)
+
+
+class Typist:
+    """Decides the next key from its own view of the target, ahead of the engine."""
+
+    def __init__(self, window: "ProbedWindow", error_rate: float, rng: random.Random):
+        self.window = window
+        self.engine = window.engine
+        self.error_rate = error_rate
+        self.rng = rng
+        self.target = ""
+        self.offset = 0
+        self.pos = 0
+        self.fix_pending = False
+        self.restart_pending = False
+        self.rounds = 0
+        self.engine.window_shifted.connect(self.on_window_shifted)
+        self.start_round()
+
+    def start_round(self):
+        self.target = self.engine.target_text
+        self.offset = 0
+        self.pos = 0
+        self.fix_pending = False
+        self.restart_pending = False
+
+    def on_window_shifted(self, dropped: int, target: str):
+        """Streamed modes: follow the engine's window (``pos`` stays absolute)."""
+        self.target = target
+        self.offset += dropped
+
+    def next_key(self):
+        """``(key, modifiers, text, measured)`` or ``None`` while waiting for the engine."""
+        if self.restart_pending:
+            if not self.window.idle():
+                return None
+            self.start_round()
+            self.rounds += 1
+        if self.fix_pending:
+            self.fix_pending = False
+            return Qt.Key.Key_Backspace, NO_MODS, "", True
+        if self.pos - self.offset >= len(self.target) or self.engine.finished:
+            # Round over, or the countdown ran out: restart once the engine caught up.
+            if not self.window.idle() or not self.engine.finished:
+                return None
+            self.restart_pending = True
+            return Qt.Key.Key_Tab, NO_MODS, "", False
+        char = self.target[self.pos - self.offset]
+        if (char != " " and self.rng.random() < self.error_rate
+                and not isinstance(self.engine.mode, SuddenDeathMode)):
+            self.fix_pending = True
+            wrong = self.rng.choice("abcdefghijklmnopqrstuvwxyz".replace(char.lower(), ""))
+            return Qt.Key(ord(wrong.upper())), NO_MODS, wrong, True
+        self.pos += 1
+        if char == " ":
+            return Qt.Key.Key_Space, NO_MODS, " ", True
+        key = Qt.Key(ord(char.upper())) if "a" <= char.lower() <= "z" else Qt.Key.Key_unknown
+        return key, NO_MODS, char, True
+
+
+class ProbedWindow(MainWindow):
+    """MainWindow that timestamps when posted keys are handled and painted."""
+
+    def __init__(self):
+        super().__init__()
+        self.scheduled = deque()    # (scheduled_ns, measured) per posted key, in order
+        self.unpainted = []
+        self.process_lag = []
+        self.paint_lag = []
+        self.ignored = 0
+        self.max_backlog = 0
+        self.typing_surface.painted.connect(self._on_painted)
+
+    def idle(self) -> bool:
+        return not self.scheduled
+
+    def post(self, key, mods, text, scheduled_ns, measured):
+        self.scheduled.append((scheduled_ns, measured))
+        self.max_backlog = max(self.max_backlog, len(self.scheduled))
+        QApplication.postEvent(self, QKeyEvent(QEvent.Type.KeyPress, key, mods, text))
+
+    def keyPressEvent(self, event):
+        before = len(self.engine.buffer)
+        super().keyPressEvent(event)
+        if not self.scheduled:
+            return  # a real key, not one of ours
+        scheduled_ns, measured = self.scheduled.popleft()
+        if not measured:
+            return
+        now = time.perf_counter_ns()
+        self.process_lag.append(now - scheduled_ns)
+        if len(self.engine.buffer) != before:
+            self.unpainted.append(scheduled_ns)
+        else:
+            self.ignored += 1
+
+    def _on_painted(self):
+        if not self.unpainted:
+            return
+        now = time.perf_counter_ns()
+        self.paint_lag.extend(now - s for s in self.unpainted)
+        self.unpainted.clear()
+
+    def reset_probe(self):
+        self.process_lag = []
+        self.paint_lag = []
+        self.unpainted.clear()
+        self.ignored = 0
+        self.max_backlog = len(self.scheduled)
+
+
+class Driver:
+    """Posts keys on schedule with a precise single-shot timer."""
+
+    def __init__(self, window: ProbedWindow, typist: Typist, rhythm: Rhythm):
+        self.window = window
+        self.typist = typist
+        self.rhythm = rhythm
+        self.posted = 0
+        self.next_due = time.perf_counter_ns()
+        self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self._fire)
+
+    def start(self):
+        self.next_due = time.perf_counter_ns()
+        self._fire()
+
+    def stop(self):
+        self.timer.stop()
+
+    def _fire(self):
+        now = time.perf_counter_ns()
+        while self.next_due <= now:
+            key = self.typist.next_key()
+            if key is None:
+                # Waiting on the engine isn't lag; the typist starts again from now.
+                self.next_due = now + 2_000_000
+                break
+            code, mods, text, measured = key
+            self.window.post(code, mods, text, self.next_due, measured)
+            self.posted += 1
+            self.next_due += int(self.rhythm.next(text) * 1e9)
+        self.timer.start(max(0, (self.next_due - time.perf_counter_ns()) // 1_000_000))
+
+
+def run_for(seconds: float, every=None, on_sample=None):
+    """Spin a local event loop for ``seconds``, calling ``on_sample`` every ``every`` seconds.
+
+    A local QEventLoop rather than ``app.exec()``: restarting the application loop
+    stops offscreen repaints.
+    """
+    loop = QEventLoop()
+    sampler = None
+    if every and on_sample:
+        sampler = QTimer()
+        sampler.timeout.connect(on_sample)
+        sampler.start(int(every * 1000))
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec()
+    if sampler:
+        sampler.stop()
+
+
+def pct(values, q):
+    if not values:
+        return 0.0
+    data = sorted(values)
+    return data[min(len(data) - 1, int(len(data) * q / 100))] / 1e6
+
+
+def rss_kb() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError):
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def slope_per_min(samples):
+    """Least-squares slope of ``(seconds, value)`` pairs, per minute."""
+    if len(samples) < 2:
+        return 0.0
+    xs = [s[0] for s in samples]
+    ys = [s[1] for s in samples]
+    mx, my = statistics.fmean(xs), statistics.fmean(ys)
+    den = sum((x - mx) ** 2 for x in xs)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / den * 60 if den else 0.0
+
+
+def measure(window, wpm, args, rng):
+    rhythm = Rhythm(args.rhythm, wpm, rng)
+    typist = Typist(window, args.errors, rng)
+    driver = Driver(window, typist, rhythm)
+    run_for(0.2)  # let the window settle
+    window.reset_probe()
+    driver.start()
+    t0 = time.perf_counter()
+    run_for(args.seconds)
+    driver.stop()
+    run_for(0.3)  # drain the queue and the last frame
+    wall = time.perf_counter() - t0
+    keys = len(window.process_lag)
+    return {
+        "wpm_target": wpm,
+        "wpm_posted": round(driver.posted / 5 / (args.seconds / 60), 1),
+        "keys": keys,
+        "ignored": window.ignored,
+        "rounds": typist.rounds,
+        "wall_s": round(wall, 2),
+        "process_lag_ms": {q: round(pct(window.process_lag, q), 3) for q in (50, 95, 99, 100)},
+        "paint_lag_ms": {q: round(pct(window.paint_lag, q), 3) for q in (50, 95, 99, 100)},
+        "max_backlog": window.max_backlog,
+        "scheduler": window.scheduler.counters(),
+    }
+
+
+def sustain(window, wpm, args, rng):
+    rhythm = Rhythm(args.rhythm, wpm, rng)
+    typist = Typist(window, args.errors, rng)
+    driver = Driver(window, typist, rhythm)
+    if args.tracemalloc:
+        tracemalloc.start()
+    samples = []
+    t0 = time.perf_counter()
+
+    def sample():
+        gc.collect()
+        entry = {
+            "t": round(time.perf_counter() - t0, 1),
+            "rss_kb": rss_kb(),
+            "gc_objects": len(gc.get_objects()),
+            "keys": len(window.process_lag),
+            "p99_process_ms": round(pct(window.process_lag[-2000:], 99), 3),
+        }
+        if args.tracemalloc:
+            entry["traced_kb"] = tracemalloc.get_traced_memory()[0] // 1024
+        samples.append(entry)
+        print(" ".join(f"{k}={v}" for k, v in entry.items()), flush=True)
+        # Keep the lag lists from growing in a long run; the tail is enough.
+        del window.process_lag[:-10000]
+        del window.paint_lag[:-10000]
+
+    driver.start()
+    run_for(args.sustain, every=args.sample_every, on_sample=sample)
+    driver.stop()
+    if args.tracemalloc:
+        tracemalloc.stop()
+    # Growth after the first quarter, once caches and pools are warm.
+    warm = [s for s in samples if s["t"] >= args.sustain / 4]
+    return {
+        "wpm_target": wpm,
+        "seconds": args.sustain,
+        "rounds": typist.rounds,
+        "samples": samples,
+        "rss_kb_per_min": round(slope_per_min([(s["t"], s["rss_kb"]) for s in warm]), 1),
+        "gc_objects_per_min": round(slope_per_min([(s["t"], s["gc_objects"]) for s in warm]), 1),
+    }
+
+
+def synthetic_ghost(wpm: float, keys: int = 5000) -> GhostTimeline:
+    """A ghost typing steadily at ``wpm`` without mistakes."""
+    log = KeystrokeLog(keys)
+    step = int(60e9 / (wpm * 5))
+    for i in range(keys):
+        log.record(CHAR, i, ord("a"), i * step)
+    return GhostTimeline(log, f"{wpm:.0f} wpm")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--wpm", default="100,200,400")
+    parser.add_argument("--seconds", type=float, default=10, help="per WPM step")
+    parser.add_argument("--errors", type=float, default=0.03, help="mistake rate per character")
+    parser.add_argument("--rhythm", default="steady")
+    parser.add_argument("--mode", default="word", choices=MODES)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--sustain", type=float, default=0,
+                        help="seconds of continuous typing at the first WPM, sampling memory")
+    parser.add_argument("--sample-every", type=float, default=10)
+    parser.add_argument("--tracemalloc", action="store_true", help="also sample traced Python memory")
+    parser.add_argument("--ghosts", type=int, default=0, help="synthetic ghost cursors to race")
+    parser.add_argument("--json", type=Path, help="write the report here")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    window = ProbedWindow()
+    window.show()
+    window.engine.set_mode(MODES[args.mode]())
+    window.engine.service.ready.wait(5)
+    for i in range(args.ghosts):
+        window.ghost_racer.add(synthetic_ghost(60 + 20 * i))
+    rng = random.Random(args.seed)
+    steps = [float(w) for w in args.wpm.split(",")]
+    report = {"mode": args.mode, "rhythm": args.rhythm, "errors": args.errors, "runs": []}
+
+    if args.sustain:
+        result = sustain(window, steps[0], args, rng)
+        report["sustain"] = result
+        print(f"sustained {args.sustain:.0f}s at {steps[0]:.0f} WPM, {result['rounds']} rounds: "
+              f"RSS {result['rss_kb_per_min']:+.1f} KB/min, "
+              f"GC objects {result['gc_objects_per_min']:+.1f}/min")
+    else:
+        print(f"{'wpm':>5} {'posted':>7} {'keys':>6} {'proc p50/p99/max ms':>22} "
+              f"{'paint p50/p99/max ms':>22} {'backlog':>7}")
+        for wpm in steps:
+            r = measure(window, wpm, args, rng)
+            report["runs"].append(r)
+            p, q = r["process_lag_ms"], r["paint_lag_ms"]
+            print(f"{wpm:>5.0f} {r['wpm_posted']:>7} {r['keys']:>6} "
+                  f"{p[50]:>7.2f}/{p[99]:>6.2f}/{p[100]:>7.2f} "
+                  f"{q[50]:>7.2f}/{q[99]:>6.2f}/{q[100]:>7.2f} {r['max_backlog']:>7}")
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=1), encoding="utf-8")
+        print(f"report: {args.json}")
+    window.close()
+
+
+if __name__ == "__main__":
+    main()
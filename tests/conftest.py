@@ -0,0 +1,41 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Before maroon is imported: tests never touch the user's data or history.
+os.environ["MAROON_DATA_DIR"] = tempfile.mkdtemp(prefix="maroon-tests-")
+os.environ["MAROON_HISTORY"] = "0"
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pytest  # noqa: E402
+
+from maroon.core import GameCore, GameObserver  # noqa: E402
+from maroon.services import QuoteService, WordService  # noqa: E402
+
+
+class Finishes(GameObserver):
+    def __init__(self):
+        self.results = []
+
+    def on_game_finished(self, success: bool):
+        self.results.append(success)
+
+
+@pytest.fixture(scope="session")
+def service():
+    return WordService(quotes=QuoteService(url=""))
+
+
+@pytest.fixture
+def make_core(service):
+    """``make_core(mode, target)``: a core on a fixed target, with its finishes recorded."""
+
+    def make(mode, target):
+        core = GameCore(service, clock=lambda: 0.0, mode=mode)
+        core.finishes = Finishes()
+        core.add_observer(core.finishes)
+        core.set_target(target)
+        return core
+
+    return make
@@ -0,0 +1,62 @@
+import pytest
+
+from maroon.history import ALL_MODES, HistoryStore, SessionResult
+
+
+def result(ts, mode, wpm, acc=95, success=True):
+    return SessionResult(ts, mode, 50, 52, wpm, acc, 12.0, success)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(tmp_path / "history.sqlite3", rolling=3)
+    yield store
+    store.close()
+
+
+def test_aggregates_match_the_sessions(store):
+    sessions = [
+        result(1.0, "words", 60, 90),
+        result(2.0, "words", 80, 100),
+        result(3.0, "time", 70, 96),
+        result(4.0, "words", 200, 20, success=False),
+        result(5.0, "words", 70, 95),
+    ]
+    for r in sessions:
+        store.record(r)
+    store.flush()
+
+    aggs = store.aggregates()
+    assert set(aggs) == {"words", "time", ALL_MODES}
+    words = aggs["words"]
+    assert (words.sessions, words.completed) == (4, 3)
+    assert words.avg_wpm == pytest.approx(70)
+    assert words.avg_acc == pytest.approx(95)
+    # Failed sessions never set a best.
+    assert (words.best_wpm, words.best_ts) == (80, 2.0)
+    assert words.last_ts == 5.0
+    # rolling=3: alpha 0.5 over 60, 80, 70.
+    assert words.rolling_wpm == pytest.approx(70)
+
+    total = store.aggregate()
+    assert (total.sessions, total.completed, total.best_wpm) == (5, 4, 80)
+    assert total.avg_wpm == pytest.approx(70)
+    assert store.aggregate("quote") is None
+
+
+def test_aggregates_survive_batches_and_reopening(store, tmp_path):
+    for i in range(300):
+        store.record(result(float(i), "words", i % 100))
+    store.flush()
+    store.record(result(1000.0, "words", 150))
+    store.close()
+
+    reopened = HistoryStore(tmp_path / "history.sqlite3", rolling=3)
+    try:
+        words = reopened.aggregate("words")
+        assert (words.sessions, words.completed, words.best_wpm) == (301, 301, 150)
+        assert words.sum_wpm == sum(i % 100 for i in range(300)) + 150
+        assert words.best_id == reopened.recent("words", limit=1)[0].id
+        assert reopened.rolling_average("words", 2) == pytest.approx((150 + 99) / 2)
+    finally:
+        reopened.close()
@@ -0,0 +1,44 @@
+from maroon.modes import SuddenDeathMode
+
+
+def type_text(core, text):
+    for char in text:
+        core.insert_char(char)
+
+
+def test_sudden_death_ends_on_a_wrong_character(make_core):
+    core = make_core(SuddenDeathMode(), "alpha beta")
+    type_text(core, "alx")
+    assert core.finished
+    assert core.finishes.results == [False]
+
+
+def test_sudden_death_allows_skipping_a_word(make_core):
+    core = make_core(SuddenDeathMode(), "alpha beta gamma")
+    type_text(core, "al")
+    core.skip_word()
+    type_text(core, "beta")
+    assert not core.finished
+    assert core.user_input == "al___ beta"
+
+
+def test_sudden_death_deletions_never_end_the_round(make_core):
+    # Backspace onto a skip's "_" filler used to re-check it and kill the round;
+    # only characters the player types can fail.
+    core = make_core(SuddenDeathMode(), "alpha beta gamma")
+    type_text(core, "al")
+    core.skip_word()
+    core.delete_char()
+    core.delete_char()
+    assert core.user_input == "al__"
+    core.delete_word()
+    assert core.user_input == ""
+    type_text(core, "alpha beta")
+    assert not core.finished
+    assert core.finishes.results == []
+
+
+def test_sudden_death_finishes_on_a_clean_round(make_core):
+    core = make_core(SuddenDeathMode(), "alpha beta")
+    type_text(core, "alpha beta")
+    assert core.finishes.results == [True]
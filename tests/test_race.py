@@ -0,0 +1,129 @@
+import asyncio
+
+from maroon.race import RUNNING, RaceClient, RaceServer, encode
+
+HOST = "127.0.0.1"
+
+
+async def until(condition, timeout=3.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+async def join(server, name):
+    client = RaceClient(name, tick=0.02)
+    await client.connect(HOST, server.port)
+    task = asyncio.create_task(client.run())
+    await until(lambda: client.id)
+    return client, task
+
+
+def test_client_applies_deltas():
+    client = RaceClient("me")
+    for msg in [
+        {"t": "welcome", "id": 2, "players": [[1, "host", 7], [2, "me", 0]]},
+        {"t": "join", "id": 3, "name": "late"},
+        {"t": "tick", "n": 1, "d": [[1, 5], [3, 4]]},
+        {"t": "tick", "n": 2, "d": [[1, 1], [2, 9]]},
+    ]:
+        client._apply(msg)
+    assert client.positions == {1: 13, 2: 9, 3: 4}
+
+    client._apply({"t": "leave", "id": 3})
+    assert client.names == {1: "host", 2: "me"}
+    client._apply({"t": "race", "id": 1, "text": "a b", "start_in": 1})
+    assert client.positions == {1: 0, 2: 0}
+    assert not client.racing
+
+
+def test_positions_follow_the_server():
+    async def main():
+        server = RaceServer(words=10, tick=0.02, countdown=0.05)
+        await server.start(HOST, 0)
+        server.tick_log = []
+        (a, ta), (b, tb) = await join(server, "a"), await join(server, "b")
+        try:
+            a.request_start()
+            await until(lambda: a.racing and b.racing)
+            a.progress, b.progress = 10, 4
+            await until(lambda: a.positions == b.positions == {a.id: 10, b.id: 4})
+            a.progress = 25
+            await until(lambda: b.positions[a.id] == 25)
+            a.finish(30, 60, 98)
+            await until(lambda: not a.racing)
+            # The finishing position arrives with the next tick.
+            await until(lambda: b.positions[a.id] == 30)
+            # Only movement is sent: every tick carried at least one delta.
+            assert all(size for _, _, _, size in server.tick_log)
+        finally:
+            a.close()
+            b.close()
+            await asyncio.gather(ta, tb)
+            await server.close()
+
+    asyncio.run(main())
+
+
+def test_server_drops_only_the_malformed_peer():
+    async def main():
+        server = RaceServer(words=5, tick=0.02, countdown=0.05)
+        await server.start(HOST, 0)
+        good, task = await join(server, "good")
+        try:
+            # A hello that is not an object is refused.
+            reader, writer = await asyncio.open_connection(HOST, server.port)
+            writer.write(b"[1, 2]\n")
+            assert await reader.read() == b""
+            writer.close()
+
+            reader, writer = await asyncio.open_connection(HOST, server.port)
+            writer.write(encode({"t": "hello", "name": "bad"}))
+            await until(lambda: len(server.players) == 2)
+            server.start_race()
+            await until(lambda: server.state == RUNNING)
+            # Non-object lines and a position without "pos" are ignored...
+            writer.write(b'[]\n1\n"x"\n{"t":"p"}\n')
+            await asyncio.sleep(0.1)
+            assert len(server.players) == 2
+            # ...an unusable position or broken JSON drops the sender.
+            writer.write(b'{"t":"p","pos":[1]}\n')
+            await until(lambda: len(server.players) == 1)
+            assert await reader.read() != b""
+            writer.close()
+
+            good.progress = 3
+            await until(lambda: good.positions.get(good.id) == 3)
+            assert list(good.names) == [good.id]
+        finally:
+            good.close()
+            await task
+            await server.close()
+
+    asyncio.run(main())
+
+
+def test_client_ignores_malformed_messages():
+    async def fake_server(reader, writer):
+        await reader.readline()
+        writer.write(b'[]\nnot json\n{"t":"join"}\n{"t":"tick","d":5}\n'
+                     b'{"t":"join","id":7,"name":"x"}\n{"t":"tick","d":[[7,3]]}\n')
+        await writer.drain()
+        writer.close()
+
+    async def main():
+        seen = []
+        server = await asyncio.start_server(fake_server, HOST, 0)
+        client = RaceClient("c", on_message=seen.append)
+        await client.connect(HOST, server.sockets[0].getsockname()[1])
+        await client.run()
+        server.close()
+        await server.wait_closed()
+        return client, seen
+
+    client, seen = asyncio.run(main())
+    assert client.names == {7: "x"}
+    assert client.positions == {7: 3}
+    assert [m["t"] for m in seen] == ["join", "tick"]
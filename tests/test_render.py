@@ -0,0 +1,66 @@
+import random
+
+from maroon.buffer import InputBuffer
+from maroon.config import Config
+from maroon.modes import WordMode
+from maroon.render import HtmlRenderer
+
+
+def fresh(target, text, cursor_color):
+    renderer = HtmlRenderer()
+    renderer.set_target(target)
+    return renderer.render(text, cursor_color)
+
+
+def test_incremental_render_matches_a_fresh_render():
+    rng = random.Random(11)
+    # Long enough for several blocks, with characters that need escaping.
+    words = ["alpha", "b<e>ta", "&gamma", "delta", "x"]
+    target = " ".join(rng.choice(words) for _ in range(80))
+    renderer = HtmlRenderer()
+    renderer.set_target(target)
+    buffer = InputBuffer()
+    color = Config.COLORS["cursor"]
+
+    def typed(i):
+        # Mostly right, sometimes wrong, like a real player.
+        return target[i] if rng.random() < 0.8 else rng.choice("qz ")
+
+    for step in range(600):
+        op = rng.random()
+        if op < 0.7 and len(buffer) < len(target):
+            edit = buffer.append(typed(len(buffer)))
+        elif op < 0.85:
+            edit = buffer.truncate(len(buffer) - rng.randint(1, 4))
+        elif op < 0.95:
+            edit = buffer.truncate(buffer.word_start())
+        else:
+            start = rng.randint(0, len(buffer))
+            end = min(len(target), start + rng.randint(0, 70))
+            edit = buffer.replace(start, "".join(typed(i) for i in range(start, end)))
+        if step % 97 == 0:
+            color = Config.COLORS["death"] if color == Config.COLORS["cursor"] else Config.COLORS["cursor"]
+        html = renderer.render(buffer, color, edit.start)
+        assert html == fresh(target, buffer.text, color)
+
+
+def test_cursor_on_a_space_stays_visible():
+    html = fresh("ab cd", "ab", Config.COLORS["cursor"])
+    assert "&nbsp;" in html
+
+
+def test_core_html_matches_a_fresh_render(make_core):
+    target = " ".join(["lorem", "ipsum", "dolor", "sit", "amet"] * 30)
+    core = make_core(WordMode(150), target)
+    rng = random.Random(5)
+    for _ in range(400):
+        if core.finished:
+            break
+        op = rng.random()
+        if op < 0.75:
+            core.insert_char(target[len(core.user_input)] if rng.random() < 0.9 else "#")
+        elif op < 0.9:
+            core.delete_char()
+        else:
+            core.delete_word()
+        assert core.generate_html() == fresh(target, core.user_input, Config.COLORS["cursor"])
@@ -0,0 +1,74 @@
+import random
+
+from maroon.buffer import InputBuffer
+from maroon.modes import WordMode
+from maroon.stats import InputStats
+
+TARGET = "the quick brown fox jumps over the lazy dog"
+
+
+def recount(target, text):
+    """Counters as if the whole text was classified from scratch."""
+    correct, incorrect, extra = InputStats._count(target, text, 0)
+    return correct, incorrect, extra
+
+
+def counters(stats):
+    return stats.correct, stats.incorrect, stats.extra
+
+
+def test_stats_match_a_recount_after_random_edits():
+    rng = random.Random(7)
+    alphabet = "thequickbrownfx "
+    for _ in range(50):
+        buffer, stats = InputBuffer(), InputStats()
+        for _ in range(200):
+            op = rng.random()
+            if op < 0.6:
+                edit = buffer.append(rng.choice(alphabet))
+            elif op < 0.8:
+                edit = buffer.truncate(len(buffer) - rng.randint(1, 3))
+            elif op < 0.9:
+                edit = buffer.truncate(buffer.word_start())
+            else:
+                start = rng.randint(0, len(buffer))
+                text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 5)))
+                edit = buffer.replace(start, text)
+            stats.apply(TARGET, edit)
+            assert counters(stats) == recount(TARGET, buffer.text)
+        stats.verify(TARGET, buffer)
+
+
+def test_stats_count_text_past_the_target_as_extra():
+    buffer, stats = InputBuffer(), InputStats()
+    stats.apply("ab", buffer.append("abcd"))
+    assert counters(stats) == (2, 0, 2)
+    stats.apply("ab", buffer.truncate(1))
+    assert counters(stats) == (1, 0, 0)
+
+
+def test_corrected_accumulates_deleted_mistakes():
+    buffer, stats = InputBuffer(), InputStats()
+    stats.apply("abc", buffer.append("axc"))
+    stats.apply("abc", buffer.truncate(1))
+    stats.apply("abc", buffer.append("bc"))
+    assert counters(stats) == (3, 0, 0)
+    assert stats.corrected == 1
+
+
+def test_core_stats_match_a_recount(make_core):
+    core = make_core(WordMode(9), TARGET)
+    rng = random.Random(3)
+    for _ in range(300):
+        if core.finished:
+            break
+        op = rng.random()
+        if op < 0.7:
+            core.insert_char(rng.choice("thequick "))
+        elif op < 0.85:
+            core.delete_char()
+        elif op < 0.95:
+            core.skip_word()
+        else:
+            core.delete_word()
+        assert counters(core.stats) == recount(core.target_text, core.user_input)
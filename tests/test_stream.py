@@ -0,0 +1,72 @@
+import pytest
+
+from maroon.stream import TextFileStream, normalize
+
+# Multi-byte characters and typographic quotes make characters and bytes differ.
+WORDS = ["çalış", "“quoted”", "naïve", "plain", "…", "ğüşö", "word"]
+
+
+@pytest.fixture
+def book(tmp_path):
+    text = "\n\n".join("  ".join(WORDS[(i + j) % len(WORDS)] for j in range(12)) for i in range(40))
+    path = tmp_path / "book.txt"
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def read_all(stream, size=40):
+    parts = []
+    while not stream.exhausted:
+        parts.append(stream.read(size))
+    return "".join(parts)
+
+
+def test_stream_yields_the_normalized_file(book):
+    stream = TextFileStream(book)
+    assert read_all(stream) == normalize(book.read_text(encoding="utf-8"))
+    assert stream.progress == 1.0
+    stream.close(0)
+
+
+def test_byte_offset_resumes_at_the_word_under_the_cursor(book):
+    stream = TextFileStream(book)
+    text = read_all(stream)
+    for position in range(0, len(text), 7):
+        offset = stream.byte_offset(position)
+        # A space belongs to the word before it.
+        word_start = text.rfind(" ", 0, position) + 1
+        resumed = TextFileStream(book, offset)
+        assert read_all(resumed) == text[word_start:]
+        resumed.close(0)
+    assert stream.byte_offset(len(text)) == stream.size
+    stream.close(0)
+
+
+def test_close_reports_the_offset_to_resume_from(book):
+    saved = []
+    stream = TextFileStream(book, 0, saved.append)
+    text = stream.read(100) + stream.read(100)
+    stream.release(60)
+    cursor = text.index(" ", 80) + 1
+    stream.close(cursor)
+    assert stream.exhausted
+
+    resumed = TextFileStream(book, saved[0])
+    assert resumed.read(50).startswith(text[cursor:cursor + 20])
+    resumed.close(0)
+
+
+def test_empty_and_binary_files(tmp_path):
+    empty = tmp_path / "empty.txt"
+    empty.write_text("  \n\t ")
+    assert TextFileStream(empty).exhausted
+
+    binary = tmp_path / "data.bin"
+    binary.write_bytes(b"\x89PNG\r\n\x1a\n\0\0\0\rIHDR")
+    with pytest.raises(ValueError):
+        TextFileStream(binary)
+
+    latin = tmp_path / "latin.txt"
+    latin.write_bytes("çalış ğüşö".encode("latin-1", "replace") + b" caf\xe9")
+    with pytest.raises(ValueError):
+        TextFileStream(latin)
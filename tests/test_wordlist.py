@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+from maroon.wordlist import WordList
+
+WORDS = ["the", "of", "and", "çalış", "x1", "to", "a", "in"]
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_text("\n".join(WORDS) + "\n", encoding="utf-8")
+    return path
+
+
+def test_compile_round_trip(source, tmp_path):
+    words = WordList.compile(source, tmp_path / "words.mwl")
+    expected = [w for w in WORDS if w.isalpha()]
+    assert [words.word(i) for i in range(len(words))] == expected
+    assert list(words.view(min_len=3).words) == ["the", "and", "çalış"]
+
+
+def test_header_tracks_the_source(source, tmp_path):
+    compiled = tmp_path / "words.mwl"
+    WordList.compile(source, compiled)
+    assert WordList(compiled).is_current(source)
+
+    st = source.stat()
+    os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert not WordList(compiled).is_current(source)
+
+    WordList.compile(source, compiled)
+    assert WordList(compiled).is_current(source)
+    mtime = source.stat().st_mtime_ns
+    with source.open("a", encoding="utf-8") as f:
+        f.write("more\n")
+    # Same mtime, different size: still stale.
+    os.utime(source, ns=(mtime, mtime))
+    assert not WordList(compiled).is_current(source)
+
+
+def test_rejects_a_file_without_the_magic(tmp_path):
+    path = tmp_path / "bogus.mwl"
+    path.write_bytes(b"NOPE" + bytes(WordList.HEADER.size))
+    with pytest.raises(ValueError):
+        WordList(path)